@@ -0,0 +1,91 @@
+"""Make order_items.product_id a UUID
+
+Revision ID: 3d9a61f0b2c4
+Revises: 7c2e9b41d5a3
+Create Date: 2026-10-18 14:05:12.402117
+
+order_items.product_id was declared INTEGER while products.id is a UUID, so an
+integer in it never referenced a product (older mobile builds sent numeric demo ids).
+Those are set to NULL; UUIDs already stored there (SQLite accepts them in an INTEGER
+column) are kept. Skipped when the table does not exist yet or already has a UUID
+column, as when create_all built it from the current models.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9a61f0b2c4'
+down_revision: Union[str, None] = '7c2e9b41d5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _product_id_type():
+    inspector = sa.inspect(op.get_bind())
+    if 'order_items' not in inspector.get_table_names():
+        return None
+    return next(c['type'] for c in inspector.get_columns('order_items') if c['name'] == 'product_id')
+
+
+def _uuid_columns(product_id_type):
+    # Redeclared because SQLite reflects UUID columns as NUMERIC, and a type change in
+    # batch mode copies through CAST(... AS UUID), which reads hex UUIDs as numbers.
+    # A redeclared column loses its reflected foreign key, so that is carried over too.
+    references = {
+        fk['constrained_columns'][0]: f"{fk['referred_table']}.{fk['referred_columns'][0]}"
+        for fk in sa.inspect(op.get_bind()).get_foreign_keys('order_items')
+    }
+    references['product_id'] = 'products.id'
+    types = {
+        'order_id': postgresql.UUID(as_uuid=True),
+        'product_id': product_id_type,
+        'vendor_id': postgresql.UUID(as_uuid=True),
+    }
+    return [
+        sa.Column(name, type_, *([sa.ForeignKey(references[name])] if name in references else []))
+        for name, type_ in types.items()
+    ]
+
+
+def upgrade() -> None:
+    current = _product_id_type()
+    if not isinstance(current, sa.Integer):
+        return
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("UPDATE order_items SET product_id = NULL WHERE typeof(product_id) = 'integer'")
+        with op.batch_alter_table(
+            'order_items', recreate='always', reflect_args=_uuid_columns(postgresql.UUID(as_uuid=True))
+        ):
+            pass
+    else:
+        op.execute("UPDATE order_items SET product_id = NULL")
+        op.alter_column(
+            'order_items', 'product_id',
+            existing_type=sa.Integer(), type_=postgresql.UUID(as_uuid=True), postgresql_using='NULL::uuid'
+        )
+        op.create_foreign_key(None, 'order_items', 'products', ['product_id'], ['id'])
+
+
+def downgrade() -> None:
+    current = _product_id_type()
+    if current is None or isinstance(current, sa.Integer):
+        return
+
+    # UUIDs don't fit an INTEGER column; line items lose their product reference
+    op.execute("UPDATE order_items SET product_id = NULL")
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('order_items', recreate='always', reflect_args=_uuid_columns(sa.Integer())):
+            pass
+    else:
+        for fk in sa.inspect(op.get_bind()).get_foreign_keys('order_items'):
+            if fk['constrained_columns'] == ['product_id'] and fk['name']:
+                op.drop_constraint(fk['name'], 'order_items', type_='foreignkey')
+        op.alter_column(
+            'order_items', 'product_id',
+            existing_type=postgresql.UUID(as_uuid=True), type_=sa.Integer(), postgresql_using='NULL::integer'
+        )
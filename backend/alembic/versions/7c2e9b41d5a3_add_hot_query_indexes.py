@@ -0,0 +1,69 @@
+"""Add indexes for hot query predicates
+
+Revision ID: 7c2e9b41d5a3
+Revises: f1630dd8a80c
+Create Date: 2026-10-18 10:12:41.118202
+
+Covers the WHERE / ORDER BY clauses of the catalog, checkout, order listing,
+analytics and notification endpoints. Tables that the initial schema does not
+create (orders, notifications, ...) come from Base.metadata.create_all at startup,
+which already builds these indexes from the models, so each index is only created
+when its table exists and the index does not.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9b41d5a3'
+down_revision: Union[str, None] = 'f1630dd8a80c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, index name, columns, partial-index predicate per dialect)
+INDEXES = [
+    ('products', 'ix_products_vendor_id_is_active', ['vendor_id', 'is_active'], None),
+    ('products', 'ix_products_active_category_id', ['category_id'],
+        {'sqlite': 'is_active = 1', 'postgresql': 'is_active'}),
+    ('vendors', 'ix_vendors_status', ['status'], None),
+    ('users', 'ix_users_role', ['role'], None),
+    ('orders', 'ix_orders_created_at_id', ['created_at', 'id'], None),
+    ('orders', 'ix_orders_status_created_at', ['status', 'created_at'], None),
+    ('orders', 'ix_orders_user_id_created_at', ['user_id', 'created_at'], None),
+    ('orders', 'ix_orders_customer_email_created_at', ['customer_email', 'created_at'], None),
+    ('order_items', 'ix_order_items_order_id', ['order_id'], None),
+    ('order_items', 'ix_order_items_vendor_id_order_id', ['vendor_id', 'order_id'], None),
+    ('notifications', 'ix_notifications_vendor_id_is_read_created_at', ['vendor_id', 'is_read', 'created_at'], None),
+    ('notifications', 'ix_notifications_vendor_id_created_at', ['vendor_id', 'created_at'], None),
+    ('notifications', 'ix_notifications_created_at', ['created_at'], None),
+    ('admin_notifications', 'ix_admin_notifications_created_at', ['created_at'], None),
+    ('admin_notifications', 'ix_admin_notifications_unread_created_at', ['created_at'],
+        {'sqlite': 'is_read = 0', 'postgresql': 'NOT is_read'}),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for table, name, columns, where in INDEXES:
+        if table not in tables:
+            continue
+        if name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            continue
+        kwargs = {}
+        if where:
+            kwargs = {f'{dialect}_where': sa.text(clause) for dialect, clause in where.items()}
+        op.create_index(name, table, columns, unique=False, **kwargs)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for table, name, columns, where in reversed(INDEXES):
+        if table in tables and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
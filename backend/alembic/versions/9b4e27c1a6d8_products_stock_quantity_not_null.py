@@ -0,0 +1,51 @@
+"""Make products.stock_quantity NOT NULL
+
+Revision ID: 9b4e27c1a6d8
+Revises: 3d9a61f0b2c4
+Create Date: 2026-10-18 15:21:37.640518
+
+The catalog already reports a NULL stock as 0 and lists it as out of stock, but
+checkout's conditional decrement (stock_quantity >= qty) can never match NULL, so
+those products were unsellable no matter what. NULL is backfilled to 0 and ruled out.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e27c1a6d8'
+down_revision: Union[str, None] = '3d9a61f0b2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _alter_stock(nullable: bool) -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite reflects UUID columns as NUMERIC; redeclare them so the rebuilt table
+        # keeps its UUID columns, primary key and vendor foreign key
+        reflect_args = [
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('vendor_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('vendors.id'), nullable=False),
+        ]
+        with op.batch_alter_table('products', reflect_args=reflect_args) as batch_op:
+            batch_op.alter_column(
+                'stock_quantity', existing_type=sa.Integer(), nullable=nullable,
+                server_default=None if nullable else '0'
+            )
+    else:
+        op.alter_column(
+            'products', 'stock_quantity', existing_type=sa.Integer(), nullable=nullable,
+            server_default=None if nullable else '0'
+        )
+
+
+def upgrade() -> None:
+    op.execute("UPDATE products SET stock_quantity = 0 WHERE stock_quantity IS NULL")
+    _alter_stock(nullable=False)
+
+
+def downgrade() -> None:
+    _alter_stock(nullable=True)
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
 from sqlalchemy.future import select
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from app.core.database import get_db
 from app.models.vendor import Vendor, VendorStatus
+from app.models.vendor_stats import VendorStats, VendorMonthlyRevenue
+from app.models.unread_counter import UnreadCounter
+from app.models.broadcast import BroadcastReceipt, BroadcastSubscription
 from app.models.notification import Notification, NotificationType
-from app.models.order import Order, OrderItem
 from app.api.deps import get_current_admin
+from app.api.orders import OrderListParams, paginate_orders
 from app.core.config import settings
 import uuid
 import string
 import secrets
 from supabase import create_client, Client
 from app.core.email import send_approval_email, send_suspension_email, send_reactivation_email, send_rejection_email
+from app.services.catalog_cache import catalog_cache
+from app.services.identity_cache import identity_cache
+from app.services.unread_counters import subscribe_to_broadcasts
 
 router = APIRouter()
 
@@ -73,8 +79,11 @@ async def approve_vendor(vendor_id: uuid.UUID, background_tasks: BackgroundTasks
     vendor.status = VendorStatus.APPROVED
     vendor.is_verified = True
     vendor.auth_user_id = auth_user_id
+    await subscribe_to_broadcasts(db, vendor.id)
     
     await db.commit()
+    catalog_cache.invalidate()
+    identity_cache.invalidate(vendor.contact_email)
     
     # 3. Send Email (via Background Task)
     background_tasks.add_task(send_approval_email, vendor.contact_email, temp_password)
@@ -98,6 +107,8 @@ async def reject_vendor(vendor_id: uuid.UUID, background_tasks: BackgroundTasks,
     db.add(notification)
     
     await db.commit()
+    catalog_cache.invalidate()
+    identity_cache.invalidate(vendor.contact_email)
     
     background_tasks.add_task(send_rejection_email, vendor.contact_email, vendor.business_name)
     
@@ -126,6 +137,8 @@ async def suspend_vendor(vendor_id: uuid.UUID, background_tasks: BackgroundTasks
     db.add(notification)
     
     await db.commit()
+    catalog_cache.invalidate()
+    identity_cache.invalidate(vendor.contact_email)
     
     background_tasks.add_task(send_suspension_email, vendor.contact_email, vendor.business_name)
     
@@ -154,6 +167,8 @@ async def reactivate_vendor(vendor_id: uuid.UUID, background_tasks: BackgroundTa
     db.add(notification)
     
     await db.commit()
+    catalog_cache.invalidate()
+    identity_cache.invalidate(vendor.contact_email)
     
     background_tasks.add_task(send_reactivation_email, vendor.contact_email, vendor.business_name)
     
@@ -167,41 +182,27 @@ async def delete_vendor(vendor_id: uuid.UUID, db: AsyncSession = Depends(get_db)
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     
-    business_name = vendor.business_name
+    business_name, contact_email = vendor.business_name, vendor.contact_email
+    await db.execute(delete(VendorMonthlyRevenue).where(VendorMonthlyRevenue.vendor_id == vendor.id))
+    await db.execute(delete(VendorStats).where(VendorStats.vendor_id == vendor.id))
+    await db.execute(delete(UnreadCounter).where(UnreadCounter.recipient == str(vendor.id)))
+    await db.execute(delete(BroadcastReceipt).where(BroadcastReceipt.vendor_id == vendor.id))
+    await db.execute(delete(BroadcastSubscription).where(BroadcastSubscription.vendor_id == vendor.id))
     await db.delete(vendor)
     await db.commit()
+    catalog_cache.invalidate()
+    identity_cache.invalidate(contact_email)
     
     return {"message": f"Vendor '{business_name}' deleted permanently"}
 
 
 # ========== ORDERS SECTION ==========
 @router.get("/orders")
-async def list_admin_orders(db: AsyncSession = Depends(get_db), admin=Depends(get_current_admin)):
-    """Get all orders for Admin Dashboard."""
-    try:
-        query = select(Order).options(
-            selectinload(Order.items).selectinload(OrderItem.product),
-            selectinload(Order.items).selectinload(OrderItem.vendor)
-        ).order_by(Order.created_at.desc())
-        
-        result = await db.execute(query)
-        orders = result.scalars().all()
-        
-        formatted = []
-        for o in orders:
-            items_count = len(o.items) if o.items else 0
-            formatted.append({
-                "id": str(o.id),
-                "customer_name": o.customer_name or "Unknown",
-                "customer_email": o.customer_email or "",
-                "date": o.created_at.strftime("%Y-%m-%d %H:%M") if o.created_at else "Unknown",
-                "status": str(o.status.value) if hasattr(o.status, 'value') else str(o.status),
-                "total": float(o.total_amount),
-                "items_count": items_count
-            })
-        
-        return formatted
-        
-    except Exception as e:
-        print(f"Error listing admin orders: {e}")
-        return []
+async def list_admin_orders(
+    response: Response,
+    params: OrderListParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    """Get orders for Admin Dashboard (same paginated listing as GET /orders/)."""
+    return await paginate_orders(db, params, response)
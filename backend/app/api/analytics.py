@@ -1,75 +1,79 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, case, extract
-from app.core.database import get_db
-from app.models.order import Order, OrderStatus, OrderItem
+from app.models.order import Order, OrderItem, OrderStatus
 from app.models.vendor import Vendor, VendorStatus
-from app.models.product import Product, ProductApprovalStatus
 from app.models.user import User
-from app.api.deps import get_current_vendor
-from datetime import datetime, timedelta
+from app.models.daily_sales_rollup import DailySalesRollup
+from app.models.vendor_stats import VendorStats
+from app.services.vendor_stats import load_vendor_stats
+from app.services.analytics_cache import analytics_cache
+from app.core.database import get_session_factory
+from app.api.deps import get_current_vendor, get_current_admin
+from app.core.time_buckets import Granularity, time_bucket, bucket_start
+from typing import Optional
+from datetime import date, datetime, timedelta
 
 router = APIRouter()
 
+
+def last_months(count: int):
+    """The last `count` calendar months as (year, month), oldest first, current month included."""
+    today = datetime.utcnow().date()
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
 @router.get("/dashboard")
-async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
+async def get_dashboard_stats(session_factory = Depends(get_session_factory)):
     """
     Get aggregated statistics for the Admin Dashboard.
-    All values are calculated from actual database records.
+    All values are calculated from actual database records (cached, see analytics_cache).
     """
-    
-    # 1. Total Revenue (Sum of all non-cancelled orders)
-    res_revenue = await db.execute(
-        select(func.sum(Order.total_amount))
-        .where(Order.status != OrderStatus.CANCELLED)
+    months = last_months(6)
+    return await analytics_cache.get(
+        ("admin", "dashboard", months[0]), lambda db: build_dashboard_stats(db, months), session_factory
     )
-    revenue = res_revenue.scalar() or 0
-    
-    # 2. Total Orders Count
-    res_orders = await db.execute(select(func.count(Order.id)))
-    total_orders = res_orders.scalar() or 0
-    
-    # 3. Active Vendors Count
-    res_vendors = await db.execute(
-        select(func.count(Vendor.id)).where(Vendor.status == VendorStatus.APPROVED)
-    )
-    active_vendors = res_vendors.scalar() or 0
-    
-    # 4. Total Customers Count (Users with role 'customer')
-    res_customers = await db.execute(
-        select(func.count(User.id)).where(User.role == 'customer')
+
+
+async def build_dashboard_stats(db: AsyncSession, months):
+    # 1-4. Revenue (non-cancelled orders) and order count from the daily rollup,
+    # active vendors and customers: one statement, one scalar subquery each
+    res_metrics = await db.execute(
+        select(
+            select(func.sum(DailySalesRollup.revenue)).scalar_subquery().label("revenue"),
+            select(func.sum(DailySalesRollup.order_count)).scalar_subquery().label("total_orders"),
+            select(func.count(Vendor.id)).where(Vendor.status == VendorStatus.APPROVED).scalar_subquery().label("active_vendors"),
+            select(func.count(User.id)).where(User.role == 'customer').scalar_subquery().label("total_customers"),
+        )
     )
-    total_customers = res_customers.scalar() or 0
-
-    # 5. Sales Trend (Last 6 months)
-    # Note: For SQLite/Postgres compatibility in MVP, we might fetch recent orders and aggregate in Python
-    # or use a simple query. Here we'll do a simple Python aggregation for safety.
-    six_months_ago = datetime.now() - timedelta(days=180)
-    res_trend_orders = await db.execute(
-        select(Order.created_at, Order.total_amount)
-        .where(Order.created_at >= six_months_ago)
-        .where(Order.status != OrderStatus.CANCELLED)
-        .order_by(Order.created_at)
+    metrics = res_metrics.one()
+    revenue = metrics.revenue or 0
+    total_orders = metrics.total_orders or 0
+    active_vendors = metrics.active_vendors or 0
+    total_customers = metrics.total_customers or 0
+
+    # 5. Sales Trend (last 6 calendar months, current one included) from the daily rollup
+    month_start = time_bucket(db.get_bind().dialect.name, DailySalesRollup.date, Granularity.MONTH).label("month_start")
+    res_trend = await db.execute(
+        select(month_start, func.sum(DailySalesRollup.revenue).label("revenue"))
+        .where(DailySalesRollup.date >= date(months[0][0], months[0][1], 1))
+        .group_by(month_start)
     )
-    trend_orders = res_trend_orders.all()
-    
-    # Group by Month name
-    history_map = {}
-    for order in trend_orders:
-        month_name = order.created_at.strftime("%b") # Jan, Feb
-        history_map[month_name] = history_map.get(month_name, 0) + (order.total_amount or 0)
-        
-    # Format for graph (ensure order?) - Using fixed last 6 months order would be better but simple dict is okay for now
-    # Let's clean it up to be chronological
-    sales_trend = []
-    for i in range(5, -1, -1):
-        month_date = datetime.now() - timedelta(days=i*30)
-        name = month_date.strftime("%b")
-        sales_trend.append({
-            "month": name,
-            "amount": int(history_map.get(name, 0))
-        })
+    history_map = {(row.month_start.year, row.month_start.month): row.revenue or 0 for row in res_trend.all()}
+
+    sales_trend = [
+        {
+            "month": date(year, month, 1).strftime("%b"),
+            "amount": int(history_map.get((year, month), 0))
+        }
+        for year, month in months
+    ]
 
     return {
         "revenue": float(revenue),
@@ -82,79 +86,154 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
 
 @router.get("/vendor/dashboard")
 async def get_vendor_dashboard_stats(
-    db: AsyncSession = Depends(get_db),
-    vendor: Vendor = Depends(get_current_vendor)
+    vendor: Vendor = Depends(get_current_vendor),
+    session_factory = Depends(get_session_factory)
 ):
     """
     Get dynamic statistics for the Vendor Dashboard.
-    Calculates specific earnings and orders for the logged-in vendor.
+    Reads the logged-in vendor's pre-aggregated counters (see app/services/vendor_stats.py), cached.
     """
-    
-    # 1. Vendor's Revenue (Sum of (price * quantity) for items belonging to this vendor)
-    # Only for non-cancelled orders
-    res_earnings = await db.execute(
-        select(func.sum(OrderItem.price_at_purchase * OrderItem.quantity))
-        .join(Order, OrderItem.order_id == Order.id)
-        .where(OrderItem.vendor_id == vendor.id)
-        .where(Order.status != OrderStatus.CANCELLED)
+    months = last_months(6)
+    vendor_id = vendor.id
+    return await analytics_cache.get(
+        ("vendor", vendor_id, "dashboard", months[0]), lambda db: build_vendor_dashboard_stats(db, vendor_id, months),
+        session_factory
     )
-    earnings = res_earnings.scalar() or 0
-    
-    # 2. Active Products (Published)
-    res_active_products = await db.execute(
-        select(func.count(Product.id)).where(
-            Product.vendor_id == vendor.id,
-            Product.approval_status == ProductApprovalStatus.PUBLISHED,
-            Product.is_active == True
-        )
+
+
+async def build_vendor_dashboard_stats(db: AsyncSession, vendor_id, months):
+    # Existing vendors are backfilled at startup (app/services/read_models.py), so a
+    # vendor without a row has had no products or orders yet
+    loaded = await load_vendor_stats(db, vendor_id, "%04d-%02d" % months[0])
+    stats, monthly = loaded or (VendorStats(vendor_id=vendor_id), {})
+
+    revenue_graph = [
+        {
+            "name": date(year, month, 1).strftime("%b"),
+            "total": int(monthly.get("%04d-%02d" % (year, month), 0))
+        }
+        for year, month in months
+    ]
+        
+    return {
+        "earnings": float(stats.earnings or 0),
+        "active_products": int(stats.active_products or 0),
+        "pending_orders": int(stats.pending_orders or 0),
+        "total_products": int(stats.total_products or 0),
+        "revenue_graph": revenue_graph
+    }
+
+
+class SalesWindow:
+    """
+    Query parameters of the sales series: bucket size and an inclusive date range.
+    Without `from`, the range covers the last 30 days / 12 weeks / 12 months up to `to` (default today).
+    """
+
+    def __init__(
+        self,
+        granularity: Granularity = Granularity.DAY,
+        date_from: Optional[date] = Query(None, alias="from"),
+        date_to: Optional[date] = Query(None, alias="to"),
+    ):
+        self.granularity = granularity
+        self.date_to = date_to or datetime.utcnow().date()
+        if date_from is None:
+            if granularity == Granularity.DAY:
+                date_from = self.date_to - timedelta(days=29)
+            elif granularity == Granularity.WEEK:
+                date_from = bucket_start(self.date_to, granularity) - timedelta(weeks=11)
+            else:
+                year, month = divmod(self.date_to.year * 12 + self.date_to.month - 12, 12)
+                date_from = date(year, month + 1, 1)
+        if date_from > self.date_to:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        self.date_from = date_from
+
+    @property
+    def key(self):
+        return (self.granularity.value, self.date_from, self.date_to)
+
+    def series(self, rows):
+        return {
+            "granularity": self.granularity.value,
+            "from": self.date_from.isoformat(),
+            "to": self.date_to.isoformat(),
+            # Only buckets with sales are returned
+            "buckets": [
+                {"bucket": row.bucket.isoformat(), "orders": int(row.orders or 0), "revenue": float(row.revenue or 0)}
+                for row in rows
+            ]
+        }
+
+
+@router.get("/sales")
+async def get_sales_series(
+    window: SalesWindow = Depends(),
+    admin = Depends(get_current_admin),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    Platform sales per day / week / month (Admin), grouped in the database
+    over the daily sales rollup. Cancelled orders are excluded. Cached.
+    """
+    return await analytics_cache.get(
+        ("admin", "sales", *window.key), lambda db: build_sales_series(db, window), session_factory
     )
-    active_products = res_active_products.scalar() or 0
-    
-    # 3. Pending Orders (Count of distinct orders containing this vendor's items that are PENDING)
-    res_pending = await db.execute(
-        select(func.count(func.distinct(Order.id)))
-        .join(OrderItem, Order.id == OrderItem.order_id)
-        .where(OrderItem.vendor_id == vendor.id)
-        .where(Order.status == OrderStatus.PENDING)
+
+
+async def build_sales_series(db: AsyncSession, window: SalesWindow):
+    bucket = time_bucket(db.get_bind().dialect.name, DailySalesRollup.date, window.granularity).label("bucket")
+    result = await db.execute(
+        select(
+            bucket,
+            func.sum(DailySalesRollup.order_count - DailySalesRollup.cancelled).label("orders"),
+            func.sum(DailySalesRollup.revenue).label("revenue"),
+        )
+        .where(DailySalesRollup.date >= window.date_from, DailySalesRollup.date <= window.date_to)
+        .group_by(bucket)
+        .order_by(bucket)
     )
-    pending_orders = res_pending.scalar() or 0
-    
-    # 4. Total Products
-    res_total_products = await db.execute(
-        select(func.count(Product.id)).where(Product.vendor_id == vendor.id)
+    return window.series(result.all())
+
+
+@router.get("/vendor/sales")
+async def get_vendor_sales_series(
+    window: SalesWindow = Depends(),
+    vendor: Vendor = Depends(get_current_vendor),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    The logged-in vendor's sales per day / week / month, grouped in the database.
+    Revenue is the vendor's share of each non-cancelled order. Cached.
+    """
+    vendor_id = vendor.id
+    return await analytics_cache.get(
+        ("vendor", vendor_id, "sales", *window.key), lambda db: build_vendor_sales_series(db, vendor_id, window),
+        session_factory
     )
-    total_products = res_total_products.scalar() or 0
-    
-    # 5. Monthly Revenue Graph (Last 6 Months)
-    six_months_ago = datetime.now() - timedelta(days=180)
-    res_trend_items = await db.execute(
-        select(Order.created_at, OrderItem.price_at_purchase, OrderItem.quantity)
+
+
+async def build_vendor_sales_series(db: AsyncSession, vendor_id, window: SalesWindow):
+    bucket = time_bucket(db.get_bind().dialect.name, Order.created_at, window.granularity).label("bucket")
+    result = await db.execute(
+        select(
+            bucket,
+            func.count(func.distinct(Order.id)).label("orders"),
+            func.sum(OrderItem.price_at_purchase * OrderItem.quantity).label("revenue"),
+        )
+        .select_from(OrderItem)
         .join(Order, OrderItem.order_id == Order.id)
-        .where(OrderItem.vendor_id == vendor.id)
-        .where(Order.created_at >= six_months_ago)
+        .where(OrderItem.vendor_id == vendor_id)
         .where(Order.status != OrderStatus.CANCELLED)
+        .where(Order.created_at >= window.date_from, Order.created_at < window.date_to + timedelta(days=1))
+        .group_by(bucket)
+        .order_by(bucket)
     )
-    trend_items = res_trend_items.all()
-    
-    graph_map = {}
-    for item in trend_items:
-        month_name = item.created_at.strftime("%b")
-        total_val = item.price_at_purchase * item.quantity
-        graph_map[month_name] = graph_map.get(month_name, 0) + total_val
-
-    revenue_graph = []
-    for i in range(5, -1, -1):
-        month_date = datetime.now() - timedelta(days=i*30)
-        name = month_date.strftime("%b")
-        revenue_graph.append({
-            "name": name,
-            "total": int(graph_map.get(name, 0))
-        })
-        
-    return {
-        "earnings": float(earnings),
-        "active_products": int(active_products),
-        "pending_orders": int(pending_orders),
-        "total_products": int(total_products),
-        "revenue_graph": revenue_graph
-    }
+    return window.series(result.all())
+
+
+@router.get("/cache")
+async def get_analytics_cache_stats(admin = Depends(get_current_admin)):
+    """Hit/miss counters of the analytics cache (Admin), for tuning its TTLs."""
+    return analytics_cache.stats()
@@ -6,7 +6,8 @@ from app.core.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.token import Token
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import hash_password, check_password, create_access_token
+from app.services.identity_cache import identity_cache
 from datetime import timedelta
 from datetime import datetime
 
@@ -25,7 +26,7 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     new_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -37,6 +38,7 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
         db.add(new_user)
         await db.commit()
+        identity_cache.invalidate(new_user.email)  # May hold "no user row" for this email
         await db.refresh(new_user)
         return new_user
     except Exception as e:
@@ -52,7 +54,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await check_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username (email) or password",
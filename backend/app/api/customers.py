@@ -1,15 +1,93 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.future import select
+from sqlalchemy import or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.pagination import encode_cursor, decode_cursor
+from app.models.customer_stats import CustomerStats
+from app.models.user import User
+from app.api.deps import get_current_admin
+from typing import Optional
+from datetime import datetime, timedelta
+import enum
 
 router = APIRouter()
 
-# Mock Customers
-MOCK_CUSTOMERS = [
-    {"id": 1, "name": "Ravi Kumar", "email": "ravi@example.com", "phone": "+91 9876543210", "orders": 12, "spent": "₹15,400", "status": "Active"},
-    {"id": 2, "name": "Sneha Gupta", "email": "sneha@example.com", "phone": "+91 9876543211", "orders": 5, "spent": "₹4,200", "status": "Active"},
-    {"id": 3, "name": "Amit Patel", "email": "amit@example.com", "phone": "+91 9876543212", "orders": 0, "spent": "₹0", "status": "Inactive"},
-]
+# Customers who ordered within this many days are shown as Active
+ACTIVE_WINDOW_DAYS = 90
+
+
+class CustomerSort(str, enum.Enum):
+    RECENT = "recent"  # Last order first
+    SPEND = "spend"  # Highest lifetime spend first
+
 
 @router.get("/")
-async def list_customers():
-    return MOCK_CUSTOMERS
+async def list_customers(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    sort: CustomerSort = CustomerSort.RECENT,
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(get_current_admin)
+):
+    """
+    Customer directory (Admin): everyone who has placed an order, with order count,
+    lifetime spend (non-cancelled orders) and last order date read from the
+    customer_stats summary, plus name and phone from `users` when they have an account.
+    When more customers exist, pass the `X-Next-Cursor` response header back as `cursor`.
+    """
+    sort_column = CustomerStats.total_spent if sort == CustomerSort.SPEND else CustomerStats.last_order_at
+    query = (
+        select(
+            CustomerStats,
+            User.id.label("user_id"),
+            User.full_name,
+            User.phone_number,
+            User.is_active,
+        )
+        # customer_email is stored lower-cased; account emails keep the case they signed up with
+        .outerjoin(User, func.lower(User.email) == CustomerStats.customer_email)
+        .where(CustomerStats.order_count > 0)
+    )
+
+    if cursor:
+        value, email = decode_cursor(cursor, 2)
+        try:
+            value = float(value) if sort == CustomerSort.SPEND else datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(or_(
+            sort_column < value,
+            and_(sort_column == value, CustomerStats.customer_email < email)
+        ))
+
+    result = await db.execute(
+        query.order_by(sort_column.desc(), CustomerStats.customer_email.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1].CustomerStats
+        value = last.total_spent if sort == CustomerSort.SPEND else last.last_order_at.isoformat()
+        response.headers["X-Next-Cursor"] = encode_cursor(value, last.customer_email)
+
+    active_since = datetime.utcnow() - timedelta(days=ACTIVE_WINDOW_DAYS)
+    customers = []
+    for row in rows:
+        stats = row.CustomerStats
+        active = row.is_active is not False and stats.last_order_at is not None and stats.last_order_at >= active_since
+        customers.append({
+            "id": stats.customer_email,
+            "user_id": row.user_id,
+            "name": row.full_name or stats.customer_name or "Unknown",
+            "email": stats.customer_email,
+            "phone": row.phone_number or "",
+            "orders": stats.order_count,
+            "total_spent": float(stats.total_spent or 0),
+            "spent": f"₹{stats.total_spent or 0:,.0f}",
+            "last_order_at": stats.last_order_at.isoformat() if stats.last_order_at else None,
+            "status": "Active" if active else "Inactive",
+        })
+    return customers
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, exists, func, insert, literal, or_, update
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
-from pydantic import BaseModel
-from app.core.database import get_db
+from typing import Awaitable, Callable, List, Optional
+from pydantic import BaseModel, Field
+from app.core.config import settings
+from app.core.database import get_db, get_session_factory
+from app.core.security import create_stream_token
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models.notification import Notification, NotificationType
 from app.models.admin_notification import AdminNotification, AdminNotificationType
+from app.models.broadcast import BroadcastNotification, BroadcastReceipt
 from app.models.vendor import Vendor, VendorStatus
-from app.api.deps import get_current_vendor, get_current_admin
+from app.api.deps import get_current_vendor, get_current_admin, get_stream_claims
+from app.services.identity_cache import identity_cache
+from app.services.unread_counters import ADMIN, broadcast_visible_to, recipient_key, record_unread, unread_count
+from app.services.notification_hub import notification_hub, vendor_channel, ADMIN_CHANNEL, BROADCAST_CHANNEL
+import json
 import uuid
 from datetime import datetime
 
@@ -24,6 +34,7 @@ class NotificationResponse(BaseModel):
     is_read: bool
     created_at: datetime
     extra_data: Optional[dict] = None
+    broadcast: bool = False  # Sent to all vendors
 
     class Config:
         from_attributes = True
@@ -42,32 +53,195 @@ class BestSellerInviteRequest(BaseModel):
     message: Optional[str] = None
 
 
+class MarkReadRequest(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=500)
+
+
+class NotificationListParams:
+    """Query parameters of the vendor feed and the admin sent history."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=200),
+        type: Optional[NotificationType] = None,
+        is_read: Optional[bool] = None,
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.type = type
+        self.is_read = is_read
+
+
+class AdminInboxParams(NotificationListParams):
+    """Query parameters of the admin inbox (admin notification types)."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=200),
+        type: Optional[AdminNotificationType] = None,
+        is_read: Optional[bool] = None,
+    ):
+        super().__init__(cursor, limit, type, is_read)
+
+
+def _keyset(query, model, params: NotificationListParams):
+    """Newest first on (created_at, id), starting after the cursor, one row past the page."""
+    if params.type is not None:
+        query = query.where(model.type == params.type)
+    if params.cursor:
+        created_at, row_id = decode_cursor(params.cursor, 2)
+        try:
+            created_at, row_id = datetime.fromisoformat(created_at), uuid.UUID(row_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(params.limit + 1)
+
+
+def _page(items: list, params: NotificationListParams, response: Response, row=lambda item: item) -> list:
+    """
+    Newest-first items fetched with `_keyset` (several listings may be merged) cut to
+    one page; sets `X-Next-Cursor` from `row(last item)` when more follow.
+    """
+    items.sort(key=lambda item: (row(item).created_at, row(item).id), reverse=True)
+    if len(items) > params.limit:
+        items = items[:params.limit]
+        last = row(items[-1])
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at.isoformat(), str(last.id))
+    return items
+
+
+async def _mark_read(db: AsyncSession, model, recipient: str, *criteria) -> int:
+    """
+    Flip the recipient's matching unread notifications to read in one UPDATE and move
+    their unread counter by the rows changed. Returns the number marked; caller commits.
+    """
+    result = await db.execute(
+        update(model)
+        .where(model.is_read == False, *criteria)
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    # Core UPDATE bypasses the flush hook, so the counter is adjusted here
+    await record_unread(db, {recipient: -result.rowcount})
+    return result.rowcount
+
+
+async def _mark_broadcasts_read(db: AsyncSession, vendor_id: uuid.UUID, *criteria) -> int:
+    """
+    Write read receipts for the vendor's matching unread broadcasts (of those they can see)
+    in one INSERT ... SELECT and move their unread counter to match. Returns the number
+    marked; caller commits.
+    """
+    already_read = exists().where(
+        BroadcastReceipt.broadcast_id == BroadcastNotification.id,
+        BroadcastReceipt.vendor_id == vendor_id
+    )
+    result = await db.execute(
+        insert(BroadcastReceipt).from_select(
+            ["broadcast_id", "vendor_id", "read_at"],
+            select(BroadcastNotification.id, literal(vendor_id, BroadcastReceipt.vendor_id.type), func.now())
+            .where(~already_read, broadcast_visible_to(vendor_id), *criteria)
+        )
+    )
+    await record_unread(db, {recipient_key(vendor_id): -result.rowcount})
+    return result.rowcount
+
+
+async def notification_stream(
+    request: Request,
+    channels: List[str],
+    still_allowed: Optional[Callable[[], Awaitable[bool]]] = None
+):
+    """
+    Server-Sent Events: one `notification` event per new notification on `channels`,
+    and a comment line whenever the connection has been idle for the heartbeat interval.
+    `still_allowed` is checked at each heartbeat; the stream ends once it returns False.
+    """
+    with notification_hub.subscribe(channels) as subscription:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            message = await subscription.get(notification_hub.heartbeat_seconds)
+            if message is None:
+                if still_allowed is not None and not await still_allowed():
+                    return
+                yield ": heartbeat\n\n"
+            else:
+                yield f"event: notification\ndata: {json.dumps(message)}\n\n"
+
+
+def _stream_response(request: Request, channels: List[str], still_allowed=None) -> StreamingResponse:
+    return StreamingResponse(
+        notification_stream(request, channels, still_allowed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _stream_token(email: str, role: str) -> dict:
+    return {"token": create_stream_token(email, role), "expires_in": settings.NOTIFICATION_STREAM_TOKEN_SECONDS}
+
+
+async def _approved_vendor(session_factory, email: str) -> Optional[Vendor]:
+    # A session of its own: streams don't hold a pooled connection between checks
+    async with session_factory() as db:
+        identity = await identity_cache.get(db, email)
+    vendor = identity.vendor_object()
+    return vendor if vendor is not None and vendor.status == VendorStatus.APPROVED else None
+
+
 # ===================== VENDOR ENDPOINTS =====================
 
 @router.get("/notifications", response_model=List[NotificationResponse])
 async def get_vendor_notifications(
+    response: Response,
+    params: NotificationListParams = Depends(),
     db: AsyncSession = Depends(get_db),
     vendor: Vendor = Depends(get_current_vendor)
 ):
-    """Get all notifications for the logged-in vendor, most recent first."""
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.vendor_id == vendor.id)
-        .order_by(Notification.created_at.desc())
+    """
+    Notifications for the logged-in vendor, most recent first: their own notifications
+    merged with broadcasts sent since they were approved (read if they have a receipt).
+    Filter by type and read state. When more exist, pass the `X-Next-Cursor`
+    response header back as `cursor`.
+    """
+    direct = select(Notification).where(Notification.vendor_id == vendor.id)
+    if params.is_read is not None:
+        direct = direct.where(Notification.is_read == params.is_read)
+    result = await db.execute(_keyset(direct, Notification, params))
+    feed = [(n, n.is_read, False) for n in result.scalars().all()]
+
+    broadcasts = (
+        select(BroadcastNotification, BroadcastReceipt.read_at)
+        .outerjoin(BroadcastReceipt, and_(
+            BroadcastReceipt.broadcast_id == BroadcastNotification.id,
+            BroadcastReceipt.vendor_id == vendor.id
+        ))
+        .where(broadcast_visible_to(vendor.id))
     )
-    notifications = result.scalars().all()
-    
+    if params.is_read is not None:
+        read = BroadcastReceipt.read_at.is_not(None)
+        broadcasts = broadcasts.where(read if params.is_read else ~read)
+    result = await db.execute(_keyset(broadcasts, BroadcastNotification, params))
+    feed.extend((b, read_at is not None, True) for b, read_at in result.all())
+
     return [
         NotificationResponse(
             id=str(n.id),
             type=n.type.value,
             title=n.title,
             message=n.message,
-            is_read=n.is_read,
+            is_read=is_read,
             created_at=n.created_at,
-            extra_data=n.extra_data
+            extra_data=n.extra_data,
+            broadcast=broadcast
         )
-        for n in notifications
+        for n, is_read, broadcast in _page(feed, params, response, row=lambda item: item[0])
     ]
 
 
@@ -76,14 +250,37 @@ async def get_unread_count(
     db: AsyncSession = Depends(get_db),
     vendor: Vendor = Depends(get_current_vendor)
 ):
-    """Get count of unread notifications for notification bell badge."""
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.vendor_id == vendor.id)
-        .where(Notification.is_read == False)
-    )
-    count = len(result.scalars().all())
-    return {"unread_count": count}
+    """Get count of unread notifications for notification bell badge (a counter read, see unread_counters)."""
+    return {"unread_count": await unread_count(db, recipient_key(vendor.id))}
+
+
+@router.post("/notifications/stream-token")
+async def create_vendor_stream_token(vendor: Vendor = Depends(get_current_vendor)):
+    """Short-lived token to open `GET /notifications/stream?token=...` with."""
+    return _stream_token(vendor.contact_email, "vendor")
+
+
+@router.get("/notifications/stream")
+async def stream_vendor_notifications(
+    request: Request,
+    claims: dict = Depends(get_stream_claims),
+    session_factory=Depends(get_session_factory)
+):
+    """
+    Live feed for a vendor (text/event-stream): their own notifications and broadcasts
+    as they are committed. Use it instead of polling the feed and badge. Open it with
+    a token from `POST /notifications/stream-token`; it ends once the vendor is no
+    longer approved (checked at each heartbeat), and the client asks for a new token.
+    """
+    vendor = await _approved_vendor(session_factory, claims["sub"]) if claims.get("role") == "vendor" else None
+    if vendor is None:
+        raise HTTPException(status_code=403, detail="Vendor account is not approved")
+
+    async def still_approved() -> bool:
+        current = await _approved_vendor(session_factory, claims["sub"])
+        return current is not None and current.id == vendor.id
+
+    return _stream_response(request, [vendor_channel(vendor.id), BROADCAST_CHANNEL], still_approved)
 
 
 @router.post("/notifications/{notification_id}/read")
@@ -92,37 +289,49 @@ async def mark_notification_read(
     db: AsyncSession = Depends(get_db),
     vendor: Vendor = Depends(get_current_vendor)
 ):
-    """Mark a notification as read."""
+    """Mark a notification (or a broadcast) as read."""
     notification = await db.get(Notification, notification_id)
     
-    if not notification or notification.vendor_id != vendor.id:
+    if notification and notification.vendor_id == vendor.id:
+        notification.is_read = True
+    elif (await db.execute(
+        select(BroadcastNotification.id)
+        .where(BroadcastNotification.id == notification_id, broadcast_visible_to(vendor.id))
+    )).first():
+        await _mark_broadcasts_read(db, vendor.id, BroadcastNotification.id == notification_id)
+    else:
         raise HTTPException(status_code=404, detail="Notification not found")
-    
-    notification.is_read = True
     await db.commit()
     
     return {"message": "Notification marked as read"}
 
 
+@router.post("/notifications/read")
+async def mark_notifications_read(
+    request: MarkReadRequest,
+    db: AsyncSession = Depends(get_db),
+    vendor: Vendor = Depends(get_current_vendor)
+):
+    """Mark several notifications as read in one call. Ids of other vendors' or already-read notifications are skipped."""
+    count = await _mark_read(
+        db, Notification, recipient_key(vendor.id),
+        Notification.vendor_id == vendor.id, Notification.id.in_(request.ids)
+    )
+    count += await _mark_broadcasts_read(db, vendor.id, BroadcastNotification.id.in_(request.ids))
+    await db.commit()
+    return {"message": f"Marked {count} notifications as read", "count": count}
+
+
 @router.post("/notifications/mark-all-read")
 async def mark_all_read(
     db: AsyncSession = Depends(get_db),
     vendor: Vendor = Depends(get_current_vendor)
 ):
-    """Mark all vendor notifications as read."""
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.vendor_id == vendor.id)
-        .where(Notification.is_read == False)
-    )
-    notifications = result.scalars().all()
-    
-    for n in notifications:
-        n.is_read = True
-    
+    """Mark all vendor notifications, broadcasts included, as read."""
+    count = await _mark_read(db, Notification, recipient_key(vendor.id), Notification.vendor_id == vendor.id)
+    count += await _mark_broadcasts_read(db, vendor.id)
     await db.commit()
-    
-    return {"message": f"Marked {len(notifications)} notifications as read"}
+    return {"message": f"Marked {count} notifications as read", "count": count}
 
 
 # ===================== ADMIN ENDPOINTS =====================
@@ -135,7 +344,7 @@ async def send_notification(
 ):
     """
     Send a notification to a specific vendor or all vendors.
-    If vendor_id is None, sends to all approved vendors.
+    If vendor_id is None, sends one broadcast that every approved vendor sees.
     """
     notification_type = NotificationType(request.type)
     
@@ -158,24 +367,10 @@ async def send_notification(
         return {"message": f"Notification sent to {vendor.business_name}"}
     
     else:
-        # Send to all approved vendors
-        result = await db.execute(
-            select(Vendor).where(Vendor.status == VendorStatus.APPROVED)
+        # One broadcast row, merged into each vendor's feed when they read it
+        count = await notify_all_vendors(
+            db, notification_type, request.title, request.message, request.extra_data
         )
-        vendors = result.scalars().all()
-        
-        count = 0
-        for vendor in vendors:
-            notification = Notification(
-                vendor_id=vendor.id,
-                type=notification_type,
-                title=request.title,
-                message=request.message,
-                extra_data=request.extra_data
-            )
-            db.add(notification)
-            count += 1
-        
         await db.commit()
         
         return {"message": f"Notification sent to {count} vendors"}
@@ -219,53 +414,84 @@ async def send_best_seller_invite(
 
 @router.get("/admin/notifications/history")
 async def get_notification_history(
+    response: Response,
+    params: NotificationListParams = Depends(),
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin)
 ):
-    """Get history of all sent notifications (for admin dashboard)."""
-    result = await db.execute(
-        select(Notification)
-        .order_by(Notification.created_at.desc())
-        .limit(100)
-    )
-    notifications = result.scalars().all()
-    
-    # Get vendor names
-    vendor_ids = list(set(n.vendor_id for n in notifications))
-    vendors_result = await db.execute(
-        select(Vendor).where(Vendor.id.in_(vendor_ids))
+    """
+    History of sent notifications, broadcasts included, most recent first (for admin
+    dashboard). Filter by type and read state (a broadcast counts as read once any
+    vendor has read it). When more exist, pass the `X-Next-Cursor` header back as `cursor`.
+    """
+    direct = (
+        select(Notification, Vendor.business_name)
+        .outerjoin(Vendor, Vendor.id == Notification.vendor_id)
     )
-    vendors = {v.id: v.business_name for v in vendors_result.scalars().all()}
-    
-    return [
-        {
+    if params.is_read is not None:
+        direct = direct.where(Notification.is_read == params.is_read)
+    result = await db.execute(_keyset(direct, Notification, params))
+    history = [
+        (n, {
             "id": str(n.id),
             "vendor_id": str(n.vendor_id),
-            "vendor_name": vendors.get(n.vendor_id, "Unknown"),
+            "vendor_name": vendor_name or "Unknown",
             "type": n.type.value,
             "title": n.title,
             "message": n.message[:100] + "..." if len(n.message) > 100 else n.message,
             "is_read": n.is_read,
             "created_at": n.created_at.isoformat()
-        }
-        for n in notifications
+        })
+        for n, vendor_name in result.all()
     ]
 
+    read_by = (
+        select(func.count()).select_from(BroadcastReceipt)
+        .where(BroadcastReceipt.broadcast_id == BroadcastNotification.id)
+        .scalar_subquery()
+    )
+    broadcasts = select(BroadcastNotification, read_by.label("read_by"))
+    if params.is_read is not None:
+        read = exists().where(BroadcastReceipt.broadcast_id == BroadcastNotification.id)
+        broadcasts = broadcasts.where(read if params.is_read else ~read)
+    result = await db.execute(_keyset(broadcasts, BroadcastNotification, params))
+    history.extend(
+        (b, {
+            "id": str(b.id),
+            "vendor_id": None,
+            "vendor_name": "All vendors",
+            "type": b.type.value,
+            "title": b.title,
+            "message": b.message[:100] + "..." if len(b.message) > 100 else b.message,
+            "is_read": count > 0,
+            "read_by": count,
+            "created_at": b.created_at.isoformat()
+        })
+        for b, count in result.all()
+    )
+
+    return [entry for _, entry in _page(history, params, response, row=lambda item: item[0])]
+
 
 # ===================== ADMIN INBOX ENDPOINTS =====================
 
 @router.get("/admin/notifications/received")
 async def get_admin_notifications(
+    response: Response,
+    params: AdminInboxParams = Depends(),
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin)
 ):
-    """Get notifications sent TO the admin (New Order, New Vendor, etc)."""
-    result = await db.execute(
-        select(AdminNotification)
-        .order_by(AdminNotification.created_at.desc())
-        .limit(100)
-    )
-    notifications = result.scalars().all()
+    """
+    Notifications sent TO the admin (New Order, New Vendor, etc), most recent first.
+    Filter by type and read state. When more exist, pass the `X-Next-Cursor`
+    response header back as `cursor`.
+    """
+    query = select(AdminNotification)
+    if params.is_read is not None:
+        query = query.where(AdminNotification.is_read == params.is_read)
+    result = await db.execute(_keyset(query, AdminNotification, params))
+    notifications = _page(list(result.scalars().all()), params, response)
     
     return [
         {
@@ -281,18 +507,30 @@ async def get_admin_notifications(
     ]
 
 
+@router.post("/admin/notifications/received/stream-token")
+async def create_admin_stream_token(admin=Depends(get_current_admin)):
+    """Short-lived token to open `GET /admin/notifications/received/stream?token=...` with."""
+    return _stream_token(admin.email, "admin")
+
+
+@router.get("/admin/notifications/received/stream")
+async def stream_admin_notifications(request: Request, claims: dict = Depends(get_stream_claims)):
+    """
+    Live admin inbox (text/event-stream): new admin notifications as they are committed.
+    Open it with a token from `POST /admin/notifications/received/stream-token`.
+    """
+    if claims.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="The user is not an admin")
+    return _stream_response(request, [ADMIN_CHANNEL])
+
+
 @router.get("/admin/notifications/received/unread-count")
 async def get_admin_unread_count(
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin)
 ):
-    """Get unread count for admin bell."""
-    result = await db.execute(
-        select(AdminNotification)
-        .where(AdminNotification.is_read == False)
-    )
-    count = len(result.scalars().all())
-    return {"unread_count": count}
+    """Get unread count for admin bell (a counter read, see unread_counters)."""
+    return {"unread_count": await unread_count(db, ADMIN)}
 
 
 @router.post("/admin/notifications/received/{notification_id}/read")
@@ -311,23 +549,27 @@ async def mark_admin_notification_read(
     return {"message": "Marked as read"}
 
 
+@router.post("/admin/notifications/received/read")
+async def mark_admin_notifications_read(
+    request: MarkReadRequest,
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    """Mark several admin notifications as read in one call. Already-read ids are skipped."""
+    count = await _mark_read(db, AdminNotification, ADMIN, AdminNotification.id.in_(request.ids))
+    await db.commit()
+    return {"message": f"Marked {count} notifications as read", "count": count}
+
+
 @router.post("/admin/notifications/received/mark-all-read")
 async def mark_all_admin_notifications_read(
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin)
 ):
     """Mark all admin notifications as read."""
-    result = await db.execute(
-        select(AdminNotification)
-        .where(AdminNotification.is_read == False)
-    )
-    notifications = result.scalars().all()
-    
-    for n in notifications:
-        n.is_read = True
-        
+    count = await _mark_read(db, AdminNotification, ADMIN)
     await db.commit()
-    return {"message": f"Marked {len(notifications)} notifications as read"}
+    return {"message": f"Marked {count} notifications as read", "count": count}
 
 
 # ===================== HELPER FUNCTION =====================
@@ -342,6 +584,7 @@ async def create_system_notification(
     """
     Helper function to create system notifications.
     Used by other parts of the app (like suspend/reactivate).
+    Pushed to the vendor's live stream once the caller commits.
     """
     notification = Notification(
         vendor_id=vendor_id,
@@ -362,7 +605,7 @@ async def create_admin_notification(
     message: str,
     extra_data: dict = None
 ):
-    """Helper to create notifications for admins."""
+    """Helper to create notifications for admins (pushed to the admin stream on commit)."""
     notification = AdminNotification(
         type=type,
         title=title,
@@ -380,21 +623,20 @@ async def notify_all_vendors(
     message: str,
     extra_data: dict = None
 ):
-    """Helper to send a notification to ALL approved vendors."""
+    """
+    Helper to send a notification to ALL approved vendors, stored as a single
+    broadcast row, pushed to every vendor's live stream on commit. Returns the
+    number of approved vendors.
+    """
+    db.add(BroadcastNotification(
+        type=type,
+        title=title,
+        message=message,
+        extra_data=extra_data
+    ))
     result = await db.execute(
-        select(Vendor).where(Vendor.status == VendorStatus.APPROVED)
+        select(func.count(Vendor.id)).where(Vendor.status == VendorStatus.APPROVED)
     )
-    vendors = result.scalars().all()
-    
-    for vendor in vendors:
-        notification = Notification(
-            vendor_id=vendor.id,
-            type=type,
-            title=title,
-            message=message,
-            extra_data=extra_data
-        )
-        db.add(notification)
     
     # Caller must commit
-    return len(vendors)
+    return result.scalar()
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.future import select
+from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, OrderStatus
 from app.models.product import Product
 from app.models.vendor import Vendor
-from typing import List
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services.sales_rollup import record_status_change
+from app.services.vendor_stats import record_order_status_change
+from app.services.customer_stats import record_customer_status_change
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import uuid
 
 # Import Dependency for Auth
 from app.api.deps import get_current_user, get_current_admin
@@ -65,35 +73,136 @@ async def get_my_orders(
         print(f"Error fetching orders: {e}")
         return []
 
+class OrderListParams:
+    """Query parameters shared by the admin order listings."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=200),
+        status: Optional[OrderStatus] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        customer_email: Optional[str] = None,
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.status = status
+        self.date_from = date_from
+        self.date_to = date_to
+        self.customer_email = customer_email
+
+
+async def paginate_orders(db: AsyncSession, params: OrderListParams, response: Response) -> List[dict]:
+    """
+    One page of orders, newest first, keyset-paginated on (created_at, id).
+    Item counts come from a COUNT subquery, so no item/product/vendor rows are loaded
+    and memory per request is bounded by the page size.
+    """
+    items_count = (
+        select(func.count(OrderItem.id))
+        .where(OrderItem.order_id == Order.id)
+        .correlate(Order)
+        .scalar_subquery()
+        .label("items_count")
+    )
+    query = select(
+        Order.id,
+        Order.customer_name,
+        Order.customer_email,
+        Order.created_at,
+        Order.status,
+        Order.total_amount,
+        items_count,
+    )
+
+    if params.status is not None:
+        query = query.where(Order.status == params.status)
+    if params.date_from is not None:
+        query = query.where(Order.created_at >= params.date_from)
+    if params.date_to is not None:
+        query = query.where(Order.created_at < params.date_to)
+    if params.customer_email:
+        query = query.where(Order.customer_email == params.customer_email)
+
+    if params.cursor:
+        created_at, order_id = decode_cursor(params.cursor, 2)
+        try:
+            created_at, order_id = datetime.fromisoformat(created_at), uuid.UUID(order_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(or_(
+            Order.created_at < created_at,
+            and_(Order.created_at == created_at, Order.id < order_id)
+        ))
+
+    result = await db.execute(
+        query.order_by(Order.created_at.desc(), Order.id.desc()).limit(params.limit + 1)
+    )
+    rows = result.all()
+
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at.isoformat(), str(last.id))
+
+    return [
+        {
+            "id": str(o.id),
+            "customer_name": o.customer_name or "Unknown",
+            "customer_email": o.customer_email or "",
+            "date": o.created_at.strftime("%Y-%m-%d %H:%M") if o.created_at else "Unknown",
+            "status": str(o.status.value) if hasattr(o.status, 'value') else str(o.status),
+            "total": float(o.total_amount),
+            "items_count": o.items_count
+        }
+        for o in rows
+    ]
+
+
 @router.get("/")
-async def list_orders(db: AsyncSession = Depends(get_db), admin = Depends(get_current_admin)):
+async def list_orders(
+    response: Response,
+    params: OrderListParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(get_current_admin)
+):
     """
-    Get all orders (Global Admin View).
+    Get orders (Global Admin View), newest first.
+    Filter by status, created_at range (date_from inclusive, date_to exclusive) and customer email.
+    When more orders exist, pass the `X-Next-Cursor` response header back as `cursor`.
     """
-    try:
-        query = select(Order).options(
-            selectinload(Order.items).selectinload(OrderItem.product),
-            selectinload(Order.items).selectinload(OrderItem.vendor)
-        ).order_by(Order.created_at.desc())
-        
-        result = await db.execute(query)
-        orders = result.scalars().all()
-        
-        formatted = []
-        for o in orders:
-            items_count = len(o.items) if o.items else 0
-            formatted.append({
-                "id": str(o.id),
-                "customer_name": o.customer_name or "Unknown",
-                "customer_email": o.customer_email or "",
-                "date": o.created_at.strftime("%Y-%m-%d %H:%M") if o.created_at else "Unknown",
-                "status": str(o.status.value) if hasattr(o.status, 'value') else str(o.status),
-                "total": float(o.total_amount),
-                "items_count": items_count
-            })
-        
-        return formatted
-        
-    except Exception as e:
-        print(f"Error listing all orders: {e}")
-        return []
+    return await paginate_orders(db, params, response)
+
+
+class OrderStatusUpdate(BaseModel):
+    status: OrderStatus
+
+
+@router.put("/{order_id}/status")
+async def update_order_status(
+    order_id: uuid.UUID,
+    payload: OrderStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(get_current_admin)
+):
+    """
+    Move an order to a new status (Admin).
+    The daily sales rollup, vendor stats and customer summary are adjusted in the same transaction.
+    """
+    result = await db.execute(select(Order).where(Order.id == order_id).with_for_update())
+    order = result.scalars().first()
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    old_status = order.status
+    if old_status == payload.status:
+        return {"message": "Status unchanged", "status": payload.status.value}
+
+    order.status = payload.status
+    await record_status_change(db, order, old_status)
+    await record_order_status_change(db, order, old_status)
+    await record_customer_status_change(db, order, old_status)
+    await db.commit()
+
+    return {"message": "Order status updated", "status": payload.status.value}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Response
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -10,6 +10,8 @@ from typing import List
 import uuid
 import traceback
 from app.models.admin_notification import AdminNotification, AdminNotificationType
+from app.services.vendor_stats import record_product_change, is_listed
+from app.services.catalog_cache import catalog_cache, catalog_query, catalog_product_dict
 import logging
 
 logger = logging.getLogger("uvicorn.error")
@@ -88,34 +90,19 @@ async def list_vendor_products(db: AsyncSession = Depends(get_db), vendor: Vendo
 async def list_public_products(db: AsyncSession = Depends(get_db)):
     """
     Public Endpoint: Get all active products for the mobile app.
+    Served pre-serialized from the catalog snapshot when the cache is enabled.
     """
     logger.info("Entering public products endpoint")
     try:
-        # Load vendors to get name/business_name
-        result = await db.execute(
-            select(Product)
-            .where(Product.is_active == True)
-            .options(selectinload(Product.vendor), selectinload(Product.category))
-        )
-        products = result.scalars().all()
+        if catalog_cache.enabled:
+            snapshot = await catalog_cache.get(db)
+            return Response(content=snapshot.catalog_body, media_type="application/json")
+
+        result = await db.execute(catalog_query())
+        products = result.all()
         logger.info(f"Found {len(products)} products")
-        
-        return [
-            {
-                "id": str(p.id),
-                "name": p.name,
-                "description": p.description or "",
-                "vendor": p.vendor.business_name if p.vendor else "Unknown",
-                "vendor_id": str(p.vendor_id),
-                "category": p.category.name if p.category else "General",
-                "price": float(p.price),
-                "stock": p.stock_quantity or 0,
-                "status": str(p.approval_status.value) if p.approval_status else "DRAFT",
-                "image_url": p.image_url or "",
-                "is_active": p.is_active
-            }
-            for p in products
-        ]
+
+        return [catalog_product_dict(p) for p in products]
     except Exception as e:
         logger.error("ERROR IN PUBLIC PRODUCTS:")
         logger.error(traceback.format_exc())
@@ -192,6 +179,7 @@ async def create_product(
     )
     
     db.add(new_product)
+    await record_product_change(db, vendor.id, total=1, active=int(is_listed(new_product.approval_status, new_product.is_active)))
     await db.commit()
     await db.refresh(new_product)
     
@@ -204,6 +192,7 @@ async def create_product(
     )
     db.add(admin_notif)
     await db.commit()
+    catalog_cache.invalidate()
     
     return {
         "id": str(new_product.id),
@@ -230,7 +219,10 @@ async def delete_product(product_id: str, db: AsyncSession = Depends(get_db), ve
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    if is_listed(product.approval_status, product.is_active):
+        await record_product_change(db, vendor.id, active=-1)
     product.is_active = False
     await db.commit()
+    catalog_cache.invalidate()
     
     return {"message": "Product deleted successfully"}
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File, Query, Response, Header
+from typing import Optional, List, Union
 from sqlalchemy.future import select
+from sqlalchemy import func, or_, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models.vendor import Vendor, VendorStatus, SellerCategory
@@ -136,50 +137,133 @@ async def list_public_vendors(db: AsyncSession = Depends(get_db)):
         for v in vendors
     ]
 
-from app.models.product import Product
-from sqlalchemy.orm import selectinload
+from app.models.product import Product, ProductType
+from app.models.category import Category
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services.catalog_cache import catalog_cache, catalog_query, hub_product_dict, render_json_list
 
 @router.get("/products", response_model=List[dict])
-async def list_public_products(db: AsyncSession = Depends(get_db)):
+async def list_public_products(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    category_id: Optional[int] = None,
+    vendor_id: Optional[uuid.UUID] = None,
+    product_type: Optional[ProductType] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    category: Optional[str] = Query(None, max_length=100),
+    q: Optional[str] = Query(None, max_length=100),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Get all active products for the mobile app "Hub Store" view.
+    Get active products for the mobile app "Hub Store" view, one page at a time.
     Only returns products from APPROVED vendors (excludes suspended vendor products).
+    `category` matches the category name and `q` the name or description (both
+    case-insensitive).
+
+    Pages are ordered by product id. When more products exist, the response carries
+    an `X-Next-Cursor` header; pass it back as `cursor` to fetch the next page.
     """
-    # Join with vendor to filter by vendor status
+    after_id = None
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        try:
+            after_id = uuid.UUID(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Served from the in-memory snapshot (no DB round trip once it is warm)
+    if catalog_cache.enabled:
+        snapshot = await catalog_cache.get(db)
+        fragments, next_id = snapshot.page(
+            after_id, limit,
+            category_id=category_id,
+            vendor_id=vendor_id,
+            product_type=product_type,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            category=category,
+            q=q,
+        )
+        headers = {"X-Next-Cursor": encode_cursor(str(next_id))} if next_id else None
+        return Response(content=render_json_list(fragments), media_type="application/json", headers=headers)
+
+    query = catalog_query().where(Vendor.status == VendorStatus.APPROVED)
+
+    # Server-side filters
+    if category_id is not None:
+        query = query.where(Product.category_id == category_id)
+    if vendor_id is not None:
+        query = query.where(Product.vendor_id == vendor_id)
+    if product_type is not None:
+        query = query.where(Product.product_type == product_type)
+    if min_price is not None:
+        query = query.where(Product.price >= min_price)
+    if max_price is not None:
+        query = query.where(Product.price <= max_price)
+    if in_stock is True:
+        query = query.where(Product.stock_quantity > 0)
+    elif in_stock is False:
+        query = query.where(or_(Product.stock_quantity == None, Product.stock_quantity <= 0))
+    if category is not None:
+        in_category = func.lower(Category.name) == category.lower()
+        # Uncategorized products are listed as "General"
+        query = query.where(or_(in_category, Category.name == None) if category.lower() == "general" else in_category)
+    if q:
+        term = q.lower()
+        query = query.where(or_(
+            func.lower(Product.name).contains(term, autoescape=True),
+            func.lower(Product.description).contains(term, autoescape=True),
+        ))
+
+    # Keyset pagination: seek past the last id of the previous page instead of OFFSET
+    if after_id:
+        query = query.where(Product.id > after_id)
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.order_by(Product.id).limit(limit + 1))
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(str(rows[-1].id))
+
+    return [hub_product_dict(p) for p in rows]
+
+
+@router.get("/products/{product_id}", response_model=dict)
+async def get_public_product(product_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """One active product of an APPROVED vendor, in the same shape as the list."""
+    if catalog_cache.enabled:
+        body = (await catalog_cache.get(db)).product(product_id)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return Response(content=body, media_type="application/json")
+
     result = await db.execute(
-        select(Product)
-        .options(selectinload(Product.vendor), selectinload(Product.category)) # Added category load
-        .join(Vendor)
-        .where(Vendor.status == VendorStatus.APPROVED)
-        .where(Product.is_active == True)
+        catalog_query().where(Vendor.status == VendorStatus.APPROVED, Product.id == product_id)
     )
-    products = result.scalars().all()
-    
-    return [
-        {
-            "id": str(p.id),
-            "vendorId": str(p.vendor_id),
-            "name": p.name,
-            "price": p.price,
-            "image": p.image_url or "https://images.unsplash.com/photo-1592924357228-91a4daadcfea?w=500&q=80",
-            "category": p.category.name if p.category else "General",
-            "categoryId": p.category_id,
-            "rating": 4.5,
-            "reviews": 10,
-            "description": p.description or "",
-            "isOrganic": str(p.product_type) == "ProductType.ORGANIC" if p.product_type else True,
-            "stock": p.stock_quantity or 0,
-            "vendorName": p.vendor.business_name if p.vendor else "Unknown"
-        }
-        for p in products
-    ]
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return hub_product_dict(row)
 
 from app.models.order import Order, OrderItem, OrderStatus
-from pydantic import BaseModel
+from app.services.inventory import reserve_stock, OutOfStockError
+from app.services.idempotency import (
+    idempotency_store, request_fingerprint, Claim, IdempotencyKeyMismatch, IdempotencyInProgress
+)
+from app.services.events import event_bus
+from app.services.order_events import OrderPlaced
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 
 class OrderItemSchema(BaseModel):
-    product_id: int
-    quantity: int
+    product_id: Union[uuid.UUID, int]  # Older mobile builds still send numeric demo ids
+    quantity: int = Field(..., gt=0)
     price: float
 
 class OrderCreateSchema(BaseModel):
@@ -190,9 +274,42 @@ class OrderCreateSchema(BaseModel):
     items: List[OrderItemSchema]
 
 @router.post("/orders")
-async def create_public_order(order_data: OrderCreateSchema, db: AsyncSession = Depends(get_db)):
+async def create_public_order(
+    order_data: OrderCreateSchema,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200),
+):
     """
     Public endpoint to place an order from Mobile App.
+
+    Clients that retry on flaky networks should send an `Idempotency-Key` header
+    (one per checkout attempt). Repeats of a successful request replay its stored
+    response instead of placing another order; repeats that arrive while it is still
+    running wait for it to finish.
+    """
+    if not idempotency_key:
+        return await place_public_order(order_data, db)
+
+    fingerprint = request_fingerprint(order_data.model_dump(mode="json"))
+    try:
+        async with idempotency_store.claim(db, f"public-orders:{idempotency_key}", fingerprint) as claim:
+            if claim.replay is not None:
+                return JSONResponse(
+                    content=claim.replay,
+                    status_code=claim.status_code,
+                    headers={"Idempotent-Replayed": "true"}
+                )
+            return await place_public_order(order_data, db, claim)
+    except IdempotencyKeyMismatch:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different order")
+    except IdempotencyInProgress:
+        raise HTTPException(status_code=409, detail="An order with this Idempotency-Key is still being processed")
+
+
+async def place_public_order(order_data: OrderCreateSchema, db: AsyncSession, claim: Optional[Claim] = None):
+    """
+    Validate the cart, reserve stock and write the order with its items and notifications.
+    When `claim` is given, the response is stored with it in the same transaction.
     """
     try:
         # Validate UUID format
@@ -202,22 +319,33 @@ async def create_public_order(order_data: OrderCreateSchema, db: AsyncSession =
              # If invalid, generate a temporary one for the Guest/Demo user
              valid_user_uuid = uuid.uuid4()
         
+        # Load every requested product (with its vendor's status) in a single IN query
+        product_ids = {item.product_id for item in order_data.items if isinstance(item.product_id, uuid.UUID)}
+        products = {}
+        if product_ids:
+            result = await db.execute(
+                select(
+                    Product.id,
+                    Product.price,
+                    Product.is_active,
+                    Product.vendor_id,
+                    Vendor.status.label("vendor_status"),
+                )
+                .outerjoin(Vendor, Product.vendor_id == Vendor.id)
+                .where(Product.id.in_(product_ids))
+            )
+            products = {row.id: row for row in result.all()}
+
         # Calculate total and Validate Products
         total_amount = 0.0
         valid_items = []
         
         for item in order_data.items:
-            # Check if product exists and vendor is active
-            result = await db.execute(
-                select(Product)
-                .options(selectinload(Product.vendor))
-                .where(Product.id == item.product_id)
-            )
-            product = result.scalars().first()
+            product = products.get(item.product_id)
             
             if product:
                 # Check if vendor is approved (not suspended/rejected)
-                if product.vendor and product.vendor.status != VendorStatus.APPROVED:
+                if product.vendor_status is not None and product.vendor_status != VendorStatus.APPROVED:
                     # Skip products from suspended/non-active vendors
                     continue
                     
@@ -240,7 +368,17 @@ async def create_public_order(order_data: OrderCreateSchema, db: AsyncSession =
              # Attempted to order items but none exist in DB.
              # This happens when Mobile = Mock Data, Backend = Empty DB.
              # We Return Success MOCK to keep the App happy, but don't save to DB.
-             return {"id": "demo-order-123", "message": "Demo Order placed! (Database was empty)"}
+             response = {"id": "demo-order-123", "message": "Demo Order placed! (Database was empty)"}
+             if claim:
+                 await idempotency_store.record(db, claim, response)
+                 await db.commit()
+             return response
+
+        # Reserve stock for all lines in one conditional UPDATE (duplicate lines are merged)
+        quantities = {}
+        for item in valid_items:
+            quantities[item["product_id"]] = quantities.get(item["product_id"], 0) + item["quantity"]
+        sold_out = await reserve_stock(db, quantities)
 
         new_order = Order(
             user_id=valid_user_uuid, 
@@ -250,49 +388,56 @@ async def create_public_order(order_data: OrderCreateSchema, db: AsyncSession =
             total_amount=total_amount,
             status=OrderStatus.PENDING
         )
+        # One unit of work: flush the order row so items can reference it,
+        # bulk-insert the items, then commit once.
         db.add(new_order)
-        await db.commit()
-        await db.refresh(new_order)
+        await db.flush()
         
         # Add Items
-        for item in valid_items:
-            order_item = OrderItem(
-                order_id=new_order.id,
-                product_id=item["product_id"],
-                quantity=item["quantity"],
-                price_at_purchase=item["price"],
-                vendor_id=item["vendor_id"]
-            )
-            db.add(order_item)
-        
-        # Notify Admin
-        admin_notif = AdminNotification(
-            type=AdminNotificationType.NEW_ORDER,
-            title="New Order Received",
-            message=f"Order #{str(new_order.id)[:8]} placed by {new_order.customer_name} for ₹{new_order.total_amount}",
-            extra_data={"order_id": str(new_order.id)}
+        await db.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": new_order.id,
+                    "product_id": item["product_id"],
+                    "quantity": item["quantity"],
+                    "price_at_purchase": item["price"],
+                    "vendor_id": item["vendor_id"]
+                }
+                for item in valid_items
+            ]
         )
-        db.add(admin_notif)
-
-        # Notify Vendors
-        notified_vendors = set()
-        for item in valid_items:
-            vendor_id = item["vendor_id"]
-            if vendor_id and vendor_id not in notified_vendors:
-                vendor_notif = Notification(
-                    vendor_id=vendor_id,
-                    type=NotificationType.SYSTEM,
-                    title="📦 New Order Received",
-                    message=f"You have received a new order #{str(new_order.id)[:8]}.",
-                    extra_data={"order_id": str(new_order.id)}
-                )
-                db.add(vendor_notif)
-                notified_vendors.add(vendor_id)
+        
+        response = {"id": str(new_order.id), "message": "Order placed successfully!"}
+        if claim:
+            await idempotency_store.record(db, claim, response)
         
         await db.commit()
         
-        return {"id": str(new_order.id), "message": "Order placed successfully!"}
+        # Catalog pages show stock; refresh them when a product sells out
+        if sold_out:
+            catalog_cache.invalidate()
+        
+        # Admin/vendor notifications and the sales rollups are written by the event workers, off the request path
+        vendor_totals = {}
+        for item in valid_items:
+            if item["vendor_id"]:
+                vendor_totals[item["vendor_id"]] = vendor_totals.get(item["vendor_id"], 0) + item["price"] * item["quantity"]
+        await event_bus.publish(OrderPlaced(
+            order_id=new_order.id,
+            customer_name=new_order.customer_name,
+            customer_email=new_order.customer_email,
+            total_amount=new_order.total_amount,
+            created_at=new_order.created_at,
+            vendor_ids=list(vendor_totals),
+            vendor_totals=vendor_totals
+        ))
+        
+        return response
         
+    except OutOfStockError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
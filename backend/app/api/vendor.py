@@ -6,6 +6,9 @@ from app.models.product import Product
 from app.models.vendor import Vendor
 from app.api.deps import get_current_vendor
 from app.schemas.vendor import VendorResponse # Reuse or create Product Schema
+from app.services.catalog_cache import catalog_cache
+from app.services.identity_cache import identity_cache
+from app.services.vendor_stats import record_product_change, is_listed
 import uuid
 
 router = APIRouter()
@@ -20,11 +23,14 @@ async def update_profile(
     db: AsyncSession = Depends(get_db),
     vendor: Vendor = Depends(get_current_vendor)
 ):
+    # The dependency's copy comes from the identity cache; edit the row itself
+    vendor = await db.get(Vendor, vendor.id)
     if phone_number:
         vendor.phone_number = phone_number
     
     await db.commit()
     await db.refresh(vendor)
+    identity_cache.invalidate(vendor.contact_email)
     return vendor
 
 @router.get("/products")
@@ -52,6 +58,8 @@ async def create_product(
         approval_status="DRAFT" # Auto-draft
     )
     db.add(product)
+    await record_product_change(db, vendor.id, total=1, active=int(is_listed(product.approval_status, product.is_active)))
     await db.commit()
+    catalog_cache.invalidate()
     await db.refresh(product)
     return product
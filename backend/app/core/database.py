@@ -1,26 +1,273 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import weakref
+from typing import Optional
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for `create_async_engine(url)` built from the DATABASE_* settings."""
+    url = make_url(url)
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+    # Sizing only applies to a queue pool; in-memory SQLite gets a StaticPool, which rejects it
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        )
+    if url.get_backend_name() == "postgresql" and settings.DATABASE_STATEMENT_TIMEOUT_MS > 0:
+        # Server-side limit, so a runaway query frees its connection instead of pinning it
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT_MS)}
+        }
+    return options
+
+
+def sqlite_pragmas() -> list:
+    return [
+        "PRAGMA journal_mode=WAL",  # Readers don't wait for the writer
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",  # Negative means KiB, not pages
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+
+
+def use_sqlite_profile(engine: AsyncEngine):
+    """Set the production pragmas on every new connection of `engine`."""
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+
+class WriteQueue:
+    """
+    Lets one write transaction at a time run per event loop; the rest wait in FIFO
+    order. SQLite has a single writer lock, so a second writer would only sit in
+    busy_timeout and then fail with "database is locked".
+
+    A task that already holds the turn and asks again (a second session writing while
+    its first transaction is open) gets a RuntimeError: it can only wait on itself.
+    """
+
+    def __init__(self):
+        self._writers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Writer]" = weakref.WeakKeyDictionary()
+        self.waiting = 0
+        self.acquired = 0
+
+    def _writer(self) -> "_Writer":
+        loop = asyncio.get_running_loop()
+        writer = self._writers.get(loop)
+        if writer is None:
+            writer = self._writers[loop] = _Writer()
+        return writer
+
+    async def acquire(self) -> "_Writer":
+        writer = self._writer()
+        task = asyncio.current_task()
+        if writer.lock.locked() and writer.owner is task:
+            raise RuntimeError(
+                "This task already has a write transaction open in another session; "
+                "commit it first or write through that session"
+            )
+        self.waiting += 1
+        try:
+            await writer.lock.acquire()
+        finally:
+            self.waiting -= 1
+        writer.owner = task
+        self.acquired += 1
+        return writer
+
+    def release(self, writer: "_Writer"):
+        writer.owner = None
+        writer.lock.release()
+
+
+class _Writer:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.owner: Optional[asyncio.Task] = None
+
+
+write_queue = WriteQueue()
+
+WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+
+def _is_write(statement) -> bool:
+    """Core/ORM DML and DDL, and text() or raw SQL starting with a writing keyword."""
+    if getattr(statement, "is_dml", False) or getattr(statement, "is_ddl", False):
+        return True
+    sql = statement if isinstance(statement, str) else getattr(statement, "text", None)
+    return isinstance(sql, str) and sql.lstrip().upper().startswith(WRITE_KEYWORDS)
+
+
+class SerializedWriteSession(AsyncSession):
+    """
+    AsyncSession that takes its place in `write_queue` before its first write and
+    keeps it until the transaction commits, rolls back or the session closes.
+    Reads don't queue. Writes through `connection()` queue the same way.
+    """
+
+    def _has_pending_changes(self) -> bool:
+        sync = self.sync_session
+        return bool(sync.new or sync.dirty or sync.deleted)
+
+    async def _before_write(self):
+        if "writer" in self.sync_session.info:
+            return
+        # Check out the connection before queueing: a writer must never wait on the pool
+        # while sessions holding the other connections wait on it
+        await super().connection()
+        self.sync_session.info["writer"] = await write_queue.acquire()
+
+    async def _before_statement(self, statement):
+        if _is_write(statement) or (self.autoflush and self._has_pending_changes()):
+            await self._before_write()
+
+    async def connection(self, *args, **kwargs):
+        return _SerializedConnection(self, await super().connection(*args, **kwargs))
+
+    async def execute(self, statement, *args, **kwargs):
+        await self._before_statement(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self._before_statement(statement)
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        await self._before_statement(statement)
+        return await super().scalars(statement, *args, **kwargs)
+
+    async def flush(self, objects=None):
+        if self._has_pending_changes():
+            await self._before_write()
+        await super().flush(objects)
+
+    async def commit(self):
+        if self._has_pending_changes():
+            await self._before_write()
+        await super().commit()
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            _release_writer(self.sync_session)
+
+
+class _SerializedConnection:
+    """A SerializedWriteSession's AsyncConnection, taking the session's turn before writes."""
+
+    def __init__(self, session: SerializedWriteSession, connection):
+        self._session = session
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    async def execute(self, statement, *args, **kwargs):
+        await self._session._before_statement(statement)
+        return await self._connection.execute(statement, *args, **kwargs)
+
+    async def exec_driver_sql(self, statement, *args, **kwargs):
+        await self._session._before_statement(statement)
+        return await self._connection.exec_driver_sql(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self._session._before_statement(statement)
+        return await self._connection.scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        await self._session._before_statement(statement)
+        return await self._connection.scalars(statement, *args, **kwargs)
+
+
+def _release_writer(session: Session):
+    writer = session.info.pop("writer", None)
+    if writer is not None:
+        write_queue.release(writer)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_writer_at_transaction_end(session, transaction):
+    if transaction.parent is None:
+        _release_writer(session)
+
+
+def sqlite_production_mode(url: str) -> bool:
+    return settings.SQLITE_PRODUCTION_MODE and make_url(url).get_backend_name() == "sqlite"
+
+
 # Create Async Engine
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=True,  # Set to False in production
-)
+engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, **engine_options(settings.SQLALCHEMY_DATABASE_URI))
+if sqlite_production_mode(settings.SQLALCHEMY_DATABASE_URI):
+    use_sqlite_profile(engine)
 
 # Session Factory
 AsyncSessionLocal = sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=(
+        SerializedWriteSession
+        if sqlite_production_mode(settings.SQLALCHEMY_DATABASE_URI) and settings.SQLITE_SERIALIZE_WRITES
+        else AsyncSession
+    ),
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
-# Dependency for API Routes
-async def get_db():
-    async with AsyncSessionLocal() as session:
+# Dependencies for API Routes
+def get_session_factory():
+    """
+    The session factory behind `get_db`, for work that opens its own sessions (e.g.
+    cached analytics computed outside the request). Override this to swap databases.
+    """
+    return AsyncSessionLocal
+
+
+async def get_db(session_factory=Depends(get_session_factory)):
+    async with session_factory() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+def pool_status(engine: AsyncEngine = engine) -> dict:
+    """Connection counts for this worker's pool (what /ready reports)."""
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        status = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "timeout_seconds": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        }
+    else:
+        status = {"class": type(pool).__name__}
+    if AsyncSessionLocal.class_ is SerializedWriteSession:
+        status["writers_waiting"] = write_queue.waiting
+    return status
+
+
+async def ping(engine: AsyncEngine = engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
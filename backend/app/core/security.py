@@ -1,5 +1,8 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -13,6 +16,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+class HashingPool:
+    """
+    Runs password hashing on a small dedicated thread pool, so a login burst does not
+    block the event loop (Argon2 releases the GIL while it works). At most
+    `max_pending` calls may be running or waiting; beyond that callers get an
+    immediate 429 instead of queueing behind the burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many sign-in requests in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+
+hashing_pool = HashingPool(workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password(password: str) -> str:
+    """`get_password_hash` on the hashing pool; use this from async code."""
+    return await hashing_pool.run(get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` on the hashing pool; use this from async code."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -22,3 +68,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+STREAM_TOKEN_SCOPE = "notification_stream"
+
+
+def create_stream_token(email: str, role: str) -> str:
+    """
+    Short-lived token for opening a notification stream. It travels in the URL, as
+    EventSource can't send an Authorization header, and opens nothing else.
+    """
+    return create_access_token(
+        {"sub": email, "role": role, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=settings.NOTIFICATION_STREAM_TOKEN_SECONDS)
+    )
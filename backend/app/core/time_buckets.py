@@ -0,0 +1,44 @@
+import enum
+from datetime import date, timedelta
+
+from sqlalchemy import Date, cast, func, literal_column
+
+
+class Granularity(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+# SQLite has no date_trunc; these date() / strftime() modifiers give the same bucket starts
+_SQLITE_BUCKETS = {
+    Granularity.DAY: lambda column: func.date(column, type_=Date),
+    Granularity.WEEK: lambda column: func.date(column, "-6 days", "weekday 1", type_=Date),  # Monday on or before
+    Granularity.MONTH: lambda column: func.strftime("%Y-%m-01", column, type_=Date),
+}
+
+SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+
+def time_bucket(dialect_name: str, column, granularity: Granularity):
+    """
+    SQL expression for the first day of the day / ISO week (Monday) / month that
+    `column` falls in, typed as DATE, so that GROUP BY runs in the database.
+    """
+    if dialect_name == "postgresql":
+        # Inline the unit: a bound parameter would make the GROUP BY expression differ from the SELECT one
+        return cast(func.date_trunc(literal_column(f"'{granularity.value}'"), column), Date)
+    if dialect_name == "sqlite":
+        return _SQLITE_BUCKETS[granularity](column)
+    raise ValueError(
+        f"Time buckets are not supported on {dialect_name!r}; supported dialects: {', '.join(SUPPORTED_DIALECTS)}"
+    )
+
+
+def bucket_start(day: date, granularity: Granularity) -> date:
+    """Python counterpart of `time_bucket` for a single date."""
+    if granularity == Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    return day
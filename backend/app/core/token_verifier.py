@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+import time
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, Optional
+from jose import jwt, JWTError
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# Algorithms accepted for JWKS keys. HMAC is never looked up in the key set, so a
+# public key can't be used as an HS256 secret.
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+
+class KeySet:
+    """
+    Signing keys by `kid`, loaded from a JWKS document at `url` (https:// or, for local
+    stand-ins, file://). `start()` refreshes it every `refresh_seconds` in the
+    background; a token with an unknown `kid` also triggers a refresh, at most once
+    per `min_refresh_seconds`, so rotated keys are picked up without waiting.
+    """
+
+    def __init__(self, url: str, refresh_seconds: float, min_refresh_seconds: float = 30.0):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.keys: Dict[str, dict] = {}
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _fetch(self) -> bytes:
+        with urllib.request.urlopen(self.url, timeout=10) as response:
+            return response.read()
+
+    async def refresh(self):
+        self._checked_at = time.monotonic()
+        document = json.loads(await asyncio.to_thread(self._fetch))
+        self.keys = {key["kid"]: key for key in document.get("keys", []) if "kid" in key}
+
+    async def get(self, kid: str) -> Optional[dict]:
+        due = self._checked_at is None or time.monotonic() - self._checked_at >= self.min_refresh_seconds
+        if kid not in self.keys and due:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception(f"Failed to load signing keys from {self.url}")
+        return self.keys.get(kid)
+
+    async def start(self):
+        if self._task is not None:
+            return
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception(f"Failed to load signing keys from {self.url}")
+        self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep the last good keys until the next attempt
+                logger.exception(f"Failed to refresh signing keys from {self.url}")
+
+
+class TokenVerifier:
+    """
+    Verifies bearer tokens: HS tokens against `secret_key`, asymmetric ones against
+    the key set (when configured). Tokens must carry `exp`. Verified claims are kept
+    in an LRU of up to `max_entries` tokens until the token expires, or for at most
+    `max_age_seconds` so rotated keys take effect, and a client repeating its token
+    skips the signature check. Raises JWTError for anything that does not verify.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        keys: Optional[KeySet] = None,
+        audience: str = "",
+        max_entries: int = 10000,
+        max_age_seconds: float = 600.0,
+    ):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.keys = keys
+        self.audience = audience
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._verified: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def verify(self, token: str) -> dict:
+        entry = self._verified.get(token)
+        if entry is not None:
+            claims, expires_at = entry
+            if expires_at > time.time():
+                self._verified.move_to_end(token)
+                self.hits += 1
+                return claims
+            del self._verified[token]
+
+        self.misses += 1
+        claims = await self._decode(token)
+        if self.max_entries > 0:
+            self._verified[token] = (claims, min(claims["exp"], time.time() + self.max_age_seconds))
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+        return claims
+
+    async def _decode(self, token: str) -> dict:
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm == self.algorithm:
+            key = self.secret_key
+        elif algorithm in ASYMMETRIC_ALGORITHMS and self.keys is not None and header.get("kid"):
+            key = await self.keys.get(header["kid"])
+            if key is None:
+                raise JWTError("Unknown signing key")
+        else:
+            raise JWTError(f"Unsupported token algorithm {algorithm}")
+
+        return jwt.decode(
+            token, key, algorithms=[algorithm],
+            audience=self.audience or None,
+            options={"verify_aud": bool(self.audience), "require_exp": True},
+        )
+
+    def clear(self):
+        self._verified.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._verified), "hits": self.hits, "misses": self.misses}
+
+
+token_verifier = TokenVerifier(
+    secret_key=settings.SECRET_KEY,
+    algorithm=settings.ALGORITHM,
+    keys=KeySet(settings.JWT_JWKS_URL, settings.JWKS_REFRESH_SECONDS) if settings.JWT_JWKS_URL else None,
+    audience=settings.JWT_AUDIENCE,
+    max_entries=settings.VERIFIED_TOKEN_CACHE_SIZE,
+    max_age_seconds=settings.JWKS_REFRESH_SECONDS,
+)
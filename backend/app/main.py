@@ -1,11 +1,17 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import API routers
 from app.api import auth, public, admin, products, categories, banners, offers, orders, customers, analytics, notifications
 from app.api import vendor as vendor_api  # Aliased to avoid collision with model
 
-from app.core.database import engine
+from app.core.database import engine, ping, pool_status
+from app.core.token_verifier import token_verifier
+from app.services.events import event_bus
+from app.services import order_events  # Registers OrderPlaced handlers
+from app.services import unread_counters  # Registers the unread-counter flush hook
+from app.services.read_models import backfill_read_models
 from app.models.base import Base
 # Import all models to ensure they are registered with Base (use aliases to avoid conflicts)
 from app.models import user as user_model
@@ -16,6 +22,14 @@ from app.models import category as category_model
 from app.models import notification as notification_model
 from app.models import admin_notification as admin_notification_model
 from app.models import offer as offer_model
+from app.models import idempotency_key as idempotency_key_model
+from app.models import daily_sales_rollup as daily_sales_rollup_model
+from app.models import vendor_stats as vendor_stats_model
+from app.models import customer_stats as customer_stats_model
+from app.models import unread_counter as unread_counter_model
+from app.models import broadcast as broadcast_model
+from app.models import read_model_backfill as read_model_backfill_model
+from app.models import failed_event as failed_event_model
 
 app = FastAPI(
     title="Next360 Organics API",
@@ -28,6 +42,18 @@ async def startup():
     async with engine.begin() as conn:
         # Create all tables (safe to run multiple times, it skips existing)
         await conn.run_sync(Base.metadata.create_all)
+    # Read models added since the last deploy start from the existing orders
+    await backfill_read_models()
+    await event_bus.start()
+    if token_verifier.keys is not None:
+        await token_verifier.keys.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Deliver queued notifications before the worker exits
+    await event_bus.stop()
+    if token_verifier.keys is not None:
+        await token_verifier.keys.stop()
 
 # Configure CORS
 app.add_middleware(
@@ -36,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor for keyset-paginated listings
 )
 
 
@@ -64,3 +91,12 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/ready")
+async def readiness_check():
+    # Database reachable, plus this worker's pool usage for sizing pools per worker
+    try:
+        await ping()
+    except Exception:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "pool": pool_status()})
+    return {"status": "ok", "pool": pool_status()}
@@ -7,3 +7,11 @@ from .category import Category
 from app.models.notification import Notification
 from app.models.admin_notification import AdminNotification
 from app.models.banner import Banner
+from app.models.idempotency_key import IdempotencyKey
+from app.models.daily_sales_rollup import DailySalesRollup
+from app.models.vendor_stats import VendorStats, VendorMonthlyRevenue
+from app.models.customer_stats import CustomerStats
+from app.models.unread_counter import UnreadCounter
+from app.models.broadcast import BroadcastNotification, BroadcastReceipt, BroadcastSubscription
+from app.models.read_model_backfill import ReadModelBackfill
+from app.models.failed_event import FailedEvent
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, JSON
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, JSON, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base
 import uuid
@@ -16,6 +16,13 @@ class AdminNotificationType(enum.Enum):
 
 class AdminNotification(Base):
     __tablename__ = "admin_notifications"
+    __table_args__ = (
+        Index("ix_admin_notifications_created_at", "created_at"),  # Admin inbox
+        Index(
+            "ix_admin_notifications_unread_created_at", "created_at",
+            sqlite_where=text("is_read = 0"), postgresql_where=text("NOT is_read")
+        ),  # Unread badge / mark-all-read
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     type = Column(Enum(AdminNotificationType), nullable=False)
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, String, Enum, Text, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, JSON
+import uuid
+from datetime import datetime
+from app.models.base import Base
+from app.models.notification import NotificationType
+
+
+class BroadcastNotification(Base):
+    """
+    A notification for every vendor, stored once and merged into each vendor's feed
+    when it is read. Whether a vendor has read it lives in BroadcastReceipt.
+    """
+    __tablename__ = "broadcasts"
+    __table_args__ = (
+        Index("ix_broadcasts_created_at", "created_at"),  # Vendor feed merge, admin history
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    type = Column(Enum(NotificationType), default=NotificationType.MESSAGE, nullable=False)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    extra_data = Column(JSON, nullable=True)
+
+
+class BroadcastReceipt(Base):
+    """One row per (broadcast, vendor) once that vendor has read the broadcast."""
+    __tablename__ = "broadcast_receipts"
+    __table_args__ = (
+        Index("ix_broadcast_receipts_vendor_id", "vendor_id"),  # Per-vendor read state and recount
+    )
+
+    broadcast_id = Column(UUID(as_uuid=True), ForeignKey("broadcasts.id", ondelete="CASCADE"), primary_key=True)
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id", ondelete="CASCADE"), primary_key=True)
+    read_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BroadcastSubscription(Base):
+    """
+    When a vendor started receiving broadcasts (their first approval). They see only
+    broadcasts sent since; vendors without a row, approved before this was tracked, see all.
+    """
+    __tablename__ = "broadcast_subscriptions"
+
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id", ondelete="CASCADE"), primary_key=True)
+    since = Column(DateTime, default=datetime.utcnow, nullable=False)
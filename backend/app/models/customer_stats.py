@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
+from datetime import datetime
+from app.models.base import Base
+
+
+class CustomerStats(Base):
+    """
+    Per-customer order summary behind the admin customer directory, keyed by the
+    lower-cased order email (customers order through Supabase auth, so many of them
+    have no `users` row). Maintained incrementally, see app/services/customer_stats.py.
+    """
+    __tablename__ = "customer_stats"
+    __table_args__ = (
+        Index("ix_customer_stats_total_spent_email", "total_spent", "customer_email"),  # Sort by spend
+        Index("ix_customer_stats_last_order_at_email", "last_order_at", "customer_email"),  # Sort by recency
+    )
+
+    customer_email = Column(String, primary_key=True)
+    customer_name = Column(String, nullable=True)  # Name on the first order seen
+
+    order_count = Column(Integer, nullable=False, default=0)  # Every order placed
+    total_spent = Column(Float, nullable=False, default=0)  # Total of the orders that are not cancelled
+    last_order_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
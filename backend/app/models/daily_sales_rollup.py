@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime
+from datetime import datetime
+from app.models.base import Base
+
+
+class DailySalesRollup(Base):
+    """
+    Order totals per UTC day, maintained incrementally by the order paths
+    (see app/services/sales_rollup.py) so the dashboard never scans `orders`.
+    """
+    __tablename__ = "daily_sales_rollup"
+
+    date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)  # Every order placed that day
+    revenue = Column(Float, nullable=False, default=0)  # Total of the orders that are not cancelled
+    cancelled = Column(Integer, nullable=False, default=0)  # Orders placed that day and since cancelled
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
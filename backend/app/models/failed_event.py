@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Text
+from datetime import datetime
+from app.models.base import Base
+
+
+class FailedEvent(Base):
+    """
+    Dead letter for an event-bus event whose handlers kept failing, so it can be
+    inspected and replayed by hand. Written by app/services/events.py.
+    """
+    __tablename__ = "failed_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(128), nullable=False)
+    payload = Column(JSON, nullable=False)
+    error = Column(Text, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored outcome of a request sent with an `Idempotency-Key` header.
+    A row without status_code is a claim held by a request still in flight.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 of the request body
+
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # TTL eviction
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Enum, Text, ForeignKey, DateTime
+from sqlalchemy import Column, String, Boolean, Enum, Text, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
 import uuid
@@ -16,6 +16,11 @@ class NotificationType(str, enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_vendor_id_is_read_created_at", "vendor_id", "is_read", "created_at"),  # Unread badge
+        Index("ix_notifications_vendor_id_created_at", "vendor_id", "created_at"),  # Vendor feed
+        Index("ix_notifications_created_at", "created_at"),  # Admin sent history
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id", ondelete="CASCADE"), nullable=False)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Enum, JSON
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Enum, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
+from datetime import datetime
 import enum
 from app.models.base import Base
 
@@ -15,6 +16,12 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),  # Admin listing keyset order
+        Index("ix_orders_status_created_at", "status", "created_at"),  # Status filter, pending counts, trends
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),  # My orders
+        Index("ix_orders_customer_email_created_at", "customer_email", "created_at"),  # Admin email filter
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False) # Supabase User ID
@@ -27,17 +34,23 @@ class Order(Base):
     total_amount = Column(Float, nullable=False) # Total amount of the order
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now()) # When the order was created
+    # Python-side default keeps sub-second precision (SQLite's CURRENT_TIMESTAMP is per second),
+    # so (created_at, id) keyset pages stay exact for orders placed in the same second
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now()) # When the order was created
     updated_at = Column(DateTime(timezone=True), onupdate=func.now()) # When the order was last updated
 
     items = relationship("OrderItem", back_populates="order")
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),  # Items of an order / items_count
+        Index("ix_order_items_vendor_id_order_id", "vendor_id", "order_id"),  # Vendor earnings and orders
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"))
-    product_id = Column(Integer, ForeignKey("products.id"))
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"))
     vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id")) # Denormalized for easy filtering
     
     quantity = Column(Integer, nullable=False) # Quantity of the product
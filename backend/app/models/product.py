@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Enum, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -18,6 +18,15 @@ class ProductApprovalStatus(str, enum.Enum):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Vendor product lists, vendor dashboard counts, catalog vendor filter
+        Index("ix_products_vendor_id_is_active", "vendor_id", "is_active"),
+        # Catalog category filter only ever reads active products
+        Index(
+            "ix_products_active_category_id", "category_id",
+            sqlite_where=text("is_active = 1"), postgresql_where=text("is_active")
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id"), nullable=False)
@@ -27,7 +36,7 @@ class Product(Base):
     slug = Column(String, unique=True, index=True)
     description = Column(Text)
     price = Column(Float, nullable=False)
-    stock_quantity = Column(Integer, default=0)
+    stock_quantity = Column(Integer, nullable=False, default=0, server_default="0")
     
     image_url = Column(String, nullable=True)
     gallery_images = Column(Text, nullable=True) # Check if JSON is better, currently Text for MVP (comma separated)
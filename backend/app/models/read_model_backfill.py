@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from app.models.base import Base
+
+
+class ReadModelBackfill(Base):
+    """
+    Read models (rollups, stats, counters) that have been built from their source
+    tables on this database. Written by app/services/read_models.py at startup.
+    """
+    __tablename__ = "read_model_backfills"
+
+    name = Column(String(64), primary_key=True)
+    completed_at = Column(DateTime, default=datetime.utcnow)
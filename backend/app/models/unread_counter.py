@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from datetime import datetime
+from app.models.base import Base
+
+
+class UnreadCounter(Base):
+    """
+    Unread notification count per recipient, so badge polls are a primary-key read.
+    `recipient` is a vendor id, or "admin" for the shared admin inbox.
+    Kept in step with notification writes by app/services/unread_counters.py.
+    """
+    __tablename__ = "unread_counters"
+
+    recipient = Column(String(64), primary_key=True)
+    unread = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
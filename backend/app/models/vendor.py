@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Enum, JSON, Integer, Date, ForeignKey, Float
+from sqlalchemy import Column, String, Boolean, Enum, JSON, Integer, Date, ForeignKey, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -18,6 +18,9 @@ class SellerCategory(str, enum.Enum):
 
 class Vendor(Base):
     __tablename__ = "vendors"
+    __table_args__ = (
+        Index("ix_vendors_status", "status"),  # Approved-vendor filters and counts
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     auth_user_id = Column(UUID(as_uuid=True), nullable=True, unique=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.models.base import Base
+
+
+class VendorStats(Base):
+    """
+    Vendor dashboard counters, maintained incrementally by the order, product and
+    status-change paths (see app/services/vendor_stats.py).
+    """
+    __tablename__ = "vendor_stats"
+
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id", ondelete="CASCADE"), primary_key=True)
+
+    earnings = Column(Float, nullable=False, default=0)  # Vendor's line totals in non-cancelled orders
+    pending_orders = Column(Integer, nullable=False, default=0)  # PENDING orders with at least one of the vendor's items
+    active_products = Column(Integer, nullable=False, default=0)  # Published and active
+    total_products = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class VendorMonthlyRevenue(Base):
+    """Vendor earnings per calendar month (UTC), the buckets of the dashboard revenue graph."""
+    __tablename__ = "vendor_monthly_revenue"
+
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(String(7), primary_key=True)  # "YYYY-MM"
+
+    revenue = Column(Float, nullable=False, default=0)
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+Compute = Callable[[AsyncSession], Awaitable[Any]]
+SessionFactory = Callable[[], AsyncSession]
+
+
+class AnalyticsCache:
+    """
+    TTL cache for analytics responses, keyed by scope and window
+    (e.g. ("admin", "dashboard", ...) or ("vendor", vendor_id, "sales", ...)).
+
+    - Fresh entries (younger than ttl_seconds) are served as is.
+    - Entries up to stale_seconds past the TTL are served immediately while one
+      background task recomputes them (stale-while-revalidate).
+    - Misses are single-flight: concurrent requests for the same key share one
+      computation instead of each running the queries.
+
+    Computations run in their own session from the caller's `session_factory` (endpoints
+    pass theirs from `get_session_factory`), so a background refresh does not depend on
+    the request that triggered it.
+    """
+
+    def __init__(self, ttl_seconds: int, stale_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def invalidate(self):
+        """Drop every entry; computations already running will not store their result."""
+        self._entries.clear()
+        self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else None,
+        }
+
+    async def get(self, key: Hashable, compute: Compute, session_factory: SessionFactory) -> Any:
+        if not self.enabled:
+            return await self._run(compute, session_factory)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl_seconds:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._refresh(key, compute, session_factory)
+                return value
+
+        self.misses += 1
+        # Shielded: a client disconnecting must not cancel the computation other waiters share
+        return await asyncio.shield(self._refresh(key, compute, session_factory))
+
+    def _refresh(self, key: Hashable, compute: Compute, session_factory: SessionFactory) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute(key, compute, session_factory))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            logger.error(f"Analytics computation for {key} failed: {task.exception()!r}")
+
+    async def _run(self, compute: Compute, session_factory: SessionFactory) -> Any:
+        async with session_factory() as db:
+            return await compute(db)
+
+    async def _compute(self, key: Hashable, compute: Compute, session_factory: SessionFactory) -> Any:
+        generation = self._generation
+        value = await self._run(compute, session_factory)
+        if generation == self._generation:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+analytics_cache = AnalyticsCache(
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+    stale_seconds=settings.ANALYTICS_CACHE_STALE_SECONDS,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.product import Product, ProductType
+from app.models.vendor import Vendor, VendorStatus
+from app.models.category import Category
+
+DEFAULT_PRODUCT_IMAGE = "https://images.unsplash.com/photo-1592924357228-91a4daadcfea?w=500&q=80"
+
+
+def catalog_query():
+    """
+    Projected product/vendor/category join shared by the catalog endpoints.
+    Only the columns we serialize are selected, no ORM objects are hydrated.
+    """
+    return (
+        select(
+            Product.id,
+            Product.vendor_id,
+            Product.name,
+            Product.price,
+            Product.image_url,
+            Product.category_id,
+            Product.description,
+            Product.product_type,
+            Product.stock_quantity,
+            Product.approval_status,
+            Product.is_active,
+            Category.name.label("category_name"),
+            Vendor.business_name.label("vendor_name"),
+            Vendor.status.label("vendor_status"),
+        )
+        .join(Vendor, Product.vendor_id == Vendor.id)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .where(Product.is_active == True)
+    )
+
+
+def hub_product_dict(p) -> dict:
+    """Mobile "Hub Store" shape served by GET /public/products."""
+    return {
+        "id": str(p.id),
+        "vendorId": str(p.vendor_id),
+        "name": p.name,
+        "price": p.price,
+        "image": p.image_url or DEFAULT_PRODUCT_IMAGE,
+        "category": p.category_name or "General",
+        "categoryId": p.category_id,
+        "rating": 4.5,
+        "reviews": 10,
+        "description": p.description or "",
+        "isOrganic": p.product_type == ProductType.ORGANIC if p.product_type else True,
+        "stock": p.stock_quantity or 0,
+        "vendorName": p.vendor_name or "Unknown"
+    }
+
+
+def catalog_product_dict(p) -> dict:
+    """Shape served by GET /products/public/products."""
+    return {
+        "id": str(p.id),
+        "name": p.name,
+        "description": p.description or "",
+        "vendor": p.vendor_name or "Unknown",
+        "vendor_id": str(p.vendor_id),
+        "category": p.category_name or "General",
+        "price": float(p.price),
+        "stock": p.stock_quantity or 0,
+        "status": str(p.approval_status.value) if p.approval_status else "DRAFT",
+        "image_url": p.image_url or "",
+        "is_active": p.is_active
+    }
+
+
+def render_json_list(fragments: List[bytes]) -> bytes:
+    """Join pre-serialized JSON objects into a JSON array body."""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def _dumps(data: dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One hub product: the fields we filter on plus its pre-serialized JSON."""
+    id: uuid.UUID
+    vendor_id: uuid.UUID
+    category_id: Optional[int]
+    category: str  # Lower-cased category name as shown ("general" when there is none)
+    product_type: Optional[ProductType]
+    price: float
+    stock: int
+    search_text: str  # Lower-cased name and description, for `q`
+    body: bytes
+
+
+def _entry_id(entry: CatalogEntry) -> uuid.UUID:
+    return entry.id
+
+
+class CatalogSnapshot:
+    """
+    Immutable, prebuilt view of the active catalog.
+    Entries are kept in product id order so keyset pages can be sliced with bisect.
+    """
+
+    def __init__(self, version: int, rows):
+        self.version = version
+        self.built_at = time.monotonic()
+
+        rows = sorted(rows, key=lambda r: r.id)
+        self.entries: List[CatalogEntry] = []
+        self.by_vendor = {}
+        self.by_category = {}
+
+        for row in rows:
+            if row.vendor_status != VendorStatus.APPROVED:
+                continue
+            product = hub_product_dict(row)
+            entry = CatalogEntry(
+                id=row.id,
+                vendor_id=row.vendor_id,
+                category_id=row.category_id,
+                category=product["category"].lower(),
+                product_type=row.product_type,
+                price=row.price,
+                stock=row.stock_quantity or 0,
+                search_text=f"{product['name']}\n{product['description']}".lower(),
+                body=_dumps(product),
+            )
+            self.entries.append(entry)
+            self.by_vendor.setdefault(entry.vendor_id, []).append(entry)
+            self.by_category.setdefault(entry.category_id, []).append(entry)
+
+        # The admin-facing list includes every active product regardless of vendor status
+        self.catalog_body = render_json_list([_dumps(catalog_product_dict(r)) for r in rows])
+
+    def page(
+        self,
+        after_id: Optional[uuid.UUID],
+        limit: int,
+        category_id: Optional[int] = None,
+        vendor_id: Optional[uuid.UUID] = None,
+        product_type: Optional[ProductType] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        category: Optional[str] = None,
+        q: Optional[str] = None,
+    ) -> Tuple[List[bytes], Optional[uuid.UUID]]:
+        """
+        Return up to `limit` serialized products after `after_id` matching the filters,
+        plus the id to resume from (None when this is the last page).
+        """
+        # Start from the narrowest prebuilt list
+        if vendor_id is not None:
+            candidates = self.by_vendor.get(vendor_id, [])
+        elif category_id is not None:
+            candidates = self.by_category.get(category_id, [])
+        else:
+            candidates = self.entries
+
+        start = bisect_right(candidates, after_id, key=_entry_id) if after_id else 0
+        category = category.lower() if category is not None else None
+        q = q.lower() if q else None
+
+        page = []
+        for entry in candidates[start:]:
+            if category_id is not None and entry.category_id != category_id:
+                continue
+            if product_type is not None and entry.product_type != product_type:
+                continue
+            if min_price is not None and entry.price < min_price:
+                continue
+            if max_price is not None and entry.price > max_price:
+                continue
+            if in_stock is not None and (entry.stock > 0) != in_stock:
+                continue
+            if category is not None and entry.category != category:
+                continue
+            if q is not None and q not in entry.search_text:
+                continue
+            page.append(entry)
+            if len(page) > limit:
+                break
+
+        next_id = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_id = page[-1].id
+        return [e.body for e in page], next_id
+
+    def product(self, product_id: uuid.UUID) -> Optional[bytes]:
+        """The serialized hub product, or None if it isn't in the catalog."""
+        i = bisect_left(self.entries, product_id, key=_entry_id)
+        if i < len(self.entries) and self.entries[i].id == product_id:
+            return self.entries[i].body
+        return None
+
+
+class CatalogCache:
+    """
+    In-process catalog snapshot with versioned invalidation.
+
+    Write paths that change what the catalog shows (product create/delete, vendor
+    approval state) call `invalidate()`, which bumps the version; the next read
+    rebuilds the snapshot once. The TTL bounds staleness when several workers run,
+    since an invalidation only reaches the process that handled the write.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def invalidate(self):
+        self.version += 1
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - snapshot.built_at < self.ttl_seconds
+        )
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        # Single rebuild: concurrent misses wait for the first one
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+
+            version = self.version
+            result = await db.execute(catalog_query())
+            snapshot = CatalogSnapshot(version, result.all())
+            self._snapshot = snapshot
+            return snapshot
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
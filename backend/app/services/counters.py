@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Dict, List, Sequence
+from sqlalchemy import case, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# INSERT ... ON CONFLICT DO UPDATE is spelled the same way by both dialects we run on
+_UPSERT = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def increment_statement(
+    dialect_name: str,
+    model,
+    key_columns: List[str],
+    rows: List[Dict],
+    latest: Sequence[str] = (),
+    keep: Sequence[str] = (),
+):
+    """The upsert behind `increment`, for callers that execute it themselves (e.g. inside a flush)."""
+    stmt = _UPSERT[dialect_name](model).values(rows)
+    set_ = {}
+    for column in rows[0]:
+        if column in key_columns or column in keep:
+            continue
+        stored, new = getattr(model, column), getattr(stmt.excluded, column)
+        if column in latest:
+            set_[column] = case((or_(stored.is_(None), new > stored), new), else_=stored)
+        else:
+            set_[column] = stored + new
+    if "updated_at" in model.__table__.c:
+        set_["updated_at"] = datetime.utcnow()
+
+    return stmt.on_conflict_do_update(index_elements=key_columns, set_=set_)
+
+
+async def increment(
+    db: AsyncSession,
+    model,
+    key_columns: List[str],
+    rows: List[Dict],
+    latest: Sequence[str] = (),
+    keep: Sequence[str] = (),
+):
+    """
+    Add each row's counter values to the row with the same key, creating it when missing,
+    in one INSERT ... ON CONFLICT DO UPDATE. Every row must carry the same columns.
+    Columns in `latest` keep the larger of the stored and new value instead of adding up;
+    columns in `keep` are only written when the row is created.
+
+    Increments commute, so read models built on them can take updates from several
+    paths in any order (e.g. a cancellation that lands before the event for the order
+    being placed) without read-modify-write races.
+    """
+    if not rows:
+        return
+    await db.execute(increment_statement(db.get_bind().dialect.name, model, key_columns, rows, latest, keep))
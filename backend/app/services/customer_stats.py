@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Iterable, Tuple
+from sqlalchemy import case, delete, func, insert
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.customer_stats import CustomerStats
+from app.models.order import Order, OrderStatus
+from app.services.counters import increment
+
+
+def customer_key(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+async def record_customer_orders(db: AsyncSession, orders: Iterable[Tuple[str, str, float, datetime]]):
+    """Count new orders, given as (customer_email, customer_name, total_amount, created_at)."""
+    summary = {}
+    for email, name, total, created_at in orders:
+        key = customer_key(email)
+        row = summary.setdefault(key, {
+            "customer_email": key, "customer_name": name,
+            "order_count": 0, "total_spent": 0.0, "last_order_at": created_at,
+        })
+        row["order_count"] += 1
+        row["total_spent"] += total or 0
+        row["last_order_at"] = max(row["last_order_at"], created_at)
+
+    await increment(
+        db, CustomerStats, ["customer_email"], list(summary.values()),
+        latest=["last_order_at"], keep=["customer_name"]
+    )
+
+
+async def record_customer_status_change(db: AsyncSession, order: Order, old_status: OrderStatus):
+    """Take a cancelled order out of its customer's spend (or put a restored one back)."""
+    restored = int(old_status == OrderStatus.CANCELLED) - int(order.status == OrderStatus.CANCELLED)
+    if not restored:
+        return
+    await increment(db, CustomerStats, ["customer_email"], [{
+        "customer_email": customer_key(order.customer_email),
+        "order_count": 0,
+        "total_spent": restored * (order.total_amount or 0),
+    }])
+
+
+async def rebuild_customer_stats(db: AsyncSession) -> int:
+    """
+    Recompute every customer's summary from `orders` with one grouped aggregate and
+    commit. Returns the number of customers written. Orders placed while it runs may
+    be miscounted, so run it when traffic is quiet.
+    """
+    email = func.lower(func.trim(Order.customer_email))
+    await db.execute(delete(CustomerStats))
+    result = await db.execute(
+        insert(CustomerStats).from_select(
+            ["customer_email", "customer_name", "order_count", "total_spent", "last_order_at", "updated_at"],
+            select(
+                email,
+                func.min(Order.customer_name),
+                func.count(Order.id),
+                func.coalesce(func.sum(case((Order.status == OrderStatus.CANCELLED, 0), else_=Order.total_amount)), 0),
+                func.max(Order.created_at),
+                func.now(),
+            ).group_by(email)
+        )
+    )
+    await db.commit()
+    return result.rowcount
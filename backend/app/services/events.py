@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from dataclasses import asdict, is_dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Type
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.failed_event import FailedEvent
+
+logger = logging.getLogger("uvicorn.error")
+
+Handler = Callable[[AsyncSession, List], Awaitable[None]]
+
+
+class EventBus:
+    """
+    In-process event pipeline for work that does not need to finish before we respond
+    (e.g. notification fan-out after an order commits).
+
+    Events go onto a bounded queue; when it is full, `publish()` waits for room,
+    which slows producers down instead of letting memory grow. A pool of workers
+    drains the queue in batches: each batch is grouped by event type, handed to the
+    subscribed handlers with one session, and committed once. If a batch fails, its
+    events are replayed one per session so a single bad event cannot take the rest
+    down with it; events that still fail are kept in the failed_events table.
+
+    `stop()` stops intake and drains what is queued before the workers exit. While
+    the bus is not running (scripts, tests, after shutdown) events are handled inline.
+    Events still queued when the process crashes are lost.
+    """
+
+    def __init__(self, workers: int, queue_size: int, batch_size: int, drain_timeout: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.drain_timeout = drain_timeout
+        self.session_factory = AsyncSessionLocal
+        self._handlers: Dict[Type, List[Handler]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def subscribe(self, event_type: Type, handler: Handler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        """Drain queued events (bounded by drain_timeout), then stop the workers."""
+        if not self.running:
+            return
+        tasks, self._tasks = self._tasks, []  # New events are handled inline from here on
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Event bus shutdown: {self._queue.qsize()} events not delivered")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+
+    async def publish(self, event):
+        if self.running:
+            await self._queue.put(event)
+            return
+        # The caller's own work is already committed; never fail it over a side effect
+        try:
+            await self._dispatch([event])
+        except Exception as exc:
+            await self._dead_letter(event, exc)
+
+    async def _worker(self, index: int):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._dispatch(batch)
+            except Exception:
+                logger.exception(f"Event worker {index} failed to handle {len(batch)} events, retrying one by one")
+                await self._replay(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _dispatch(self, events: List):
+        by_type: Dict[Type, List] = {}
+        for event in events:
+            by_type.setdefault(type(event), []).append(event)
+
+        async with self.session_factory() as db:
+            for event_type, group in by_type.items():
+                for handler in self._handlers.get(event_type, []):
+                    await handler(db, group)
+            await db.commit()
+
+    async def _replay(self, events: List):
+        for event in events:
+            try:
+                await self._dispatch([event])
+            except Exception as exc:
+                await self._dead_letter(event, exc)
+
+    async def _dead_letter(self, event, exc: Exception):
+        event_type = type(event).__name__
+        logger.error(f"Failed to handle {event_type}", exc_info=exc)
+        try:
+            async with self.session_factory() as db:
+                db.add(FailedEvent(event_type=event_type, payload=_jsonable(event), error=repr(exc)))
+                await db.commit()
+        except Exception:
+            # Nowhere left to keep it; the log line is the only record
+            logger.exception(f"Failed to record undelivered {event_type}: {event!r}")
+
+
+def _jsonable(value):
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+event_bus = EventBus(
+    workers=settings.EVENT_WORKERS,
+    queue_size=settings.EVENT_QUEUE_SIZE,
+    batch_size=settings.EVENT_BATCH_SIZE,
+    drain_timeout=settings.EVENT_DRAIN_TIMEOUT_SECONDS,
+)
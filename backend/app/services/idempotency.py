@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+PURGE_INTERVAL_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.05
+STALE_CLAIM_SECONDS = 60  # In-flight claims older than this belong to a crashed worker
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a request with a different body."""
+
+
+class IdempotencyInProgress(Exception):
+    """Another request with the same key did not finish within the wait timeout."""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON-serializable request body."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Claim:
+    """
+    Result of claiming a key: either a stored response to replay,
+    or ownership of the key for the duration of the request.
+    """
+
+    def __init__(self, key: str, replay: Optional[Dict] = None, status_code: int = 200):
+        self.key = key
+        self.replay = replay
+        self.status_code = status_code
+
+
+class IdempotencyStore:
+    """
+    Idempotency keys backed by the `idempotency_keys` table.
+
+    The first request inserts an in-flight row (the claim) and commits it, does its
+    work, and stages its response with `record()` so it commits together with that
+    work. Duplicates replay the stored response. Duplicates arriving while the first
+    request is still running wait for it: on an in-process event when it runs in the
+    same worker, otherwise by polling the row. Failed requests drop their claim so a
+    retry runs again. Rows older than the TTL are evicted.
+    """
+
+    def __init__(self, ttl_seconds: int, wait_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self._inflight: Dict[str, asyncio.Event] = {}
+        self._last_purge = 0.0
+
+    def _cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    async def _purge_expired(self, db: AsyncSession):
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < self._cutoff()))
+        await db.commit()
+
+    async def _acquire(self, db: AsyncSession, key: str, fingerprint: str) -> Claim:
+        deadline = time.monotonic() + self.wait_seconds
+        await self._purge_expired(db)
+
+        while True:
+            # Same-worker duplicate: wait for the owner without touching the DB
+            event = self._inflight.get(key)
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    raise IdempotencyInProgress()
+
+            result = await db.execute(
+                select(
+                    IdempotencyKey.request_hash,
+                    IdempotencyKey.status_code,
+                    IdempotencyKey.response_body,
+                    IdempotencyKey.created_at,
+                ).where(IdempotencyKey.key == key)
+            )
+            row = result.first()
+            # End the read transaction so polling sees other workers' commits
+            await db.commit()
+
+            if row is None:
+                if key in self._inflight:
+                    continue
+                event = asyncio.Event()
+                self._inflight[key] = event
+                try:
+                    db.add(IdempotencyKey(key=key, request_hash=fingerprint))
+                    await db.commit()
+                except IntegrityError:
+                    # Another worker claimed it first; go back to waiting on it
+                    await db.rollback()
+                    self._release_local(key, event)
+                    continue
+                except BaseException:
+                    self._release_local(key, event)
+                    raise
+                return Claim(key)
+
+            expired = row.created_at is not None and row.created_at < self._cutoff()
+            abandoned = (
+                row.status_code is None
+                and row.created_at is not None
+                and row.created_at < datetime.utcnow() - timedelta(seconds=STALE_CLAIM_SECONDS)
+            )
+            if expired or abandoned:
+                # Evict and claim again
+                await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+                await db.commit()
+                continue
+
+            if row.request_hash != fingerprint:
+                raise IdempotencyKeyMismatch()
+
+            if row.status_code is not None:
+                return Claim(key, replay=row.response_body, status_code=row.status_code)
+
+            # In flight on another worker
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress()
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    def _release_local(self, key: str, event: asyncio.Event):
+        if self._inflight.get(key) is event:
+            del self._inflight[key]
+        event.set()
+
+    @asynccontextmanager
+    async def claim(self, db: AsyncSession, key: str, fingerprint: str):
+        """
+        Claim `key` for the enclosed block. If `claim.replay` is set the block must
+        return it instead of doing the work. Exceptions release the claim.
+        """
+        claim = await self._acquire(db, key, fingerprint)
+        if claim.replay is not None:
+            yield claim
+            return
+
+        event = self._inflight.get(key)
+        try:
+            yield claim
+        except BaseException:
+            await db.rollback()
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+            await db.commit()
+            raise
+        finally:
+            if event is not None:
+                self._release_local(key, event)
+
+    async def record(self, db: AsyncSession, claim: Claim, body: Dict, status_code: int = 200):
+        """Stage the response in the caller's transaction; it becomes visible on commit."""
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == claim.key)
+            .values(status_code=status_code, response_body=body)
+            .execution_options(synchronize_session=False)
+        )
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+)
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import inspect, literal
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.user import User
+from app.models.vendor import Vendor
+
+
+def _columns(obj) -> Optional[dict]:
+    if obj is None:
+        return None
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+@dataclass(frozen=True)
+class Identity:
+    """Column values of the token subject's user and vendor rows (None when there is no row)."""
+    user: Optional[dict]
+    vendor: Optional[dict]
+
+    def user_object(self) -> Optional[User]:
+        """A fresh, session-less User per call, so a request can't change another's copy."""
+        return User(**self.user) if self.user is not None else None
+
+    def vendor_object(self) -> Optional[Vendor]:
+        return Vendor(**self.vendor) if self.vendor is not None else None
+
+
+class IdentityCache:
+    """
+    Token subject (email) -> Identity, so authenticated requests skip the user and
+    vendor lookups. Entries live for `ttl_seconds` (0 disables the cache) and the
+    least recently used are evicted past `max_entries`.
+
+    Call `invalidate(email)` whenever a write changes who a subject is or whether
+    they may act (vendor approval, suspension, deletion, profile edits). Other
+    workers keep their copy until it expires, so the TTL bounds staleness there.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, email: str) -> Identity:
+        entry = self._entries.get(email)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        identity = await load_identity(db, email)
+        if self.ttl_seconds > 0:
+            self._entries[email] = (time.monotonic() + self.ttl_seconds, identity)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return identity
+
+    def invalidate(self, email: Optional[str] = None):
+        """Drop one subject, or everything when no email is given."""
+        if email is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(email, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+async def load_identity(db: AsyncSession, email: str) -> Identity:
+    """The subject's user and vendor in one statement (either may be missing)."""
+    subject = select(literal(email).label("email")).subquery()
+    result = await db.execute(
+        select(User, Vendor)
+        .select_from(subject)
+        .outerjoin(User, User.email == subject.c.email)
+        .outerjoin(Vendor, Vendor.contact_email == subject.c.email)
+        .limit(1)
+    )
+    user, vendor = result.one()
+    return Identity(user=_columns(user), vendor=_columns(vendor))
+
+
+identity_cache = IdentityCache(
+    ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+    max_entries=settings.IDENTITY_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,58 @@
+import uuid
+from typing import Dict, List
+from sqlalchemy import case, update
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.product import Product
+
+
+class OutOfStockError(Exception):
+    """Raised when an order asks for more units than a product has left."""
+
+    def __init__(self, shortages: List[dict]):
+        self.shortages = shortages
+        names = ", ".join(f"{s['name']} ({s['available']} left)" for s in shortages)
+        super().__init__(f"Insufficient stock for: {names}")
+
+
+async def reserve_stock(db: AsyncSession, quantities: Dict[uuid.UUID, int]) -> List[uuid.UUID]:
+    """
+    Decrement stock for every product of an order with one conditional UPDATE:
+
+        UPDATE products SET stock_quantity = stock_quantity - <qty>
+        WHERE id IN (...) AND stock_quantity >= <qty>
+
+    The check and the decrement happen in the same statement, so concurrent
+    checkouts cannot oversell and no row is read before being written.
+    stock_quantity is NOT NULL (an untracked stock counts as 0), so the
+    comparison always has a value to test.
+    Raises OutOfStockError if any product could not be covered; the caller must
+    roll back so the lines that did succeed are released again.
+    Returns the ids of products that just sold out.
+    """
+    if not quantities:
+        return []
+
+    wanted = case(quantities, value=Product.id)
+    result = await db.execute(
+        update(Product)
+        .where(Product.id.in_(quantities.keys()))
+        .where(Product.stock_quantity >= wanted)
+        .values(stock_quantity=Product.stock_quantity - wanted)
+        .returning(Product.id, Product.stock_quantity)
+        .execution_options(synchronize_session=False)
+    )
+    reserved = {row.id: row.stock_quantity for row in result.all()}
+
+    if len(reserved) < len(quantities):
+        # Rows that were not updated were left untouched, so their stock is accurate
+        missing = [pid for pid in quantities if pid not in reserved]
+        rows = await db.execute(
+            select(Product.id, Product.name, Product.stock_quantity).where(Product.id.in_(missing))
+        )
+        raise OutOfStockError([
+            {"product_id": str(r.id), "name": r.name, "available": r.stock_quantity or 0}
+            for r in rows.all()
+        ])
+
+    return [pid for pid, remaining in reserved.items() if remaining <= 0]
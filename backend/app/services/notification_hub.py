@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.admin_notification import AdminNotification
+from app.models.broadcast import BroadcastNotification
+from app.models.notification import Notification
+
+logger = logging.getLogger("uvicorn.error")
+
+ADMIN_CHANNEL = "admin"  # The shared admin inbox
+BROADCAST_CHANNEL = "vendors"  # Broadcasts to every vendor
+
+_PENDING = "notification_hub_pending"  # Session.info key for events waiting on commit
+
+
+def vendor_channel(vendor_id) -> str:
+    return f"vendor:{vendor_id}"
+
+
+def notification_message(notification) -> dict:
+    """The JSON pushed to listeners, shaped like the feed/inbox items."""
+    message = {
+        "id": str(notification.id),
+        "type": notification.type.value,
+        "title": notification.title,
+        "message": notification.message,
+        "created_at": notification.created_at.isoformat(),
+        "extra_data": notification.extra_data,
+    }
+    if isinstance(notification, BroadcastNotification):
+        message["broadcast"] = True
+    return message
+
+
+class Broker(ABC):
+    """
+    Carries published events to every worker's hub. `publish` must not block: a
+    networked broker (Redis pub/sub, Postgres LISTEN/NOTIFY) sends in the background
+    and calls `hub.deliver` for each attached hub when messages arrive.
+    """
+
+    @abstractmethod
+    def attach(self, hub: "NotificationHub"):
+        ...
+
+    @abstractmethod
+    def detach(self, hub: "NotificationHub"):
+        ...
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict):
+        ...
+
+
+class LocalBroker(Broker):
+    """In-process stand-in for a shared broker: delivers to every hub attached in this process."""
+
+    def __init__(self):
+        self._hubs: List["NotificationHub"] = []
+
+    def attach(self, hub: "NotificationHub"):
+        if hub not in self._hubs:
+            self._hubs.append(hub)
+
+    def detach(self, hub: "NotificationHub"):
+        if hub in self._hubs:
+            self._hubs.remove(hub)
+
+    def publish(self, channel: str, message: dict):
+        for hub in list(self._hubs):
+            hub.deliver(channel, message)
+
+
+class Subscription:
+    """
+    One listener's bounded buffer. When the listener falls behind, the oldest
+    messages are dropped (and counted) so a slow connection never holds memory.
+    """
+
+    def __init__(self, hub: "NotificationHub", channels: Iterable[str], buffer_size: int):
+        self.hub = hub
+        self.channels = list(channels)
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self._loop = asyncio.get_running_loop()
+
+    def push(self, message: dict):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(message)
+        else:
+            self._loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: dict):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Next message, or None when nothing arrived within `timeout` (time for a heartbeat)."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NotificationHub:
+    """
+    Pub/sub for live notification delivery. Publishing goes through the broker so
+    every worker's hub (each attached to the same broker) delivers to its own
+    connections; a connection subscribes to the channels of the inboxes it shows.
+    """
+
+    def __init__(self, broker: Optional[Broker] = None, buffer_size: int = 100, heartbeat_seconds: float = 15.0):
+        self.buffer_size = buffer_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.broker = None
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.use_broker(broker or LocalBroker())
+
+    def use_broker(self, broker: Broker):
+        if self.broker is not None:
+            self.broker.detach(self)
+        self.broker = broker
+        broker.attach(self)
+
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        subscription = Subscription(self, channels, self.buffer_size)
+        for channel in subscription.channels:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for channel in subscription.channels:
+            listeners = self._subscriptions.get(channel)
+            if listeners is not None:
+                listeners.discard(subscription)
+                if not listeners:
+                    del self._subscriptions[channel]
+
+    def publish(self, channel: str, message: dict):
+        try:
+            self.broker.publish(channel, message)
+        except Exception:
+            # Live push is best effort; clients still see the row on their next fetch
+            logger.exception(f"Failed to publish to {channel}")
+
+    def deliver(self, channel: str, message: dict):
+        """Called by the broker: hand the message to this worker's listeners on `channel`."""
+        for subscription in list(self._subscriptions.get(channel, ())):
+            subscription.push(message)
+
+    def stats(self) -> dict:
+        subscriptions = {s for listeners in self._subscriptions.values() for s in listeners}
+        return {
+            "connections": len(subscriptions),
+            "channels": len(self._subscriptions),
+            "dropped": sum(s.dropped for s in subscriptions),
+        }
+
+
+notification_hub = NotificationHub(
+    buffer_size=settings.NOTIFICATION_STREAM_BUFFER,
+    heartbeat_seconds=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS,
+)
+
+
+def publish_after_commit(db: AsyncSession, channel: str, message: dict):
+    """
+    Queue a message on the session; it is published once the transaction commits and
+    dropped if it rolls back. ORM-added notifications are queued automatically (see
+    `_queue_orm_notifications`); Core INSERTs of notifications must call this.
+    """
+    db.info.setdefault(_PENDING, []).append((channel, message))
+
+
+@event.listens_for(Session, "after_flush")
+def _queue_orm_notifications(session, flush_context):
+    """Queue a push for every notification the flush inserted (ids and timestamps are set by now)."""
+    for obj in session.new:
+        if isinstance(obj, Notification):
+            channel = vendor_channel(obj.vendor_id)
+        elif isinstance(obj, AdminNotification):
+            channel = ADMIN_CHANNEL
+        elif isinstance(obj, BroadcastNotification):
+            channel = BROADCAST_CHANNEL
+        else:
+            continue
+        session.info.setdefault(_PENDING, []).append((channel, notification_message(obj)))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    for channel, message in session.info.pop(_PENDING, ()):
+        notification_hub.publish(channel, message)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,95 @@
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.notification import Notification, NotificationType
+from app.models.admin_notification import AdminNotification, AdminNotificationType
+from app.services.events import event_bus
+from app.services.sales_rollup import record_orders_placed
+from app.services.vendor_stats import record_vendor_sales
+from app.services.customer_stats import record_customer_orders
+from app.services.unread_counters import ADMIN, recipient_key, record_unread
+from app.services.notification_hub import ADMIN_CHANNEL, notification_message, publish_after_commit, vendor_channel
+
+
+@dataclass(frozen=True)
+class OrderPlaced:
+    """Emitted after an order has been committed."""
+    order_id: uuid.UUID
+    customer_name: str
+    total_amount: float
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    customer_email: str = ""
+    vendor_ids: List[uuid.UUID] = field(default_factory=list)  # Distinct, in cart order
+    vendor_totals: Dict[uuid.UUID, float] = field(default_factory=dict)  # Each vendor's share of total_amount
+
+
+async def write_order_notifications(db: AsyncSession, events: List[OrderPlaced]):
+    """Admin notification per order plus one per vendor in it, inserted in bulk for the whole batch."""
+    now = datetime.utcnow()
+    admin_rows = [
+        {
+            "id": uuid.uuid4(),
+            "type": AdminNotificationType.NEW_ORDER,
+            "title": "New Order Received",
+            "message": f"Order #{str(e.order_id)[:8]} placed by {e.customer_name} for ₹{e.total_amount}",
+            "extra_data": {"order_id": str(e.order_id)},
+            "created_at": now
+        }
+        for e in events
+    ]
+    await db.execute(insert(AdminNotification), admin_rows)
+
+    vendor_rows = [
+        {
+            "id": uuid.uuid4(),
+            "vendor_id": vendor_id,
+            "type": NotificationType.SYSTEM,
+            "title": "📦 New Order Received",
+            "message": f"You have received a new order #{str(e.order_id)[:8]}.",
+            "extra_data": {"order_id": str(e.order_id)},
+            "created_at": now
+        }
+        for e in events
+        for vendor_id in e.vendor_ids
+    ]
+    if vendor_rows:
+        await db.execute(insert(Notification), vendor_rows)
+
+    # Core inserts bypass the ORM hook that maintains unread counters
+    unread = {ADMIN: len(events)}
+    for row in vendor_rows:
+        key = recipient_key(row["vendor_id"])
+        unread[key] = unread.get(key, 0) + 1
+    await record_unread(db, unread)
+
+    # Likewise the live push: queue it to go out when the batch commits
+    for row in admin_rows:
+        publish_after_commit(db, ADMIN_CHANNEL, notification_message(AdminNotification(**row)))
+    for row in vendor_rows:
+        publish_after_commit(db, vendor_channel(row["vendor_id"]), notification_message(Notification(**row)))
+
+
+async def roll_up_daily_sales(db: AsyncSession, events: List[OrderPlaced]):
+    """Add the batch to the daily sales rollup (one upsert per batch)."""
+    await record_orders_placed(db, [(e.created_at, e.total_amount) for e in events])
+
+
+async def roll_up_vendor_stats(db: AsyncSession, events: List[OrderPlaced]):
+    """Add the batch to the vendors' dashboard counters."""
+    await record_vendor_sales(db, [(e.created_at, e.vendor_totals) for e in events])
+
+
+async def roll_up_customer_stats(db: AsyncSession, events: List[OrderPlaced]):
+    """Add the batch to the customer directory summaries."""
+    await record_customer_orders(
+        db, [(e.customer_email, e.customer_name, e.total_amount, e.created_at) for e in events if e.customer_email]
+    )
+
+
+event_bus.subscribe(OrderPlaced, write_order_notifications)
+event_bus.subscribe(OrderPlaced, roll_up_daily_sales)
+event_bus.subscribe(OrderPlaced, roll_up_vendor_stats)
+event_bus.subscribe(OrderPlaced, roll_up_customer_stats)
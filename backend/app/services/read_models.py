@@ -0,0 +1,50 @@
+import logging
+from typing import Awaitable, Callable, List, Tuple
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.models.read_model_backfill import ReadModelBackfill
+from app.services.sales_rollup import rebuild_daily_sales
+from app.services.customer_stats import rebuild_customer_stats
+from app.services.vendor_stats import reconcile_vendor_stats
+from app.services.unread_counters import recount_unread
+
+logger = logging.getLogger("uvicorn.error")
+
+# Read model name -> rebuild from the source tables (each commits its own work)
+REBUILDS: List[Tuple[str, Callable[[AsyncSession], Awaitable[int]]]] = [
+    ("daily_sales_rollup", rebuild_daily_sales),
+    ("customer_stats", rebuild_customer_stats),
+    ("vendor_stats", reconcile_vendor_stats),
+    ("unread_counters", recount_unread),
+]
+
+
+async def backfill_read_models(session_factory=AsyncSessionLocal) -> List[str]:
+    """
+    Build every read model that has never been built on this database, so a deploy
+    that introduces one starts from the existing orders instead of from zero. Runs at
+    startup, before the worker serves requests; afterwards the order paths keep the
+    read models current. Returns the names built.
+
+    A rebuild that fails (e.g. another worker starting at the same moment) is logged
+    and retried at the next startup. `rebuild_rollups.py` re-derives everything on demand.
+    """
+    async with session_factory() as db:
+        built = set((await db.execute(select(ReadModelBackfill.name))).scalars().all())
+
+    names = []
+    for name, rebuild in REBUILDS:
+        if name in built:
+            continue
+        try:
+            async with session_factory() as db:
+                rows = await rebuild(db)
+                db.add(ReadModelBackfill(name=name))
+                await db.commit()
+        except Exception:
+            logger.exception(f"Backfilling {name} failed; it will be retried at the next startup")
+            continue
+        logger.info(f"Backfilled {name}: {rows} rows")
+        names.append(name)
+    return names
@@ -0,0 +1,178 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Union
+from sqlalchemy import delete, event, exists, func, inspect, insert, or_
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.admin_notification import AdminNotification
+from app.models.broadcast import BroadcastNotification, BroadcastReceipt, BroadcastSubscription
+from app.models.notification import Notification
+from app.models.unread_counter import UnreadCounter
+from app.models.vendor import Vendor
+from app.services.counters import increment, increment_statement
+
+ADMIN = "admin"  # Recipient key of the shared admin inbox
+# Counter of broadcasts sent. A vendor's badge is their own counter (direct unread
+# minus broadcasts they have read or that were sent before they subscribed) plus this one.
+BROADCASTS = "broadcasts"
+
+
+def recipient_key(recipient: Union[uuid.UUID, str]) -> str:
+    return str(recipient)
+
+
+def broadcast_visible_to(vendor_id: uuid.UUID):
+    """Criterion on BroadcastNotification: sent since the vendor subscribed (see BroadcastSubscription)."""
+    return ~exists().where(
+        BroadcastSubscription.vendor_id == vendor_id,
+        BroadcastSubscription.since > BroadcastNotification.created_at
+    )
+
+
+def _read_by(vendor_id):
+    return exists().where(
+        BroadcastReceipt.broadcast_id == BroadcastNotification.id,
+        BroadcastReceipt.vendor_id == vendor_id
+    )
+
+
+async def subscribe_to_broadcasts(db: AsyncSession, vendor_id: uuid.UUID):
+    """
+    Start a newly approved vendor's broadcasts from now: earlier ones stay out of their
+    feed and are taken off their badge. No-op if already subscribed; caller commits.
+    """
+    if await db.get(BroadcastSubscription, vendor_id):
+        return
+    since = datetime.utcnow()
+    db.add(BroadcastSubscription(vendor_id=vendor_id, since=since))
+    earlier = await db.execute(
+        select(func.count()).select_from(BroadcastNotification)
+        .where(BroadcastNotification.created_at < since, ~_read_by(vendor_id))
+    )
+    await record_unread(db, {recipient_key(vendor_id): -earlier.scalar()})
+
+
+def _recipient_of(notification) -> str:
+    if isinstance(notification, AdminNotification):
+        return ADMIN
+    return recipient_key(notification.vendor_id)
+
+
+def _rows(deltas: Dict[str, int]):
+    return [{"recipient": recipient, "unread": delta} for recipient, delta in deltas.items() if delta]
+
+
+async def record_unread(db: AsyncSession, deltas: Dict[str, int]):
+    """
+    Adjust unread counters by recipient. ORM writes are tracked automatically (see
+    `_track_orm_changes`); Core INSERT/UPDATE statements on notifications must call this.
+    """
+    rows = _rows(deltas)
+    if rows:
+        await increment(db, UnreadCounter, ["recipient"], rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_orm_changes(session, flush_context):
+    """
+    Keep counters in step with notifications added, marked read/unread or deleted
+    through the ORM, in the same transaction as the flush that wrote them.
+    Vendors deleted in the flush are skipped: their notifications go with them by
+    cascade, and their counter is removed rather than counted down.
+    """
+    deltas = defaultdict(int)
+    for obj in session.new:
+        if isinstance(obj, (Notification, AdminNotification)) and not obj.is_read:
+            deltas[_recipient_of(obj)] += 1
+        elif isinstance(obj, BroadcastNotification):
+            deltas[BROADCASTS] += 1
+        elif isinstance(obj, BroadcastReceipt):
+            deltas[recipient_key(obj.vendor_id)] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, (Notification, AdminNotification)):
+            history = inspect(obj).attrs.is_read.history
+            if history.has_changes():
+                was_unread = not history.deleted[0] if history.deleted else True
+                deltas[_recipient_of(obj)] += int(not obj.is_read) - int(was_unread)
+    for obj in session.deleted:
+        if isinstance(obj, (Notification, AdminNotification)) and not obj.is_read:
+            deltas[_recipient_of(obj)] -= 1
+        elif isinstance(obj, BroadcastReceipt):
+            deltas[recipient_key(obj.vendor_id)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Vendor):
+            deltas.pop(recipient_key(obj.id), None)
+
+    rows = _rows(deltas)
+    if rows:
+        connection = session.connection()
+        connection.execute(increment_statement(connection.dialect.name, UnreadCounter, ["recipient"], rows))
+
+
+async def count_unread(db: AsyncSession, recipient: str) -> int:
+    """The value a recipient's counter should hold, counted from the notification tables."""
+    if recipient == ADMIN:
+        query = select(func.count()).select_from(AdminNotification).where(AdminNotification.is_read == False)
+    elif recipient == BROADCASTS:
+        query = select(func.count()).select_from(BroadcastNotification)
+    else:
+        vendor_id = uuid.UUID(recipient)
+        query = select(
+            select(func.count()).select_from(Notification)
+            .where(Notification.vendor_id == vendor_id, Notification.is_read == False)
+            .scalar_subquery()
+            - select(func.count()).select_from(BroadcastNotification)
+            .where(or_(_read_by(vendor_id), ~broadcast_visible_to(vendor_id)))
+            .scalar_subquery()
+        )
+    return (await db.execute(query)).scalar() or 0
+
+
+async def unread_count(db: AsyncSession, recipient: str) -> int:
+    """
+    Badge number: the recipient's counter (plus the broadcast counter for a vendor).
+    Counters are built from the notification tables at startup (app/services/read_models.py)
+    and kept in step from then on, so a missing row means nothing unread.
+    """
+    keys = [recipient] if recipient == ADMIN else [recipient, BROADCASTS]
+    result = await db.execute(select(func.sum(UnreadCounter.unread)).where(UnreadCounter.recipient.in_(keys)))
+    return max(0, result.scalar() or 0)
+
+
+async def recount_unread(db: AsyncSession) -> int:
+    """
+    Rebuild every counter from the notification tables and commit; returns the number
+    of counters written. Use it to backfill and to correct drift.
+    """
+    counts = defaultdict(int)
+    vendor_unread = await db.execute(
+        select(Notification.vendor_id, func.count())
+        .where(Notification.is_read == False)
+        .group_by(Notification.vendor_id)
+    )
+    for vendor_id, count in vendor_unread.all():
+        counts[recipient_key(vendor_id)] += count
+    broadcasts_read = await db.execute(
+        select(BroadcastReceipt.vendor_id, func.count()).group_by(BroadcastReceipt.vendor_id)
+    )
+    for vendor_id, count in broadcasts_read.all():
+        counts[recipient_key(vendor_id)] -= count
+    broadcasts_hidden = await db.execute(
+        select(BroadcastSubscription.vendor_id, func.count())
+        .join(BroadcastNotification, BroadcastNotification.created_at < BroadcastSubscription.since)
+        .where(~_read_by(BroadcastSubscription.vendor_id))
+        .group_by(BroadcastSubscription.vendor_id)
+    )
+    for vendor_id, count in broadcasts_hidden.all():
+        counts[recipient_key(vendor_id)] -= count
+    counts[ADMIN] = await count_unread(db, ADMIN)
+    counts[BROADCASTS] = await count_unread(db, BROADCASTS)
+    rows = _rows(counts)
+
+    await db.execute(delete(UnreadCounter))
+    if rows:
+        await db.execute(insert(UnreadCounter), rows)
+    await db.commit()
+    return len(rows)
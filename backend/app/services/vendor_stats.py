@@ -0,0 +1,171 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import and_, case, delete, func, insert
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, ProductApprovalStatus
+from app.models.vendor import Vendor
+from app.models.vendor_stats import VendorStats, VendorMonthlyRevenue
+from app.services.counters import increment
+
+
+def month_key(moment) -> str:
+    return moment.strftime("%Y-%m")
+
+
+def is_listed(approval_status, is_active) -> bool:
+    """Whether a product counts as active on the vendor dashboard."""
+    return approval_status == ProductApprovalStatus.PUBLISHED and bool(is_active)
+
+
+def _stats_row(vendor_id: uuid.UUID, earnings=0.0, pending_orders=0, active_products=0, total_products=0) -> Dict:
+    return {
+        "vendor_id": vendor_id,
+        "earnings": earnings,
+        "pending_orders": pending_orders,
+        "active_products": active_products,
+        "total_products": total_products,
+    }
+
+
+async def record_product_change(db: AsyncSession, vendor_id: uuid.UUID, total: int = 0, active: int = 0):
+    """Adjust a vendor's product counters (+1/-1) in the caller's transaction."""
+    if total or active:
+        await increment(db, VendorStats, ["vendor_id"], [_stats_row(vendor_id, total_products=total, active_products=active)])
+
+
+async def record_vendor_sales(db: AsyncSession, orders: Iterable[Tuple[datetime, Dict[uuid.UUID, float]]]):
+    """
+    Count new orders, given as (created_at, {vendor_id: vendor's line total}) pairs.
+    New orders are PENDING, so each one also adds to its vendors' pending count.
+    """
+    stats = defaultdict(lambda: [0.0, 0])
+    monthly = defaultdict(float)
+    for created_at, vendor_totals in orders:
+        for vendor_id, amount in vendor_totals.items():
+            stats[vendor_id][0] += amount
+            stats[vendor_id][1] += 1
+            monthly[(vendor_id, month_key(created_at))] += amount
+
+    # One row per key: Postgres refuses to update the same row twice in one upsert
+    await increment(db, VendorStats, ["vendor_id"], [
+        _stats_row(vendor_id, earnings=earnings, pending_orders=pending)
+        for vendor_id, (earnings, pending) in stats.items()
+    ])
+    await increment(db, VendorMonthlyRevenue, ["vendor_id", "month"], [
+        {"vendor_id": vendor_id, "month": month, "revenue": revenue}
+        for (vendor_id, month), revenue in monthly.items()
+    ])
+
+
+async def record_order_status_change(db: AsyncSession, order: Order, old_status: OrderStatus):
+    """Update the pending counts and earnings of every vendor in an order whose status changed."""
+    pending = int(order.status == OrderStatus.PENDING) - int(old_status == OrderStatus.PENDING)
+    restored = int(old_status == OrderStatus.CANCELLED) - int(order.status == OrderStatus.CANCELLED)
+    if not pending and not restored:
+        return
+
+    result = await db.execute(
+        select(OrderItem.vendor_id, func.sum(OrderItem.price_at_purchase * OrderItem.quantity).label("amount"))
+        .where(OrderItem.order_id == order.id, OrderItem.vendor_id.is_not(None))
+        .group_by(OrderItem.vendor_id)
+    )
+    vendor_totals = result.all()
+
+    await increment(db, VendorStats, ["vendor_id"], [
+        _stats_row(row.vendor_id, earnings=restored * (row.amount or 0), pending_orders=pending)
+        for row in vendor_totals
+    ])
+    if restored:
+        await increment(db, VendorMonthlyRevenue, ["vendor_id", "month"], [
+            {"vendor_id": row.vendor_id, "month": month_key(order.created_at), "revenue": restored * (row.amount or 0)}
+            for row in vendor_totals
+        ])
+
+
+async def load_vendor_stats(db: AsyncSession, vendor_id: uuid.UUID, since_month: str) -> Optional[Tuple[VendorStats, Dict[str, float]]]:
+    """
+    A vendor's counters and its monthly revenue from `since_month` on, in one statement
+    that only touches primary keys. Returns None when the vendor has no stats row yet.
+    """
+    result = await db.execute(
+        select(VendorStats, VendorMonthlyRevenue.month, VendorMonthlyRevenue.revenue)
+        .outerjoin(VendorMonthlyRevenue, and_(
+            VendorMonthlyRevenue.vendor_id == VendorStats.vendor_id,
+            VendorMonthlyRevenue.month >= since_month
+        ))
+        .where(VendorStats.vendor_id == vendor_id)
+    )
+    rows = result.all()
+    if not rows:
+        return None
+    return rows[0].VendorStats, {row.month: row.revenue for row in rows if row.month is not None}
+
+
+async def reconcile_vendor_stats(db: AsyncSession, vendor_id: Optional[uuid.UUID] = None) -> int:
+    """
+    Recompute the stats of one vendor (or all of them) from the products, orders and
+    order_items tables, replacing the incremental values, and commit. Returns the
+    number of vendors written. Use it to backfill and to correct drift (e.g. order
+    events lost in a crash); orders placed while it runs may be miscounted, so run
+    it when traffic is quiet.
+    """
+    def scoped(query, column):
+        return query.where(column == vendor_id) if vendor_id is not None else query
+
+    vendor_ids = (await db.execute(scoped(select(Vendor.id), Vendor.id))).scalars().all()
+    stats = {vid: _stats_row(vid) for vid in vendor_ids}
+
+    listed = and_(Product.approval_status == ProductApprovalStatus.PUBLISHED, Product.is_active == True)
+    products = await db.execute(
+        scoped(
+            select(Product.vendor_id, func.count(Product.id), func.sum(case((listed, 1), else_=0))),
+            Product.vendor_id
+        ).group_by(Product.vendor_id)
+    )
+    for vid, total, active in products.all():
+        if vid in stats:
+            stats[vid].update(total_products=total, active_products=active or 0)
+
+    pending = await db.execute(
+        scoped(
+            select(OrderItem.vendor_id, func.count(func.distinct(OrderItem.order_id)))
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(Order.status == OrderStatus.PENDING),
+            OrderItem.vendor_id
+        ).group_by(OrderItem.vendor_id)
+    )
+    for vid, count in pending.all():
+        if vid in stats:
+            stats[vid]["pending_orders"] = count
+
+    # Per day in SQL (portable across dialects), folded into months here
+    day = func.date(Order.created_at)
+    sales = await db.execute(
+        scoped(
+            select(OrderItem.vendor_id, day, func.sum(OrderItem.price_at_purchase * OrderItem.quantity))
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(Order.status != OrderStatus.CANCELLED, Order.created_at.is_not(None)),
+            OrderItem.vendor_id
+        ).group_by(OrderItem.vendor_id, day)
+    )
+    monthly = defaultdict(float)
+    for vid, sale_day, amount in sales.all():
+        if vid in stats:
+            stats[vid]["earnings"] += amount or 0
+            monthly[(vid, str(sale_day)[:7])] += amount or 0
+
+    await db.execute(scoped(delete(VendorMonthlyRevenue), VendorMonthlyRevenue.vendor_id))
+    await db.execute(scoped(delete(VendorStats), VendorStats.vendor_id))
+    if stats:
+        await db.execute(insert(VendorStats), list(stats.values()))
+    if monthly:
+        await db.execute(insert(VendorMonthlyRevenue), [
+            {"vendor_id": vid, "month": month, "revenue": revenue}
+            for (vid, month), revenue in monthly.items()
+        ])
+    await db.commit()
+    return len(stats)
@@ -0,0 +1,47 @@
+"""
+Per-request cost of authenticating a bearer token.
+
+    python -m benchmarks.bench_auth
+
+Times the token step on its own (unverified claims, the old behaviour, vs a
+full signature check vs the verified-token LRU) and the p50 of an
+authenticated endpoint with the LRU off and on.
+"""
+import asyncio
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.token_verifier import TokenVerifier, token_verifier
+from jose import jwt
+from benchmarks.common import client, make_database, seed_products, summarize, timed
+
+REPEAT = 5000
+REQUESTS = 500
+
+
+def main():
+    token = create_access_token({"sub": "bench0@farm.com"})
+    uncached = TokenVerifier(settings.SECRET_KEY, settings.ALGORITHM, max_entries=0)
+    loop = asyncio.new_event_loop()
+
+    print(f"token step, {REPEAT} calls")
+    print(f"  unverified  {summarize(timed(lambda: jwt.get_unverified_claims(token), REPEAT))}")
+    print(f"  verified    {summarize(timed(lambda: loop.run_until_complete(uncached.verify(token)), REPEAT))}")
+    print(f"  cached      {summarize(timed(lambda: loop.run_until_complete(token_verifier.verify(token)), REPEAT))}")
+    loop.close()
+
+    _, Session = make_database()
+    seed_products(Session, 10, vendors=1)
+    http = client()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert http.get("/api/v1/vendor/me/profile", headers=headers).status_code == 200
+
+    print(f"GET /vendor/me/profile, {REQUESTS} requests")
+    for label, size in (("no LRU", 0), ("LRU", settings.VERIFIED_TOKEN_CACHE_SIZE)):
+        token_verifier.max_entries = size
+        token_verifier.clear()
+        samples = timed(lambda: http.get("/api/v1/vendor/me/profile", headers=headers), REQUESTS)
+        print(f"  {label:>8}  {summarize(samples)}")
+
+
+if __name__ == "__main__":
+    main()
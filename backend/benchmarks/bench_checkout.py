@@ -0,0 +1,40 @@
+"""
+Checkout latency and query count against cart size.
+
+    python -m benchmarks.bench_checkout
+
+Product lookups should stay O(1) queries as the basket grows.
+"""
+from benchmarks.common import make_database, seed_products, QueryCounter, timed, summarize, client
+
+CART_SIZES = [1, 5, 10, 20, 40]
+REPEAT = 30
+
+
+def main():
+    engine, Session = make_database()
+    product_ids = seed_products(Session, max(CART_SIZES), vendors=4)
+    http = client()
+
+    print(f"{'items':>5}  {'queries':>7}  {'selects':>7}  latency")
+    for size in CART_SIZES:
+        payload = {
+            "user_id": "ded8126b-6080-4595-bf89-40b38343e742",
+            "customer_name": "Bench Customer",
+            "customer_email": "bench@example.com",
+            "shipping_address": {"line1": "1 Bench Rd", "city": "Pune", "state": "MH", "pincode": "411001"},
+            "items": [{"product_id": pid, "quantity": 1, "price": 0} for pid in product_ids[:size]],
+        }
+
+        def place_order():
+            response = http.post("/api/v1/public/orders", json=payload)
+            assert response.status_code == 200, response.text
+
+        with QueryCounter(engine) as counter:
+            place_order()
+        samples = timed(place_order, REPEAT)
+        print(f"{size:>5}  {counter.count:>7}  {counter.matching('SELECT'):>7}  {summarize(samples)}")
+
+
+if __name__ == "__main__":
+    main()
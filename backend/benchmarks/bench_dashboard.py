@@ -0,0 +1,79 @@
+"""
+Admin dashboard latency and round trips per request.
+
+    python -m benchmarks.bench_dashboard
+
+The scalar metrics (revenue, orders, vendors, customers) should cost one
+statement regardless of data size, plus one for the sales trend. Measured
+with the analytics cache off, then again with it on.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.models.order import Order, OrderStatus
+from app.models.user import User
+from app.services.sales_rollup import rebuild_daily_sales
+from app.services.analytics_cache import analytics_cache
+from benchmarks.common import make_database, seed_products, QueryCounter, timed, summarize, client
+
+ORDERS = 20000
+CUSTOMERS = 2000
+DAYS = 365
+REPEAT = 200
+MAX_STATEMENTS = 2
+
+
+def seed_orders(Session):
+    async def _seed():
+        async with Session() as db:
+            await db.execute(insert(User), [
+                {"email": f"customer{i}@example.com", "hashed_password": "-", "role": "customer", "full_name": f"Customer {i}"}
+                for i in range(CUSTOMERS)
+            ])
+            now = datetime.utcnow()
+            await db.execute(insert(Order), [
+                {
+                    "id": uuid.uuid4(), "user_id": uuid.uuid4(), "customer_name": f"Customer {i % CUSTOMERS}",
+                    "customer_email": f"customer{i % CUSTOMERS}@example.com", "shipping_address": {},
+                    "total_amount": 100 + i % 400, "created_at": now - timedelta(days=i % DAYS, minutes=i),
+                    "status": OrderStatus.CANCELLED if i % 20 == 0 else OrderStatus.DELIVERED,
+                }
+                for i in range(ORDERS)
+            ])
+            await db.commit()
+            await rebuild_daily_sales(db)
+
+    asyncio.run(_seed())
+
+
+def main():
+    engine, Session = make_database()
+    seed_products(Session, 50, vendors=10)
+    seed_orders(Session)
+    http = client()
+
+    def load_dashboard():
+        response = http.get("/api/v1/analytics/dashboard")
+        assert response.status_code == 200, response.text
+
+    print(f"{ORDERS} orders over {DAYS} days, {CUSTOMERS} customers")
+    ttl = analytics_cache.ttl_seconds
+    for label, cache_ttl in (("uncached", 0), ("cached", ttl)):
+        analytics_cache.ttl_seconds = cache_ttl
+        analytics_cache.invalidate()
+        load_dashboard()  # Warm up
+        with QueryCounter(engine) as counter:
+            load_dashboard()
+        samples = timed(load_dashboard, REPEAT)
+        print(f"{label:>8}  statements/request {counter.count}   {summarize(samples)}")
+        if label == "uncached":
+            statements = counter.count
+
+    print(f"cache: {analytics_cache.stats()}")
+    if statements > MAX_STATEMENTS:
+        raise SystemExit(f"Regression: {statements} statements per dashboard load (budget {MAX_STATEMENTS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Login throughput during a burst, and what it does to a concurrent catalog reader.
+
+    python -m benchmarks.bench_login
+
+Logins and catalog reads share one event loop, like requests on a single
+uvicorn worker. Runs once with Argon2 on the event loop (the old inline
+behaviour) and once on the hashing pool; with the pool, catalog latency
+should stay near its idle value while logins are in flight.
+"""
+import asyncio
+import time
+import httpx
+from sqlalchemy import insert
+from app.main import app
+from app.core import security
+from app.models.user import User
+from benchmarks.common import make_database, seed_products, summarize
+
+USERS = 50
+LOGINS = 200
+LOGIN_CONCURRENCY = 16
+PASSWORD = "bench-password"
+
+
+class InlineHashing:
+    """The old behaviour: hash on the event loop thread."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+def seed_users(Session):
+    hashed = security.get_password_hash(PASSWORD)
+
+    async def _seed():
+        async with Session() as db:
+            await db.execute(insert(User), [
+                {"email": f"login{i}@example.com", "hashed_password": hashed, "role": "customer"}
+                for i in range(USERS)
+            ])
+            await db.commit()
+
+    asyncio.run(_seed())
+
+
+async def run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await http.get("/api/v1/public/products")  # Warm the catalog cache
+        counter = iter(range(LOGINS))
+        statuses = {}
+        catalog = []
+        done = asyncio.Event()
+
+        async def login_worker():
+            for n in counter:
+                response = await http.post("/api/v1/auth/login", data={
+                    "username": f"login{n % USERS}@example.com", "password": PASSWORD
+                })
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def catalog_reader():
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await http.get("/api/v1/public/products")
+                assert response.status_code == 200, response.text
+                catalog.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0)
+
+        reader = asyncio.create_task(catalog_reader())
+        start = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(LOGIN_CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await reader
+        return elapsed, statuses, catalog
+
+
+def main():
+    engine, Session = make_database()
+    seed_products(Session, 200, vendors=10)
+    seed_users(Session)
+
+    pool = security.hashing_pool
+    print(f"{LOGINS} logins from {LOGIN_CONCURRENCY} clients, pool of {pool.workers} threads (max {pool.max_pending} pending)")
+    for label, hashing in (("inline", InlineHashing()), ("pool", pool)):
+        security.hashing_pool = hashing
+        asyncio.run(engine.dispose())  # Fresh connection pool for this run's event loop
+        try:
+            elapsed, statuses, catalog = asyncio.run(run())
+        finally:
+            security.hashing_pool = pool
+        print(
+            f"{label:>6}  logins/s {LOGINS / elapsed:7.1f}   statuses {statuses}   "
+            f"catalog reads {len(catalog):>5}  {summarize(catalog)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Order placement throughput (orders/sec) under concurrent clients.
+
+    python -m benchmarks.bench_order_throughput
+
+Clients share one event loop, like requests on a single uvicorn worker,
+with the notification event bus running as it does in the app.
+Also reports statements and commits per order (including notification
+batches) and how long the bus took to drain after the last response.
+"""
+import asyncio
+import time
+import httpx
+from sqlalchemy import event
+from app.main import app
+from app.services.events import event_bus
+from benchmarks.common import make_database, seed_products, QueryCounter
+
+CONCURRENCY = [1, 4, 16]
+ORDERS_PER_RUN = 200
+ITEMS_PER_ORDER = 5
+
+
+def order_payload(product_ids, n):
+    # Spread carts over the catalog so orders touch several vendors
+    items = [product_ids[(n + i * 7) % len(product_ids)] for i in range(ITEMS_PER_ORDER)]
+    return {
+        "user_id": "ded8126b-6080-4595-bf89-40b38343e742",
+        "customer_name": f"Bench Customer {n}",
+        "customer_email": "bench@example.com",
+        "shipping_address": {"line1": "1 Bench Rd", "city": "Pune", "state": "MH", "pincode": "411001"},
+        "items": [{"product_id": pid, "quantity": 1, "price": 0} for pid in items],
+    }
+
+
+async def run(product_ids, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        counter = iter(range(ORDERS_PER_RUN))
+        failures = 0
+
+        async def worker():
+            nonlocal failures
+            for n in counter:
+                response = await http.post("/api/v1/public/orders", json=order_payload(product_ids, n))
+                if response.status_code != 200:
+                    failures += 1
+
+        await event_bus.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        drain_start = time.perf_counter()
+        await event_bus.stop()
+        return elapsed, time.perf_counter() - drain_start, failures
+
+
+def main():
+    engine, Session = make_database()
+    product_ids = seed_products(Session, 200, vendors=10, stock=1_000_000)
+
+    commits = 0
+
+    def on_commit(conn):
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine.sync_engine, "commit", on_commit)
+
+    print(f"{'clients':>7}  {'orders/s':>9}  {'stmts/order':>11}  {'commits/order':>13}  {'drain':>8}  failures")
+    for concurrency in CONCURRENCY:
+        commits = 0
+        with QueryCounter(engine) as queries:
+            elapsed, drain, failures = asyncio.run(run(product_ids, concurrency))
+        print(
+            f"{concurrency:>7}  {ORDERS_PER_RUN / elapsed:>9.1f}  "
+            f"{queries.count / ORDERS_PER_RUN:>11.1f}  {commits / ORDERS_PER_RUN:>13.1f}  "
+            f"{drain * 1000:>5.0f} ms  {failures}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Concurrent checkouts and catalog reads on SQLite, default settings vs the
+production profile (WAL, pragmas, serialized writes; SQLITE_PRODUCTION_MODE).
+
+    python -m benchmarks.bench_sqlite_concurrency
+
+Writers place orders while readers list products (catalog cache off, so
+every read hits the database), all on one event loop like a single uvicorn
+worker. Failed checkouts are counted by their error.
+"""
+import asyncio
+import time
+import httpx
+from app.main import app
+from app.services.catalog_cache import catalog_cache
+from benchmarks.bench_order_throughput import order_payload
+from benchmarks.common import make_database, seed_products, summarize
+
+WRITERS = 16
+READERS = [0, 8]
+ORDERS = 400
+
+
+async def run(product_ids, readers):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+        counter = iter(range(ORDERS))
+        failures = {}
+        reads = []
+        done = asyncio.Event()
+
+        async def writer():
+            for n in counter:
+                try:
+                    response = await http.post("/api/v1/public/orders", json=order_payload(product_ids, n))
+                    error = None if response.status_code == 200 else f"{response.status_code} {response.json().get('detail', '')[:40]}"
+                except Exception as exc:
+                    error = str(exc).splitlines()[0][:60]
+                if error:
+                    failures[error] = failures.get(error, 0) + 1
+
+        async def reader():
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await http.get("/api/v1/public/products")
+                assert response.status_code == 200, response.text
+                reads.append((time.perf_counter() - start) * 1000)
+
+        readers = [asyncio.create_task(reader()) for _ in range(readers)]
+        start = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(WRITERS)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*readers)
+        return elapsed, failures, reads
+
+
+def main():
+    ttl, catalog_cache.ttl_seconds = catalog_cache.ttl_seconds, 0
+    print(f"{ORDERS} orders from {WRITERS} writers")
+    try:
+        for readers in READERS:
+            print(f"with {readers} catalog readers")
+            for label, profile in (("default", False), ("production", True)):
+                engine, Session = make_database(sqlite_profile=profile)
+                product_ids = seed_products(Session, 200, vendors=10, stock=1_000_000)
+                elapsed, failures, reads = asyncio.run(run(product_ids, readers))
+                asyncio.run(engine.dispose())
+                print(f"{label:>12}  orders/s {ORDERS / elapsed:6.1f}   failed {sum(failures.values()):>3} {failures or ''}")
+                if reads:
+                    print(f"{'':>12}  reads {len(reads):>5}  {summarize(reads)}")
+    finally:
+        catalog_cache.ttl_seconds = ttl
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Shared setup for the benchmark scripts.
+
+Each benchmark runs the real FastAPI app against a throwaway SQLite file,
+so numbers are comparable between runs and nextgen.db is never touched.
+Run from the backend directory, e.g. `python -m benchmarks.bench_checkout`.
+"""
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.database import get_session_factory, use_sqlite_profile, SerializedWriteSession
+from app.models.base import Base
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.models.product import Product
+from app.services.events import event_bus
+
+
+def make_database(sqlite_profile: bool = False, **engine_kwargs):
+    """
+    Create a temp SQLite database with all tables and route `get_db`, the event bus and the analytics cache to it.
+    `sqlite_profile` applies the production pragmas and serialized writes (SQLITE_PRODUCTION_MODE).
+    """
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", **engine_kwargs)
+    if sqlite_profile:
+        use_sqlite_profile(engine)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    Session = sessionmaker(
+        bind=engine, class_=SerializedWriteSession if sqlite_profile else AsyncSession,
+        expire_on_commit=False, autoflush=False
+    )
+
+    app.dependency_overrides[get_session_factory] = lambda: Session
+    event_bus.session_factory = Session
+    return engine, Session
+
+
+def seed_products(Session, count: int, vendors: int = 1, stock: int = 1000) -> list:
+    """Insert `vendors` approved vendors with `count` products spread across them."""
+    async def _seed():
+        async with Session() as db:
+            vendor_rows = [
+                Vendor(
+                    business_name=f"Bench Farm {v}", contact_email=f"bench{v}@farm.com", phone_number=str(v),
+                    address_line="1 Bench Rd", city="Pune", state="MH", pincode="411001",
+                    seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+                )
+                for v in range(vendors)
+            ]
+            db.add_all(vendor_rows)
+            await db.flush()
+            products = [
+                Product(
+                    vendor_id=vendor_rows[i % vendors].id, name=f"Bench Product {i}", slug=f"bench-product-{i}",
+                    price=10 + i % 50, stock_quantity=stock
+                )
+                for i in range(count)
+            ]
+            db.add_all(products)
+            await db.commit()
+            return [str(p.id) for p in products]
+
+    return asyncio.run(_seed())
+
+
+class QueryCounter:
+    """Records SQL statements sent to the engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def matching(self, verb: str) -> int:
+        return sum(1 for s in self.statements if s.lstrip().upper().startswith(verb))
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed(fn, repeat: int) -> list:
+    """Call `fn` `repeat` times and return per-call latencies in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    return (
+        f"p50 {statistics.median(samples):7.2f} ms   "
+        f"p99 {percentile(samples, 99):7.2f} ms"
+    )
+
+
+def client() -> TestClient:
+    return TestClient(app)
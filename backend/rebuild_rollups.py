@@ -0,0 +1,41 @@
+import asyncio
+import sys
+import os
+
+# Add current dir to path to import app modules
+sys.path.append(os.getcwd())
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.base import Base
+import app.models  # Registers every table with Base
+from app.services.sales_rollup import rebuild_daily_sales
+from app.services.vendor_stats import reconcile_vendor_stats
+from app.services.customer_stats import rebuild_customer_stats
+from app.services.unread_counters import recount_unread
+
+async def rebuild():
+    """
+    Re-derive the pre-aggregated read models (dashboards, customers, unread badges) from
+    their source tables, e.g. to correct drift. Not needed after a deploy: the server
+    builds read models it has never built at startup (app/services/read_models.py).
+    """
+    print("📊 Rebuilding read models...")
+
+    # Ensure tables exist
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        days = await rebuild_daily_sales(db)
+        print(f"daily_sales_rollup: {days} days")
+        vendors = await reconcile_vendor_stats(db)
+        print(f"vendor_stats: {vendors} vendors")
+        customers = await rebuild_customer_stats(db)
+        print(f"customer_stats: {customers} customers")
+        recipients = await recount_unread(db)
+        print(f"unread_counters: {recipients} recipients")
+
+    print("✅ Rollups rebuilt!")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -17,7 +17,7 @@ from app.models.vendor import Vendor, VendorStatus, SellerCategory
 from app.models.product import Product, ProductType, ProductApprovalStatus
 from app.models.category import Category
 from app.models.order import Order, OrderItem
-from app.core.security import get_password_hash
+from app.core.security import hash_password
 from sqlalchemy import select, delete
 
 # ===================== DEMO DATA =====================
@@ -155,7 +155,7 @@ async def clean_and_seed():
         print("\n1️⃣  Creating Admin User...")
         admin = User(
             email="admin@nextgen.com",
-            hashed_password=get_password_hash("admin"),
+            hashed_password=await hash_password("admin"),
             full_name="Super Admin",
             role="admin",
             is_active=True,
@@ -189,7 +189,7 @@ async def clean_and_seed():
             # Create User for Vendor
             user = User(
                 email=v_data["email"],
-                hashed_password=get_password_hash(v_data["password"]),
+                hashed_password=await hash_password(v_data["password"]),
                 full_name=v_data["business_name"] + " Owner",
                 role="vendor",
                 is_active=True
@@ -9,7 +9,7 @@ from app.core.database import AsyncSessionLocal, engine
 from app.models.base import Base
 from app.models.user import User
 from app.models.vendor import Vendor, VendorStatus
-from app.core.security import get_password_hash
+from app.core.security import hash_password
 from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
 
@@ -29,7 +29,7 @@ async def seed():
             print(f"Creating Admin: {admin_email}")
             admin = User(
                 email=admin_email,
-                hashed_password=get_password_hash("admin"),
+                hashed_password=await hash_password("admin"),
                 full_name="Super Admin",
                 role="admin",
                 is_active=True,
@@ -46,7 +46,7 @@ async def seed():
             print(f"Creating Vendor User: {vendor_email}")
             vendor_user = User(
                 email=vendor_email,
-                hashed_password=get_password_hash("farm"),
+                hashed_password=await hash_password("farm"),
                 full_name="Green Valley Owner",
                 role="vendor",
                 is_active=True
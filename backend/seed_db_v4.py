@@ -12,7 +12,7 @@ from app.core.database import AsyncSessionLocal, engine
 from app.models.base import Base
 from app.models.user import User
 from app.models.vendor import Vendor, VendorStatus, SellerCategory
-from app.core.security import get_password_hash  # Use the app's own hashing!
+from app.core.security import hash_password  # Use the app's own hashing!
 from sqlalchemy import select
 
 async def seed():
@@ -31,12 +31,12 @@ async def seed():
         
         if existing:
             print(f"⚠️  Admin exists. Updating password...")
-            existing.hashed_password = get_password_hash("admin")
+            existing.hashed_password = await hash_password("admin")
         else:
             print(f"✨ Creating Admin: {admin_email}")
             admin = User(
                 email=admin_email,
-                hashed_password=get_password_hash("admin"),
+                hashed_password=await hash_password("admin"),
                 full_name="Super Admin",
                 role="admin",
                 is_active=True,
@@ -51,12 +51,12 @@ async def seed():
         
         if existing_vendor:
             print(f"⚠️  Vendor user exists. Updating password...")
-            existing_vendor.hashed_password = get_password_hash("farm")
+            existing_vendor.hashed_password = await hash_password("farm")
         else:
             print(f"✨ Creating Vendor User: {vendor_email}")
             vendor_user = User(
                 email=vendor_email,
-                hashed_password=get_password_hash("farm"),
+                hashed_password=await hash_password("farm"),
                 full_name="Green Valley Owner",
                 role="vendor",
                 is_active=True
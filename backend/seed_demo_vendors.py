@@ -16,7 +16,7 @@ from app.models.user import User
 from app.models.vendor import Vendor, VendorStatus, SellerCategory
 from app.models.product import Product, ProductType, ProductApprovalStatus
 from app.models.category import Category
-from app.core.security import get_password_hash
+from app.core.security import hash_password
 from sqlalchemy import select
 
 # ===================== DEMO DATA =====================
@@ -193,12 +193,12 @@ async def seed():
         result = await db.execute(select(User).where(User.email == admin_email))
         admin = result.scalars().first()
         if admin:
-            admin.hashed_password = get_password_hash("admin")
+            admin.hashed_password = await hash_password("admin")
             print(f"   ✅ Admin updated: {admin_email}")
         else:
             admin = User(
                 email=admin_email,
-                hashed_password=get_password_hash("admin"),
+                hashed_password=await hash_password("admin"),
                 full_name="Super Admin",
                 role="admin",
                 is_active=True,
@@ -251,11 +251,11 @@ async def seed():
             result = await db.execute(select(User).where(User.email == v_data["email"]))
             user = result.scalars().first()
             if user:
-                user.hashed_password = get_password_hash(v_data["password"])
+                user.hashed_password = await hash_password(v_data["password"])
             else:
                 user = User(
                     email=v_data["email"],
-                    hashed_password=get_password_hash(v_data["password"]),
+                    hashed_password=await hash_password(v_data["password"]),
                     full_name=v_data["business_name"] + " Owner",
                     role="vendor",
                     is_active=True
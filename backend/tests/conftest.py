@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.main import app
+from app.core.database import get_session_factory, AsyncSessionLocal
+from app.models.base import Base
+from app.services.catalog_cache import catalog_cache
+from app.services.events import event_bus
+from app.services.analytics_cache import analytics_cache
+from app.services.identity_cache import identity_cache
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Fresh SQLite database per test, wired into the app in place of nextgen.db.
+    Yields the session factory so tests can seed rows directly.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+
+    TestSession = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    # get_db and the analytics cache take their sessions from this factory
+    app.dependency_overrides[get_session_factory] = lambda: TestSession
+    event_bus.session_factory = TestSession
+    # Process-wide caches must not leak rows between test databases
+    catalog_cache.invalidate()
+    analytics_cache.invalidate()
+    identity_cache.invalidate()
+    # Tests read analytics right after writing; test_analytics_cache turns the cache on itself
+    analytics_ttl, analytics_cache.ttl_seconds = analytics_cache.ttl_seconds, 0
+    yield TestSession
+    app.dependency_overrides.pop(get_session_factory, None)
+    event_bus.session_factory = AsyncSessionLocal
+    analytics_cache.ttl_seconds = analytics_ttl
+    asyncio.run(engine.dispose())
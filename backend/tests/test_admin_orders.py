@@ -0,0 +1,78 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.order import Order, OrderItem, OrderStatus
+from datetime import datetime, timedelta
+import asyncio
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+
+def seed_orders(session_factory):
+    """Seven orders; three share one timestamp to exercise the id tie-breaker."""
+    base = datetime(2026, 3, 1, 12, 0, 0)
+    stamps = [base, base, base, base - timedelta(days=1), base - timedelta(days=2), base - timedelta(days=3), base + timedelta(days=1)]
+
+    async def _seed():
+        async with session_factory() as db:
+            for i, stamp in enumerate(stamps):
+                order = Order(
+                    user_id=uuid.uuid4(), customer_name=f"Customer {i}",
+                    customer_email="repeat@example.com" if i % 2 else f"c{i}@example.com",
+                    shipping_address={}, total_amount=100 + i, created_at=stamp,
+                    status=OrderStatus.CANCELLED if i == 3 else OrderStatus.PENDING
+                )
+                db.add(order)
+                await db.flush()
+                db.add_all([
+                    OrderItem(order_id=order.id, quantity=1, price_at_purchase=1)
+                    for _ in range(i + 1)
+                ])
+            await db.commit()
+
+    asyncio.run(_seed())
+
+
+def fetch_all(path, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, limit=3)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get(path, params=query, headers=ADMIN)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+def test_admin_orders_keyset_pages_with_ties(session_factory):
+    seed_orders(session_factory)
+
+    for path in ("/api/v1/orders/", "/api/v1/admin/orders"):
+        pages = fetch_all(path)
+        orders = [o for page in pages for o in page]
+
+        assert all(len(page) <= 3 for page in pages)
+        assert len(orders) == 7
+        assert len({o["id"] for o in orders}) == 7
+        assert [o["date"] for o in orders] == sorted((o["date"] for o in orders), reverse=True)
+        # items_count comes from the COUNT subquery
+        assert {o["customer_name"]: o["items_count"] for o in orders}["Customer 4"] == 5
+
+
+def test_admin_orders_filters(session_factory):
+    seed_orders(session_factory)
+
+    cancelled = client.get("/api/v1/orders/", params={"status": "CANCELLED"}, headers=ADMIN).json()
+    assert [o["customer_name"] for o in cancelled] == ["Customer 3"]
+
+    by_email = client.get("/api/v1/orders/", params={"customer_email": "repeat@example.com"}, headers=ADMIN).json()
+    assert {o["customer_name"] for o in by_email} == {"Customer 1", "Customer 3", "Customer 5"}
+
+    in_range = client.get("/api/v1/orders/", params={
+        "date_from": "2026-02-27T00:00:00", "date_to": "2026-03-01T00:00:00"
+    }, headers=ADMIN).json()
+    assert {o["customer_name"] for o in in_range} == {"Customer 4", "Customer 3"}
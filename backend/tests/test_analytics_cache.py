@@ -0,0 +1,129 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.product import Product
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.analytics_cache import AnalyticsCache, analytics_cache
+import asyncio
+import pytest
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+
+def make_cache(**kwargs):
+    options = dict(ttl_seconds=60, stale_seconds=60, max_entries=100)
+    options.update(kwargs)
+    return AnalyticsCache(**options)
+
+
+def slow_counter():
+    calls = []
+
+    async def compute(db):
+        calls.append(db)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    return calls, compute
+
+
+def test_concurrent_misses_share_one_computation(session_factory):
+    cache = make_cache()
+    calls, compute = slow_counter()
+
+    async def scenario():
+        results = await asyncio.gather(*[cache.get(("admin", "dashboard"), compute, session_factory) for _ in range(20)])
+        again = await cache.get(("admin", "dashboard"), compute, session_factory)
+        other = await cache.get(("vendor", 1, "dashboard"), compute, session_factory)
+        return results, again, other
+
+    results, again, other = asyncio.run(scenario())
+    assert results == [1] * 20
+    assert again == 1
+    assert other == 2  # Different scope, separate entry
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 21
+
+
+def test_stale_entries_are_served_while_refreshing(session_factory):
+    cache = make_cache(ttl_seconds=0.01, stale_seconds=60)
+    calls, compute = slow_counter()
+
+    async def scenario():
+        first = await cache.get("key", compute, session_factory)
+        await asyncio.sleep(0.02)
+        # Expired but within the stale window: old value now, one refresh in the background
+        stale = await asyncio.gather(*[cache.get("key", compute, session_factory) for _ in range(5)])
+        await asyncio.sleep(0.1)
+        refreshed = cache._entries["key"][1]
+        return first, stale, refreshed
+
+    first, stale, refreshed = asyncio.run(scenario())
+    assert first == 1
+    assert stale == [1] * 5
+    assert refreshed == 2
+    assert len(calls) == 2
+    assert cache.stats()["stale_hits"] == 5
+
+
+def test_failures_are_not_cached(session_factory):
+    cache = make_cache()
+    attempts = []
+
+    async def flaky(db):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database went away")
+        return "ok"
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await cache.get("key", flaky, session_factory)
+        return await cache.get("key", flaky, session_factory)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert cache.stats()["errors"] == 1
+
+
+def test_dashboard_is_served_from_cache(session_factory):
+    analytics_cache.ttl_seconds = 60
+
+    first = client.get("/api/v1/analytics/dashboard").json()
+    second = client.get("/api/v1/analytics/dashboard").json()
+    client.get("/api/v1/analytics/sales", params={"granularity": "month"}, headers=ADMIN)
+
+    assert first == second
+    stats = client.get("/api/v1/analytics/cache", headers=ADMIN).json()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert client.get("/api/v1/analytics/cache").status_code == 401
+
+
+def test_cached_analytics_read_the_request_database(session_factory):
+    async def seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Cache Farm", contact_email="cache@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            product = Product(vendor_id=vendor.id, name="Beans", slug="beans", price=15, stock_quantity=10)
+            db.add(product)
+            await db.commit()
+            return str(product.id)
+
+    product_id = asyncio.run(seed())
+    client.post("/api/v1/public/orders", json={
+        "user_id": str(uuid.uuid4()), "customer_name": "Cache Customer", "customer_email": "cache@example.com",
+        "shipping_address": {}, "items": [{"product_id": product_id, "quantity": 2, "price": 0}],
+    })
+    analytics_cache.ttl_seconds = 60
+
+    # Computed through the overridden get_session_factory, i.e. from this test's database
+    hits = analytics_cache.stats()["hits"]
+    assert client.get("/api/v1/analytics/dashboard").json()["revenue"] == 30
+    assert client.get("/api/v1/analytics/dashboard").json()["revenue"] == 30
+    assert analytics_cache.stats()["hits"] == hits + 1
@@ -0,0 +1,70 @@
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import HashingPool, hashing_pool
+import asyncio
+import threading
+
+client = TestClient(app)
+
+
+def signup_and_login(password):
+    client.post("/api/v1/auth/signup", json={"email": "shopper@example.com", "password": "s3cret!", "full_name": "Shopper"})
+    return client.post("/api/v1/auth/login", data={"username": "shopper@example.com", "password": password})
+
+
+def test_signup_and_login_hash_off_the_event_loop(session_factory):
+    pool_threads = set()
+
+    def record_thread(fn):
+        def wrapper(*args):
+            pool_threads.add(threading.current_thread().name)
+            return fn(*args)
+        return wrapper
+
+    run = hashing_pool.run
+    hashing_pool.run = lambda fn, *args: run(record_thread(fn), *args)
+    try:
+        response = signup_and_login("s3cret!")
+        assert response.status_code == 200, response.text
+        assert response.json()["token_type"] == "bearer"
+        assert client.post("/api/v1/auth/login", data={"username": "shopper@example.com", "password": "wrong"}).status_code == 401
+    finally:
+        hashing_pool.run = run
+
+    # Hashed and verified on the pool's threads, not the thread running the event loop
+    assert pool_threads and all(name.startswith("password-hash") for name in pool_threads)
+
+
+def test_saturated_pool_answers_429(session_factory):
+    client.post("/api/v1/auth/signup", json={"email": "busy@example.com", "password": "pw"})
+    max_pending = hashing_pool.max_pending
+    hashing_pool.max_pending = 0
+    try:
+        response = client.post("/api/v1/auth/login", data={"username": "nobody@example.com", "password": "x"})
+        # Unknown users never reach the pool
+        assert response.status_code == 401
+        response = client.post("/api/v1/auth/login", data={"username": "busy@example.com", "password": "pw"})
+    finally:
+        hashing_pool.max_pending = max_pending
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_pool_bounds_pending_calls():
+    async def scenario():
+        pool = HashingPool(workers=1, max_pending=2)
+        release = threading.Event()
+        slow = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        try:
+            await pool.run(len, "x")
+            assert False, "expected a 429"
+        except HTTPException as exc:
+            assert exc.status_code == 429
+        release.set()
+        assert await asyncio.gather(*slow) == [True, True]
+        assert (pool.pending, pool.rejected) == (0, 1)
+        assert await pool.run(len, "x") == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,131 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.customer_stats import CustomerStats
+from app.models.product import Product
+from app.models.user import User
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.customer_stats import rebuild_customer_stats
+from sqlalchemy import event
+from sqlalchemy.future import select
+import asyncio
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+
+def seed(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Directory Farm", contact_email="directory@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            product = Product(vendor_id=vendor.id, name="Kale", slug="kale", price=10, stock_quantity=1000)
+            db.add_all([
+                product,
+                User(email="ravi@example.com", hashed_password="-", full_name="Ravi Kumar", phone_number="+91 98765", role="customer"),
+                User(email="Sneha@Example.com", hashed_password="-", full_name="Sneha Rao", phone_number="+91 91234", role="customer"),
+            ])
+            await db.commit()
+            return str(product.id)
+
+    return asyncio.run(_seed())
+
+
+def place_order(product_id, email, name, quantity):
+    response = client.post("/api/v1/public/orders", json={
+        "user_id": str(uuid.uuid4()), "customer_name": name, "customer_email": email,
+        "shipping_address": {}, "items": [{"product_id": product_id, "quantity": quantity, "price": 0}],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def fetch_all(**params):
+    customers, cursor = [], None
+    while True:
+        query = dict(params, limit=2)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/v1/customers/", params=query, headers=ADMIN)
+        assert response.status_code == 200, response.text
+        assert len(response.json()) <= 2
+        customers += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return customers
+
+
+def test_customer_directory_from_order_summaries(session_factory):
+    product_id = seed(session_factory)
+    place_order(product_id, "ravi@example.com", "Ravi", 3)      # 30
+    place_order(product_id, "Ravi@Example.com ", "Ravi K", 2)   # 20, same customer
+    place_order(product_id, "sneha@example.com", "Sneha", 5)    # 50
+    cancelled = place_order(product_id, "amit@example.com", "Amit", 9)
+    place_order(product_id, "amit@example.com", "Amit", 1)      # 10
+    place_order(product_id, "guest@example.com", "Guest", 4)    # 40
+    client.put(f"/api/v1/orders/{cancelled}/status", json={"status": "CANCELLED"}, headers=ADMIN)
+
+    by_spend = fetch_all(sort="spend")
+    assert [(c["email"], c["orders"], c["total_spent"]) for c in by_spend] == [
+        ("sneha@example.com", 1, 50.0),
+        ("ravi@example.com", 2, 50.0),
+        ("guest@example.com", 1, 40.0),
+        ("amit@example.com", 2, 10.0),
+    ]
+    ravi = by_spend[1]
+    assert (ravi["name"], ravi["phone"], ravi["spent"], ravi["status"]) == ("Ravi Kumar", "+91 98765", "₹50", "Active")
+    assert ravi["user_id"] is not None
+    assert by_spend[2]["name"] == "Guest"
+    # Matched to the account even though it was registered with different case
+    assert (by_spend[0]["name"], by_spend[0]["phone"]) == ("Sneha Rao", "+91 91234")
+
+    by_recent = fetch_all()
+    assert [c["email"] for c in by_recent] == [
+        "guest@example.com", "amit@example.com", "sneha@example.com", "ravi@example.com"
+    ]
+
+    assert client.get("/api/v1/customers/").status_code == 401
+    assert client.get("/api/v1/customers/", params={"cursor": "nope"}, headers=ADMIN).status_code == 400
+
+
+def test_directory_pages_do_not_scan_orders(session_factory):
+    product_id = seed(session_factory)
+    place_order(product_id, "ravi@example.com", "Ravi", 1)
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        client.get("/api/v1/customers/", params={"sort": "spend"}, headers=ADMIN)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 1
+    assert "orders" not in statements[0]
+
+
+def test_rebuild_matches_incremental_summaries(session_factory):
+    product_id = seed(session_factory)
+    for email, quantity in [("a@example.com", 1), ("A@example.com", 2), ("b@example.com", 3)]:
+        place_order(product_id, email, email.split("@")[0], quantity)
+
+    async def snapshot():
+        async with session_factory() as db:
+            result = await db.execute(select(CustomerStats).order_by(CustomerStats.customer_email))
+            return [(s.customer_email, s.order_count, s.total_spent, s.last_order_at) for s in result.scalars().all()]
+
+    async def rebuild():
+        async with session_factory() as db:
+            return await rebuild_customer_stats(db)
+
+    incremental = asyncio.run(snapshot())
+    assert asyncio.run(rebuild()) == 2
+    assert asyncio.run(snapshot()) == incremental
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.core.database import engine_options, pool_status
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+import app.main as main
+
+client = TestClient(app)
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DATABASE_STATEMENT_TIMEOUT_MS", 5000)
+
+    postgres = engine_options("postgresql+asyncpg://user:pw@db:5432/nextgen_db")
+    assert postgres["pool_size"] == 20 and postgres["echo"] is False
+    assert postgres["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    # statement_timeout is a Postgres setting
+    assert "connect_args" not in engine_options("sqlite+aiosqlite:///./nextgen.db")
+    monkeypatch.setattr(settings, "DATABASE_STATEMENT_TIMEOUT_MS", 0)
+    assert "connect_args" not in engine_options("postgresql+asyncpg://user:pw@db:5432/nextgen_db")
+
+
+def test_engine_options_skip_queue_sizing_for_in_memory_sqlite():
+    assert engine_options("sqlite+aiosqlite:///./nextgen.db")["pool_size"] == settings.DATABASE_POOL_SIZE
+
+    # In-memory SQLite uses a StaticPool, which rejects pool_size / max_overflow / pool_timeout
+    url = "sqlite+aiosqlite:///:memory:"
+    options = engine_options(url)
+    assert not {"pool_size", "max_overflow", "pool_timeout"} & options.keys()
+    engine = create_async_engine(url, **options)
+    assert isinstance(engine.pool, StaticPool)
+    assert pool_status(engine) == {"class": "StaticPool"}
+
+
+def test_ready_reports_pool_usage(monkeypatch):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    pool = response.json()["pool"]
+    assert pool["size"] == settings.DATABASE_POOL_SIZE
+    assert pool["checked_out"] == 0 and pool["checked_in"] >= 1
+
+    async def unreachable():
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(main, "ping", unreachable)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
@@ -0,0 +1,121 @@
+from app.services.events import EventBus
+from app.services.order_events import OrderPlaced, write_order_notifications
+from app.models.notification import Notification
+from app.models.admin_notification import AdminNotification
+from app.models.failed_event import FailedEvent
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from sqlalchemy import func
+from sqlalchemy.future import select
+import asyncio
+import pytest
+import uuid
+
+
+def make_bus(session_factory, **kwargs):
+    options = dict(workers=1, queue_size=10, batch_size=100, drain_timeout=5)
+    options.update(kwargs)
+    bus = EventBus(**options)
+    bus.session_factory = session_factory
+    return bus
+
+
+def test_event_bus_batches_and_drains_on_stop(session_factory):
+    async def scenario():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Event Farm", contact_email="events@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.commit()
+
+        bus = make_bus(session_factory)
+        batches = []
+
+        async def record_batch(db, events):
+            batches.append(len(events))
+            await write_order_notifications(db, events)
+
+        bus.subscribe(OrderPlaced, record_batch)
+        await bus.start()
+        for i in range(5):
+            await bus.publish(OrderPlaced(order_id=uuid.uuid4(), customer_name=f"C{i}", total_amount=10, vendor_ids=[vendor.id]))
+        await bus.stop()
+
+        async with session_factory() as db:
+            admin = (await db.execute(select(func.count()).select_from(AdminNotification))).scalar()
+            vendor_notes = (await db.execute(select(func.count()).select_from(Notification))).scalar()
+        return batches, admin, vendor_notes
+
+    batches, admin, vendor_notes = asyncio.run(scenario())
+    # Published without yielding, so the worker picks all five up as one batch
+    assert batches == [5]
+    assert admin == 5
+    assert vendor_notes == 5
+
+
+def test_event_bus_applies_backpressure_when_full(session_factory):
+    async def scenario():
+        bus = make_bus(session_factory, queue_size=2, batch_size=1)
+        gate = asyncio.Event()
+        handled = []
+
+        async def slow_handler(db, events):
+            await gate.wait()
+            handled.extend(events)
+
+        bus.subscribe(str, slow_handler)
+        await bus.start()
+
+        await bus.publish("first")
+        await asyncio.sleep(0)  # Worker takes it and blocks in the handler
+        await bus.publish("second")
+        await bus.publish("third")  # Queue is now full
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(bus.publish("fourth"), 0.05)
+
+        gate.set()
+        await bus.stop()
+        return handled
+
+    assert asyncio.run(scenario()) == ["first", "second", "third"]
+
+
+def test_event_bus_replays_failed_batch_and_dead_letters_bad_event(session_factory):
+    async def scenario():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Replay Farm", contact_email="replay@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.commit()
+
+        bus = make_bus(session_factory)
+
+        async def fragile_handler(db, events):
+            await write_order_notifications(db, events)
+            if any(e.customer_name == "Bad" for e in events):
+                raise ValueError("cannot notify")
+
+        bus.subscribe(OrderPlaced, fragile_handler)
+        await bus.start()
+        for name in ("Good 1", "Bad", "Good 2"):
+            await bus.publish(OrderPlaced(order_id=uuid.uuid4(), customer_name=name, total_amount=10, vendor_ids=[vendor.id]))
+        await bus.stop()
+
+        async with session_factory() as db:
+            messages = (await db.execute(select(AdminNotification.message))).scalars().all()
+            failed = (await db.execute(select(FailedEvent))).scalars().all()
+        return messages, failed
+
+    messages, failed = asyncio.run(scenario())
+    # The failed batch was rolled back and replayed; only the bad event is missing
+    assert sorted(m.split(" placed by ")[1].split(" for ")[0] for m in messages) == ["Good 1", "Good 2"]
+    assert len(failed) == 1
+    assert failed[0].event_type == "OrderPlaced"
+    assert failed[0].payload["customer_name"] == "Bad"
+    assert "cannot notify" in failed[0].error
@@ -0,0 +1,101 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import create_access_token
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.identity_cache import identity_cache
+from sqlalchemy import event
+import asyncio
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+VENDOR = {"Authorization": f"Bearer {create_access_token({'sub': 'cached@farm.com'})}"}
+
+
+def seed_vendor(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Cached Farm", contact_email="cached@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.commit()
+            return vendor.id
+
+    return asyncio.run(_seed())
+
+
+class Statements:
+    def __init__(self, session_factory):
+        self.engine = session_factory.kw["bind"].sync_engine
+        self.captured = []
+
+    def capture(self, conn, cursor, statement, parameters, context, executemany):
+        self.captured.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.capture)
+        return self.captured
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.capture)
+
+
+def test_warm_cache_skips_identity_queries(session_factory):
+    seed_vendor(session_factory)
+
+    with Statements(session_factory) as cold:
+        assert client.get("/api/v1/vendor/me/profile", headers=VENDOR).status_code == 200
+    with Statements(session_factory) as warm:
+        assert client.get("/api/v1/vendor/me/profile", headers=VENDOR).status_code == 200
+
+    assert len(cold) == 1 and "JOIN vendors" in cold[0]  # User and vendor together
+    assert warm == []
+    assert identity_cache.stats()["hits"] >= 1
+
+    # Endpoints that read data pay only for their own queries
+    with Statements(session_factory) as statements:
+        client.get("/api/v1/notifications/unread-count", headers=VENDOR)
+    assert not [s for s in statements if "FROM users" in s or "FROM vendors" in s]
+
+
+def test_vendor_state_changes_take_effect_immediately(session_factory):
+    vendor_id = seed_vendor(session_factory)
+    assert client.get("/api/v1/vendor/me/profile", headers=VENDOR).status_code == 200
+
+    client.post(f"/api/v1/admin/vendors/{vendor_id}/suspend", headers=ADMIN)
+    response = client.get("/api/v1/vendor/me/profile", headers=VENDOR)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Vendor account is not approved yet"
+
+    client.post(f"/api/v1/admin/vendors/{vendor_id}/reactivate", headers=ADMIN)
+    assert client.get("/api/v1/vendor/me/profile", headers=VENDOR).status_code == 200
+
+    # Profile edits write the row, not the cached copy, and refresh the cache
+    response = client.patch("/api/v1/vendor/me/profile", params={"phone_number": "999"}, headers=VENDOR)
+    assert response.status_code == 200
+
+    async def phone():
+        async with session_factory() as db:
+            return (await db.get(Vendor, vendor_id)).phone_number
+
+    assert asyncio.run(phone()) == "999"
+    misses = identity_cache.stats()["misses"]
+    client.get("/api/v1/vendor/me/profile", headers=VENDOR)
+    assert identity_cache.stats()["misses"] == misses + 1
+
+    client.delete(f"/api/v1/admin/vendors/{vendor_id}", headers=ADMIN)
+    response = client.get("/api/v1/vendor/me/profile", headers=VENDOR)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Vendor profile not found"
+
+
+def test_signup_replaces_a_cached_missing_user(session_factory):
+    token = {"Authorization": f"Bearer {create_access_token({'sub': 'late@example.com'})}"}
+    inbox = "/api/v1/admin/notifications/received/unread-count"
+    assert client.get(inbox, headers=token).status_code == 403  # No user row yet: cached as such
+
+    response = client.post("/api/v1/auth/signup", json={"email": "late@example.com", "password": "pw", "role": "admin"})
+    assert response.status_code == 200, response.text
+    assert client.get(inbox, headers=token).status_code == 200
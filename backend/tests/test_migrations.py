@@ -0,0 +1,78 @@
+import importlib.util
+import uuid
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+VERSIONS = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def load_revision(name):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_order_items_product_id_becomes_uuid(tmp_path):
+    migration = load_revision("3d9a61f0b2c4_order_items_product_id_uuid")
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    product_id = uuid.uuid4().hex
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE products (id UUID PRIMARY KEY)")
+        conn.exec_driver_sql(
+            "CREATE TABLE order_items (id INTEGER NOT NULL, order_id UUID, product_id INTEGER, "
+            "vendor_id UUID, quantity INTEGER NOT NULL, PRIMARY KEY (id), "
+            "FOREIGN KEY(product_id) REFERENCES products (id))"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_order_items_id ON order_items (id)")
+        conn.exec_driver_sql(f"INSERT INTO products VALUES ('{product_id}')")
+        conn.exec_driver_sql(
+            "INSERT INTO order_items (id, order_id, product_id, vendor_id, quantity) VALUES "
+            f"(1, 'aa11', 7, 'bb22', 1), (2, 'cc33', '{product_id}', 'dd44', 2)"
+        )
+
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+            # A second run is a no-op once the column is a UUID
+            migration.upgrade()
+
+        rows = conn.exec_driver_sql("SELECT id, order_id, product_id, vendor_id FROM order_items ORDER BY id").all()
+        assert rows == [(1, "aa11", None, "bb22"), (2, "cc33", product_id, "dd44")]
+
+        ddl = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'order_items'").scalar()
+        assert "order_id UUID" in ddl and "product_id UUID" in ddl and "vendor_id UUID" in ddl
+        inspector = sa.inspect(conn)
+        assert [fk["referred_table"] for fk in inspector.get_foreign_keys("order_items")] == ["products"]
+        assert [ix["name"] for ix in inspector.get_indexes("order_items")] == ["ix_order_items_id"]
+
+
+def test_products_stock_quantity_backfilled_and_not_null(tmp_path):
+    migration = load_revision("9b4e27c1a6d8_products_stock_quantity_not_null")
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE vendors (id UUID PRIMARY KEY)")
+        conn.exec_driver_sql(
+            "CREATE TABLE products (id UUID NOT NULL, vendor_id UUID NOT NULL, stock_quantity INTEGER, "
+            "PRIMARY KEY (id), FOREIGN KEY(vendor_id) REFERENCES vendors (id))"
+        )
+        conn.exec_driver_sql("INSERT INTO products VALUES ('aa11', 'bb22', NULL), ('cc33', 'bb22', 4)")
+
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+
+        rows = conn.exec_driver_sql("SELECT id, vendor_id, stock_quantity FROM products ORDER BY id").all()
+        assert rows == [("aa11", "bb22", 0), ("cc33", "bb22", 4)]
+        ddl = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'products'").scalar()
+        assert "id UUID NOT NULL" in ddl and "vendor_id UUID NOT NULL" in ddl
+
+        conn.exec_driver_sql("INSERT INTO products (id, vendor_id) VALUES ('dd44', 'bb22')")
+        assert conn.exec_driver_sql("SELECT stock_quantity FROM products WHERE id = 'dd44'").scalar() == 0
+        with pytest.raises(sa.exc.IntegrityError):
+            with conn.begin_nested():
+                conn.exec_driver_sql("INSERT INTO products VALUES ('ee55', 'bb22', NULL)")
@@ -0,0 +1,195 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.notifications import (
+    create_admin_notification, create_system_notification, notification_stream, stream_vendor_notifications
+)
+from app.core.token_verifier import token_verifier
+from app.core.security import create_access_token
+from app.models.admin_notification import AdminNotificationType
+from app.models.product import Product
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.identity_cache import identity_cache
+from app.services.notification_hub import (
+    NotificationHub, LocalBroker, notification_hub, vendor_channel, ADMIN_CHANNEL
+)
+from sqlalchemy import update
+import asyncio
+import httpx
+import json
+import uuid
+
+client = TestClient(app)
+
+
+def test_hubs_share_events_through_the_broker():
+    async def scenario():
+        broker = LocalBroker()
+        worker_a = NotificationHub(broker, buffer_size=2, heartbeat_seconds=0.01)
+        worker_b = NotificationHub(broker, buffer_size=2, heartbeat_seconds=0.01)
+
+        with worker_b.subscribe(["vendor:1"]) as listener, worker_a.subscribe(["admin"]) as other:
+            # Published on one worker, delivered to a connection on the other
+            worker_a.publish("vendor:1", {"n": 1})
+            assert await listener.get(1) == {"n": 1}
+
+            # A slow connection keeps only the newest messages
+            for n in range(2, 6):
+                worker_a.publish("vendor:1", {"n": n})
+            assert [await listener.get(1), await listener.get(1)] == [{"n": 4}, {"n": 5}]
+            assert worker_b.stats() == {"connections": 1, "channels": 1, "dropped": 2}
+
+            # Nothing pending: the caller gets None and sends a heartbeat
+            assert await other.get(0.01) is None
+
+        assert worker_b.stats()["connections"] == 0
+
+    asyncio.run(scenario())
+
+
+def seed_vendor(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Live Farm", contact_email="live@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            product = Product(vendor_id=vendor.id, name="Kale", slug="kale", price=10, stock_quantity=100)
+            db.add(product)
+            await db.commit()
+            return vendor.id, str(product.id)
+
+    return asyncio.run(_seed())
+
+
+def drain(subscription):
+    async def _drain():
+        messages = []
+        while (message := await subscription.get(0.01)) is not None:
+            messages.append(message)
+        return messages
+
+    return _drain()
+
+
+def test_notifications_are_pushed_when_committed(session_factory):
+    vendor_id, product_id = seed_vendor(session_factory)
+
+    async def scenario():
+        with notification_hub.subscribe([vendor_channel(vendor_id)]) as vendor, \
+                notification_hub.subscribe([ADMIN_CHANNEL]) as admin:
+            async with session_factory() as db:
+                await create_system_notification(db, vendor_id, "Suspended", "Account on hold")
+                await db.flush()
+                assert await drain(vendor) == []  # Not before commit
+                await db.commit()
+
+                await create_admin_notification(db, AdminNotificationType.SYSTEM, "Rolled back", "Never sent")
+                await db.flush()
+                await db.rollback()
+
+            [pushed] = await drain(vendor)
+            assert (pushed["title"], pushed["type"]) == ("Suspended", "SYSTEM")
+            assert await drain(admin) == []
+
+            # Order notifications are Core inserts written by the event bus
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                response = await http.post("/api/v1/public/orders", json={
+                    "user_id": str(uuid.uuid4()), "customer_name": "Live Customer", "customer_email": "l@example.com",
+                    "shipping_address": {}, "items": [{"product_id": product_id, "quantity": 1, "price": 0}],
+                })
+                assert response.status_code == 200, response.text
+
+            [order_push] = await drain(vendor)
+            [admin_push] = await drain(admin)
+            assert order_push["extra_data"] == admin_push["extra_data"] == {"order_id": response.json()["id"]}
+
+    asyncio.run(scenario())
+
+
+class DisconnectAfter:
+    """Request stand-in that reports a disconnect after `checks` polls."""
+
+    def __init__(self, checks):
+        self.checks = checks
+
+    async def is_disconnected(self):
+        self.checks -= 1
+        return self.checks < 0
+
+
+def test_stream_sends_events_and_heartbeats():
+    async def scenario():
+        heartbeat, notification_hub.heartbeat_seconds = notification_hub.heartbeat_seconds, 0.01
+        try:
+            stream = notification_stream(DisconnectAfter(2), ["vendor:stream"])
+            chunks = [await stream.__anext__()]  # Subscribed from here on
+            notification_hub.publish("vendor:stream", {"title": "Hello"})
+            chunks += [chunk async for chunk in stream]
+        finally:
+            notification_hub.heartbeat_seconds = heartbeat
+        return chunks
+
+    chunks = asyncio.run(scenario())
+    assert chunks[0] == "retry: 5000\n\n"
+    assert chunks[1] == f"event: notification\ndata: {json.dumps({'title': 'Hello'})}\n\n"
+    assert chunks[2] == ": heartbeat\n\n"
+    assert notification_hub.stats()["connections"] == 0
+
+    assert client.get("/api/v1/notifications/stream").status_code == 401
+
+
+def test_stream_ends_when_no_longer_allowed():
+    async def scenario():
+        heartbeat, notification_hub.heartbeat_seconds = notification_hub.heartbeat_seconds, 0.01
+        checks = []
+
+        async def still_allowed():
+            checks.append(True)
+            return len(checks) < 2
+
+        try:
+            return [chunk async for chunk in notification_stream(DisconnectAfter(10), ["vendor:gone"], still_allowed)]
+        finally:
+            notification_hub.heartbeat_seconds = heartbeat
+
+    assert asyncio.run(scenario()) == ["retry: 5000\n\n", ": heartbeat\n\n"]
+    assert notification_hub.stats()["connections"] == 0
+
+
+def test_streams_open_with_a_short_lived_query_token(session_factory):
+    seed_vendor(session_factory)
+    access_token = create_access_token({"sub": "live@farm.com"})
+    vendor = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.post("/api/v1/notifications/stream-token", headers=vendor)
+    assert response.status_code == 200, response.text
+    stream_token = response.json()["token"]
+    admin_token = client.post(
+        "/api/v1/admin/notifications/received/stream-token", headers={"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+    ).json()["token"]
+
+    # Only stream tokens open a stream, and they open nothing else
+    assert client.get("/api/v1/notifications/stream", params={"token": access_token}).status_code == 401
+    assert client.get("/api/v1/notifications/unread-count", headers={"Authorization": f"Bearer {stream_token}"}).status_code == 401
+    assert client.get("/api/v1/admin/notifications/received/stream", params={"token": stream_token}).status_code == 403
+    assert client.get("/api/v1/notifications/stream", params={"token": admin_token}).status_code == 403
+
+    async def open_stream():
+        claims = await token_verifier.verify(stream_token)
+        response = await stream_vendor_notifications(DisconnectAfter(0), claims, session_factory)
+        return [chunk async for chunk in response.body_iterator]
+
+    assert asyncio.run(open_stream()) == ["retry: 5000\n\n"]
+
+    async def suspend():
+        async with session_factory() as db:
+            await db.execute(update(Vendor).values(status=VendorStatus.SUSPENDED))
+            await db.commit()
+        identity_cache.invalidate("live@farm.com")
+
+    asyncio.run(suspend())
+    assert client.get("/api/v1/notifications/stream", params={"token": stream_token}).status_code == 403
@@ -0,0 +1,366 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import create_access_token
+from app.models.broadcast import BroadcastNotification
+from app.models.notification import Notification, NotificationType
+from app.models.product import Product
+from app.models.unread_counter import UnreadCounter
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.read_models import backfill_read_models
+from app.services.unread_counters import recount_unread, subscribe_to_broadcasts
+from sqlalchemy import event, func, update
+from sqlalchemy.future import select
+import asyncio
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+VENDOR = {"Authorization": f"Bearer {create_access_token({'sub': 'bell@farm.com'})}"}
+OTHER_VENDOR = {"Authorization": f"Bearer {create_access_token({'sub': 'other@farm.com'})}"}
+
+
+def seed(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Bell Farm", contact_email="bell@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            product = Product(vendor_id=vendor.id, name="Kale", slug="kale", price=10, stock_quantity=100)
+            db.add(product)
+            await db.commit()
+            return vendor.id, str(product.id)
+
+    return asyncio.run(_seed())
+
+
+def place_order(product_id):
+    response = client.post("/api/v1/public/orders", json={
+        "user_id": str(uuid.uuid4()), "customer_name": "Bell Customer", "customer_email": "b@example.com",
+        "shipping_address": {}, "items": [{"product_id": product_id, "quantity": 1, "price": 0}],
+    })
+    assert response.status_code == 200, response.text
+
+
+def vendor_badge():
+    return client.get("/api/v1/notifications/unread-count", headers=VENDOR).json()["unread_count"]
+
+
+def admin_badge():
+    return client.get("/api/v1/admin/notifications/received/unread-count", headers=ADMIN).json()["unread_count"]
+
+
+def test_badges_follow_inserts_and_reads(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    assert (vendor_badge(), admin_badge()) == (0, 0)
+
+    # ORM insert (admin message) and Core bulk insert (order notifications)
+    client.post("/api/v1/admin/notifications/send", json={
+        "vendor_id": str(vendor_id), "title": "Hello", "message": "Welcome aboard"
+    }, headers=ADMIN)
+    place_order(product_id)
+    place_order(product_id)
+    assert (vendor_badge(), admin_badge()) == (3, 2)
+
+    feed = client.get("/api/v1/notifications", headers=VENDOR).json()
+    client.post(f"/api/v1/notifications/{feed[0]['id']}/read", headers=VENDOR)
+    client.post(f"/api/v1/notifications/{feed[0]['id']}/read", headers=VENDOR)  # Already read: no change
+    assert vendor_badge() == 2
+
+    client.post("/api/v1/notifications/mark-all-read", headers=VENDOR)
+    inbox = client.get("/api/v1/admin/notifications/received", headers=ADMIN).json()
+    client.post(f"/api/v1/admin/notifications/received/{inbox[0]['id']}/read", headers=ADMIN)
+    assert (vendor_badge(), admin_badge()) == (0, 1)
+
+
+def test_badge_poll_does_not_touch_notifications(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    place_order(product_id)
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        assert vendor_badge() == 1
+        assert admin_badge() == 1
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    assert [s for s in statements if "unread_counters" in s]
+    assert not [s for s in statements if "notifications" in s]
+
+
+def test_recount_repairs_counters(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    place_order(product_id)
+
+    async def drift():
+        async with session_factory() as db:
+            # Writes that bypass the tracked paths
+            await db.execute(update(UnreadCounter).values(unread=42))
+            db.add(Notification(vendor_id=vendor_id, type=NotificationType.SYSTEM, title="t", message="m"))
+            await db.commit()
+
+    async def recount():
+        async with session_factory() as db:
+            return await recount_unread(db)
+
+    asyncio.run(drift())
+    assert vendor_badge() == 43
+    assert asyncio.run(recount()) == 2
+    assert (vendor_badge(), admin_badge()) == (2, 1)
+
+
+def test_counters_start_from_existing_notifications(session_factory):
+    vendor_id, product_id = seed(session_factory)
+
+    async def notifications_from_before_counters():
+        async with session_factory() as db:
+            db.add_all([
+                Notification(vendor_id=vendor_id, type=NotificationType.SYSTEM, title=f"t{i}", message="m")
+                for i in range(5)
+            ])
+            await db.flush()
+            await db.execute(UnreadCounter.__table__.delete())
+            await db.commit()
+
+    asyncio.run(notifications_from_before_counters())
+    assert "unread_counters" in asyncio.run(backfill_read_models(session_factory))
+    assert vendor_badge() == 5
+
+    # Increments and mark-read build on the backfilled count, not on zero
+    place_order(product_id)
+    assert vendor_badge() == 6
+    feed = client.get("/api/v1/notifications", headers=VENDOR).json()
+    client.post("/api/v1/notifications/read", json={"ids": [feed[0]["id"], feed[1]["id"]]}, headers=VENDOR)
+    assert vendor_badge() == 4
+
+
+def test_mark_read_in_bulk(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    for _ in range(3):
+        place_order(product_id)
+
+    feed = client.get("/api/v1/notifications", headers=VENDOR).json()
+    ids = [feed[0]["id"], feed[1]["id"]]
+    inbox = client.get("/api/v1/admin/notifications/received", headers=ADMIN).json()
+
+    # Another recipient's id is skipped
+    response = client.post("/api/v1/notifications/read", json={"ids": ids + [inbox[0]["id"]]}, headers=VENDOR)
+    assert response.json()["count"] == 2
+    assert client.post("/api/v1/notifications/read", json={"ids": ids}, headers=VENDOR).json()["count"] == 0
+    assert client.post("/api/v1/notifications/read", json={"ids": []}, headers=VENDOR).status_code == 422
+    assert vendor_badge() == 1
+
+    response = client.post("/api/v1/admin/notifications/received/read", json={"ids": [inbox[0]["id"]]}, headers=ADMIN)
+    assert response.json()["count"] == 1
+    assert admin_badge() == 2
+
+    # Mark-all is one UPDATE: no notification rows are loaded
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        assert client.post("/api/v1/notifications/mark-all-read", headers=VENDOR).json()["count"] == 1
+        assert client.post("/api/v1/admin/notifications/received/mark-all-read", headers=ADMIN).json()["count"] == 2
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    touched = [s for s in statements if "notifications" in s]
+    assert len(touched) == 2 and all(s.lstrip().startswith("UPDATE") for s in touched)
+    assert (vendor_badge(), admin_badge()) == (0, 0)
+
+
+def seed_other_vendor(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Other Farm", contact_email="other@farm.com", phone_number="2",
+                address_line="2 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.commit()
+            return vendor.id
+
+    return asyncio.run(_seed())
+
+
+def row_counts(session_factory):
+    async def _counts():
+        async with session_factory() as db:
+            notifications = (await db.execute(select(func.count()).select_from(Notification))).scalar()
+            broadcasts = (await db.execute(select(func.count()).select_from(BroadcastNotification))).scalar()
+            return notifications, broadcasts
+
+    return asyncio.run(_counts())
+
+
+def test_broadcasts_are_stored_once_and_merged_into_feeds(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    seed_other_vendor(session_factory)
+
+    response = client.post("/api/v1/admin/notifications/send", json={
+        "title": "Festival sale", "message": "Everyone is invited"
+    }, headers=ADMIN)
+    assert response.json()["message"] == "Notification sent to 2 vendors"
+    assert row_counts(session_factory) == (0, 1)
+    client.post("/api/v1/admin/notifications/send", json={
+        "vendor_id": str(vendor_id), "title": "Just you", "message": "Direct"
+    }, headers=ADMIN)
+    assert (vendor_badge(), admin_badge()) == (2, 0)
+
+    feed = client.get("/api/v1/notifications", headers=VENDOR).json()
+    assert [(n["title"], n["broadcast"], n["is_read"]) for n in feed] == [
+        ("Just you", False, False), ("Festival sale", True, False)
+    ]
+
+    # Reading a broadcast is per vendor, and only counts once
+    broadcast_id = feed[1]["id"]
+    assert client.post(f"/api/v1/notifications/{broadcast_id}/read", headers=VENDOR).status_code == 200
+    assert client.post("/api/v1/notifications/read", json={"ids": [broadcast_id]}, headers=VENDOR).json()["count"] == 0
+    assert vendor_badge() == 1
+    other = client.get("/api/v1/notifications/unread-count", headers=OTHER_VENDOR).json()["unread_count"]
+    assert other == 1
+    assert client.get("/api/v1/notifications", headers=VENDOR).json()[1]["is_read"] is True
+
+    # Category announcements go through notify_all_vendors
+    response = client.post("/api/v1/categories/", json={"name": "Millets", "slug": "millets", "image_url": "/millets.png"}, headers=ADMIN)
+    assert response.status_code == 200, response.text
+    assert row_counts(session_factory) == (1, 2)
+    assert vendor_badge() == 2
+
+    assert client.post("/api/v1/notifications/mark-all-read", headers=VENDOR).json()["count"] == 2
+    assert vendor_badge() == 0
+    assert client.get("/api/v1/notifications/unread-count", headers=OTHER_VENDOR).json()["unread_count"] == 2
+
+    history = client.get("/api/v1/admin/notifications/history", headers=ADMIN).json()
+    broadcasts = {h["title"]: h["read_by"] for h in history if h["vendor_id"] is None}
+    assert broadcasts == {"Festival sale": 1, "New Category Added": 1}
+
+    async def recount():
+        async with session_factory() as db:
+            return await recount_unread(db)
+
+    asyncio.run(recount())
+    assert vendor_badge() == 0
+    assert client.get("/api/v1/notifications/unread-count", headers=OTHER_VENDOR).json()["unread_count"] == 2
+
+
+def test_vendors_see_broadcasts_sent_since_their_approval(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    client.post("/api/v1/admin/notifications/send", json={"title": "Old news", "message": "Before"}, headers=ADMIN)
+    place_order(product_id)
+    other_id = seed_other_vendor(session_factory)
+
+    async def approve():
+        async with session_factory() as db:
+            await subscribe_to_broadcasts(db, other_id)
+            await db.commit()
+
+    asyncio.run(approve())
+    asyncio.run(approve())  # Re-approval keeps the first date
+    other_badge = lambda: client.get("/api/v1/notifications/unread-count", headers=OTHER_VENDOR).json()["unread_count"]
+    assert other_badge() == 0
+    assert client.get("/api/v1/notifications", headers=OTHER_VENDOR).json() == []
+    old_id = client.get("/api/v1/notifications", headers=VENDOR).json()[1]["id"]
+    assert client.post(f"/api/v1/notifications/{old_id}/read", headers=OTHER_VENDOR).status_code == 404
+    assert client.post("/api/v1/notifications/mark-all-read", headers=OTHER_VENDOR).json()["count"] == 0
+    assert other_badge() == 0
+
+    client.post("/api/v1/admin/notifications/send", json={"title": "New news", "message": "After"}, headers=ADMIN)
+    assert [n["title"] for n in client.get("/api/v1/notifications", headers=OTHER_VENDOR).json()] == ["New news"]
+    assert other_badge() == 1
+
+    # Reading a broadcast doesn't hide the vendor's direct unread count
+    client.post(f"/api/v1/notifications/{old_id}/read", headers=VENDOR)
+    assert vendor_badge() == 2
+
+    async def recount():
+        async with session_factory() as db:
+            await recount_unread(db)
+
+    asyncio.run(recount())
+    assert (vendor_badge(), other_badge()) == (2, 1)
+
+
+def collect_pages(url, headers, **params):
+    """Follow X-Next-Cursor to the end; returns the pages."""
+    pages = []
+    while True:
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        params["cursor"] = cursor
+
+
+def test_feeds_are_keyset_paginated_and_filtered(session_factory):
+    vendor_id, product_id = seed(session_factory)
+    for _ in range(3):
+        place_order(product_id)
+    for title in ("First", "Second"):
+        client.post("/api/v1/admin/notifications/send", json={"title": title, "message": "All"}, headers=ADMIN)
+    client.post("/api/v1/admin/notifications/send", json={
+        "vendor_id": str(vendor_id), "type": "PROMOTION", "title": "Deal", "message": "Direct"
+    }, headers=ADMIN)
+
+    # Direct and broadcast notifications interleave by time across pages, with no repeats
+    pages = collect_pages("/api/v1/notifications", VENDOR, limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2]
+    feed = [n for page in pages for n in page]
+    assert [n["title"] for n in feed[:3]] == ["Deal", "Second", "First"]
+    assert len({n["id"] for n in feed}) == 6
+    assert [n["created_at"] for n in feed] == sorted((n["created_at"] for n in feed), reverse=True)
+
+    client.post(f"/api/v1/notifications/{feed[1]['id']}/read", headers=VENDOR)
+    client.post(f"/api/v1/notifications/{feed[3]['id']}/read", headers=VENDOR)
+    unread = [n["title"] for page in collect_pages("/api/v1/notifications", VENDOR, limit=2, is_read=False) for n in page]
+    assert unread == ["Deal", "First", "📦 New Order Received", "📦 New Order Received"]
+    read = client.get("/api/v1/notifications", params={"is_read": True}, headers=VENDOR).json()
+    assert [(n["title"], n["broadcast"]) for n in read] == [("Second", True), ("📦 New Order Received", False)]
+    system = client.get("/api/v1/notifications", params={"type": "SYSTEM"}, headers=VENDOR).json()
+    assert len(system) == 3
+
+    # Admin inbox and sent history
+    inbox = collect_pages("/api/v1/admin/notifications/received", ADMIN, limit=2)
+    assert [len(page) for page in inbox] == [2, 1]
+    assert client.get("/api/v1/admin/notifications/received", params={"type": "NEW_VENDOR"}, headers=ADMIN).json() == []
+
+    history = [h for page in collect_pages("/api/v1/admin/notifications/history", ADMIN, limit=4) for h in page]
+    assert len(history) == 6
+    assert {h["vendor_name"] for h in history} == {"Bell Farm", "All vendors"}
+    read_history = client.get("/api/v1/admin/notifications/history", params={"is_read": True}, headers=ADMIN).json()
+    assert sorted(h["title"] for h in read_history) == ["Second", "📦 New Order Received"]
+
+    assert client.get("/api/v1/notifications", params={"cursor": "nope"}, headers=VENDOR).status_code == 400
+
+
+def test_deleting_vendor_leaves_no_counter_behind(session_factory):
+    vendor_id = seed_other_vendor(session_factory)
+    for title in ("Hello", "Again"):
+        client.post("/api/v1/admin/notifications/send", json={
+            "vendor_id": str(vendor_id), "title": title, "message": "Welcome aboard"
+        }, headers=ADMIN)
+    assert client.get("/api/v1/notifications/unread-count", headers=OTHER_VENDOR).json()["unread_count"] == 2
+
+    assert client.delete(f"/api/v1/admin/vendors/{vendor_id}", headers=ADMIN).status_code == 200
+
+    async def counters():
+        async with session_factory() as db:
+            return (await db.execute(select(UnreadCounter.recipient))).scalars().all()
+
+    # The cascade-deleted notifications must not re-create the vendor's counter
+    assert str(vendor_id) not in asyncio.run(counters())
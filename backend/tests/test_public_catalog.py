@@ -0,0 +1,155 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.models.product import Product, ProductType
+from app.models.category import Category
+from app.services.catalog_cache import catalog_cache
+from sqlalchemy import event
+import asyncio
+import pytest
+import uuid
+
+client = TestClient(app)
+
+
+def seed_catalog(session_factory, count=25):
+    async def _seed():
+        async with session_factory() as db:
+            approved = Vendor(
+                business_name="Green Acres", contact_email="green@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            suspended = Vendor(
+                business_name="Closed Farm", contact_email="closed@farm.com", phone_number="2",
+                address_line="2 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.SUSPENDED
+            )
+            db.add_all([approved, suspended])
+            await db.flush()
+            for i in range(count):
+                db.add(Product(
+                    vendor_id=approved.id, name=f"Product {i}", slug=f"product-{i}",
+                    price=10 + i, stock_quantity=i % 3,
+                    product_type=ProductType.ORGANIC if i % 2 else ProductType.NATURAL
+                ))
+            db.add(Product(vendor_id=suspended.id, name="Hidden", slug="hidden", price=5, stock_quantity=5))
+            await db.commit()
+            return approved.id
+
+    return asyncio.run(_seed())
+
+
+def test_public_products_keyset_pages(session_factory):
+    seed_catalog(session_factory)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/public/products", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 10
+        seen.extend(p["id"] for p in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    # Every product from the approved vendor exactly once, in a stable order
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+    assert seen == sorted(seen, key=lambda i: uuid.UUID(i))
+
+
+def test_public_products_filters(session_factory):
+    vendor_id = seed_catalog(session_factory)
+
+    response = client.get("/api/v1/public/products", params={
+        "vendor_id": str(vendor_id),
+        "product_type": "ORGANIC",
+        "min_price": 15,
+        "max_price": 25,
+        "in_stock": True,
+        "limit": 200,
+    })
+    assert response.status_code == 200
+    products = response.json()
+    assert products
+    for p in products:
+        assert 15 <= p["price"] <= 25
+        assert p["stock"] > 0
+        assert p["isOrganic"] is True
+        assert p["vendorName"] == "Green Acres"
+
+
+@pytest.mark.parametrize("snapshot", [True, False])
+def test_public_products_search_category_and_detail(session_factory, monkeypatch, snapshot):
+    if not snapshot:
+        monkeypatch.setattr(catalog_cache, "ttl_seconds", 0)
+    vendor_id = seed_catalog(session_factory, count=3)
+
+    async def add_greens():
+        async with session_factory() as db:
+            greens = Category(name="Leafy Greens", slug="leafy-greens")
+            db.add(greens)
+            await db.flush()
+            db.add_all([
+                Product(vendor_id=vendor_id, category_id=greens.id, name="Kale", slug="kale", price=4, stock_quantity=1),
+                Product(vendor_id=vendor_id, category_id=greens.id, name="Spinach", slug="spinach", price=3,
+                        stock_quantity=1, description="Tender 100% KALE-free leaves"),
+            ])
+            await db.commit()
+
+    asyncio.run(add_greens())
+    catalog_cache.invalidate()
+
+    def names(**params):
+        response = client.get("/api/v1/public/products", params=params)
+        assert response.status_code == 200, response.text
+        return sorted(p["name"] for p in response.json())
+
+    assert names(q="kale") == ["Kale", "Spinach"]  # Name or description, any case
+    assert names(q="100%") == ["Spinach"]  # LIKE wildcards match literally
+    assert names(category="leafy greens") == ["Kale", "Spinach"]
+    assert names(category="General", q="product") == ["Product 0", "Product 1", "Product 2"]
+    assert names(q="hidden") == []  # Suspended vendor
+
+    product = client.get("/api/v1/public/products", params={"q": "spinach"}).json()[0]
+    assert client.get(f"/api/v1/public/products/{product['id']}").json() == product
+    assert client.get(f"/api/v1/public/products/{uuid.uuid4()}").status_code == 404
+
+
+def test_public_products_rejects_bad_cursor(session_factory):
+    response = client.get("/api/v1/public/products", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_catalog_snapshot_served_from_memory_and_invalidated(session_factory):
+    vendor_id = seed_catalog(session_factory, count=3)
+    engine = session_factory.kw["bind"].sync_engine
+
+    assert len(client.get("/api/v1/public/products").json()) == 3
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert len(client.get("/api/v1/public/products").json()) == 3
+        assert len(client.get("/api/v1/products/public/products").json()) == 4
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert statements == []
+
+    # A write bumps the version and the next read sees it
+    async def add_product():
+        async with session_factory() as db:
+            db.add(Product(vendor_id=vendor_id, name="Fresh", slug="fresh", price=1, stock_quantity=1))
+            await db.commit()
+
+    asyncio.run(add_product())
+    assert len(client.get("/api/v1/public/products").json()) == 3
+    catalog_cache.invalidate()
+    assert len(client.get("/api/v1/public/products").json()) == 4
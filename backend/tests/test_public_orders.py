@@ -0,0 +1,210 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.models.product import Product
+from app.models.order import Order, OrderItem
+from app.models.notification import Notification
+from app.models.admin_notification import AdminNotification
+from app.models.idempotency_key import IdempotencyKey
+from sqlalchemy import event, func
+from sqlalchemy.future import select
+import asyncio
+import httpx
+import uuid
+
+client = TestClient(app)
+
+
+def seed_products(session_factory, count=3, stock=10):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Order Farm", contact_email="orders@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            products = [
+                Product(vendor_id=vendor.id, name=f"Item {i}", slug=f"item-{i}", price=10.0 * (i + 1), stock_quantity=stock)
+                for i in range(count)
+            ]
+            db.add_all(products)
+            await db.commit()
+            return [str(p.id) for p in products]
+
+    return asyncio.run(_seed())
+
+
+def order_payload(items):
+    return {
+        "user_id": "ded8126b-6080-4595-bf89-40b38343e742",
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "shipping_address": {"line1": "123 Test St", "city": "Bangalore", "state": "KA", "pincode": "560001"},
+        "items": items,
+    }
+
+
+def count_rows(session_factory, model):
+    async def _count():
+        async with session_factory() as db:
+            return (await db.execute(select(func.count()).select_from(model))).scalar()
+
+    return asyncio.run(_count())
+
+
+def test_checkout_looks_up_products_in_one_query(session_factory):
+    product_ids = seed_products(session_factory, count=8)
+    engine = session_factory.kw["bind"].sync_engine
+
+    selects = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        small = client.post("/api/v1/public/orders", json=order_payload(
+            [{"product_id": product_ids[0], "quantity": 1, "price": 0}]
+        ))
+        small_selects = len(selects)
+        large = client.post("/api/v1/public/orders", json=order_payload(
+            [{"product_id": pid, "quantity": 2, "price": 0} for pid in product_ids]
+            + [{"product_id": 1, "quantity": 1, "price": 0}]  # Legacy numeric id is ignored
+        ))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert small.status_code == 200, small.text
+    assert large.status_code == 200, large.text
+    assert len(selects) - small_selects == small_selects
+    assert count_rows(session_factory, Order) == 2
+    assert count_rows(session_factory, OrderItem) == 9
+
+
+def test_checkout_commits_order_once_and_publishes_notifications(session_factory):
+    product_ids = seed_products(session_factory, count=3)
+    engine = session_factory.kw["bind"].sync_engine
+
+    commits = []
+    listener = lambda conn: commits.append(conn)
+    event.listen(engine, "commit", listener)
+    try:
+        response = client.post("/api/v1/public/orders", json=order_payload(
+            [{"product_id": pid, "quantity": 1, "price": 0} for pid in product_ids]
+        ))
+    finally:
+        event.remove(engine, "commit", listener)
+
+    assert response.status_code == 200, response.text
+    # The order and its items commit together; the event bus is not running here,
+    # so the OrderPlaced notifications are written inline in a second transaction
+    assert len(commits) == 2
+    assert count_rows(session_factory, OrderItem) == 3
+    assert count_rows(session_factory, AdminNotification) == 1
+    # All three products belong to the same vendor
+    assert count_rows(session_factory, Notification) == 1
+
+
+def get_stock(session_factory, product_id):
+    async def _get():
+        async with session_factory() as db:
+            return (await db.execute(select(Product.stock_quantity).where(Product.id == uuid.UUID(product_id)))).scalar()
+
+    return asyncio.run(_get())
+
+
+def test_checkout_rejects_orders_beyond_stock(session_factory):
+    product_ids = seed_products(session_factory, count=2, stock=3)
+
+    response = client.post("/api/v1/public/orders", json=order_payload([
+        {"product_id": product_ids[0], "quantity": 2, "price": 0},
+        {"product_id": product_ids[1], "quantity": 4, "price": 0},
+    ]))
+    assert response.status_code == 409
+    assert "Item 1 (3 left)" in response.json()["detail"]
+
+    # All-or-nothing: the line that fit was released again
+    assert get_stock(session_factory, product_ids[0]) == 3
+    assert count_rows(session_factory, Order) == 0
+
+    # Duplicate lines for the same product are reserved together
+    response = client.post("/api/v1/public/orders", json=order_payload([
+        {"product_id": product_ids[0], "quantity": 2, "price": 0},
+        {"product_id": product_ids[0], "quantity": 1, "price": 0},
+    ]))
+    assert response.status_code == 200
+    assert get_stock(session_factory, product_ids[0]) == 0
+
+
+def test_concurrent_checkouts_never_oversell(session_factory):
+    stock = 10
+    buyers = 50
+    (product_id,) = seed_products(session_factory, count=1, stock=stock)
+
+    async def hammer():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            payload = order_payload([{"product_id": product_id, "quantity": 1, "price": 0}])
+            return await asyncio.gather(*(http.post("/api/v1/public/orders", json=payload) for _ in range(buyers)))
+
+    responses = asyncio.run(hammer())
+    codes = [r.status_code for r in responses]
+
+    assert codes.count(200) == stock
+    assert codes.count(409) == buyers - stock
+    assert get_stock(session_factory, product_id) == 0
+    assert count_rows(session_factory, Order) == stock
+
+
+def test_idempotency_key_replays_the_first_response(session_factory):
+    product_ids = seed_products(session_factory, count=1, stock=5)
+    payload = order_payload([{"product_id": product_ids[0], "quantity": 1, "price": 0}])
+    headers = {"Idempotency-Key": "checkout-1"}
+
+    first = client.post("/api/v1/public/orders", json=payload, headers=headers)
+    retry = client.post("/api/v1/public/orders", json=payload, headers=headers)
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert count_rows(session_factory, Order) == 1
+    assert get_stock(session_factory, product_ids[0]) == 4
+
+    # Reusing the key for a different cart is refused
+    other = order_payload([{"product_id": product_ids[0], "quantity": 2, "price": 0}])
+    assert client.post("/api/v1/public/orders", json=other, headers=headers).status_code == 422
+
+
+def test_idempotency_key_concurrent_duplicates_wait_for_the_first(session_factory):
+    product_ids = seed_products(session_factory, count=1, stock=5)
+    payload = order_payload([{"product_id": product_ids[0], "quantity": 1, "price": 0}])
+
+    async def retry_storm():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(
+                http.post("/api/v1/public/orders", json=payload, headers={"Idempotency-Key": "storm"})
+                for _ in range(10)
+            ))
+
+    responses = asyncio.run(retry_storm())
+
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert count_rows(session_factory, Order) == 1
+    assert get_stock(session_factory, product_ids[0]) == 4
+
+
+def test_idempotency_key_released_when_order_fails(session_factory):
+    product_ids = seed_products(session_factory, count=1, stock=1)
+    payload = order_payload([{"product_id": product_ids[0], "quantity": 2, "price": 0}])
+    headers = {"Idempotency-Key": "too-many"}
+
+    assert client.post("/api/v1/public/orders", json=payload, headers=headers).status_code == 409
+    # Failures are not stored, so the retry runs the checkout again
+    assert client.post("/api/v1/public/orders", json=payload, headers=headers).status_code == 409
+    assert count_rows(session_factory, IdempotencyKey) == 0
@@ -0,0 +1,151 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import create_access_token
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.models.product import Product
+from app.models.category import Category
+from app.services.catalog_cache import catalog_cache
+from sqlalchemy import event
+import asyncio
+import re
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+# A plan step that reads a whole table without any index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+# Whole-table aggregates where reading every row is the intended plan
+WHOLE_TABLE_AGGREGATES = [
+    "sum(daily_sales_rollup.revenue)",
+]
+
+# Every hot path must show up in the captured statements, or it was never checked
+HOT_QUERIES = [
+    "FROM products",
+    "UPDATE products",
+    "FROM orders",
+    "UPDATE orders",
+    "FROM customer_stats",
+    "FROM vendor_stats",
+    "FROM daily_sales_rollup",
+    "FROM notifications",
+    "FROM admin_notifications",
+    "FROM broadcasts",
+    "FROM unread_counters",
+]
+
+
+def seed(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            category = Category(name="Vegetables", slug="vegetables")
+            vendor = Vendor(
+                business_name="Plan Farm", contact_email="plans@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add_all([category, vendor])
+            await db.flush()
+            products = [
+                Product(vendor_id=vendor.id, category_id=category.id, name=f"P{i}", slug=f"p-{i}", price=5, stock_quantity=50)
+                for i in range(5)
+            ]
+            db.add_all(products)
+            await db.commit()
+            return vendor.id, category.id, [str(p.id) for p in products]
+
+    return asyncio.run(_seed())
+
+
+def ok(response):
+    # A failing call (e.g. a 401) would silently drop its queries from the plan check
+    assert response.status_code == 200, f"{response.request.url}: {response.status_code} {response.text}"
+    return response
+
+
+def exercise_hot_paths(vendor_id, category_id, product_ids):
+    vendor_auth = {"Authorization": f"Bearer {create_access_token({'sub': 'plans@farm.com'})}"}
+
+    # Catalog (SQL path)
+    ok(client.get("/api/v1/public/products", params={"limit": 2}))
+    ok(client.get("/api/v1/public/products", params={"vendor_id": str(vendor_id)}))
+    ok(client.get("/api/v1/public/products", params={"category_id": category_id}))
+
+    # Checkout
+    ok(client.post("/api/v1/public/orders", json={
+        "user_id": "ded8126b-6080-4595-bf89-40b38343e742",
+        "customer_name": "Plan Customer", "customer_email": "plan@example.com",
+        "shipping_address": {}, "items": [{"product_id": pid, "quantity": 1, "price": 0} for pid in product_ids],
+    }))
+
+    # Orders
+    ok(client.get("/api/v1/orders/", headers=ADMIN))
+    ok(client.get("/api/v1/orders/", params={"status": "PENDING"}, headers=ADMIN))
+    ok(client.get("/api/v1/orders/", params={"customer_email": "plan@example.com"}, headers=ADMIN))
+    ok(client.get("/api/v1/orders/my-orders", headers=ADMIN))
+    order_id = ok(client.get("/api/v1/orders/", headers=ADMIN)).json()[0]["id"]
+    ok(client.put(f"/api/v1/orders/{order_id}/status", json={"status": "CANCELLED"}, headers=ADMIN))
+
+    # Customers
+    ok(client.get("/api/v1/customers/", params={"sort": "spend"}, headers=ADMIN))
+    ok(client.get("/api/v1/customers/", params={"limit": 1}, headers=ADMIN))
+
+    # Analytics
+    ok(client.get("/api/v1/analytics/dashboard"))
+    ok(client.get("/api/v1/analytics/vendor/dashboard", headers=vendor_auth))
+    ok(client.get("/api/v1/analytics/sales", params={"granularity": "week"}, headers=ADMIN))
+    ok(client.get("/api/v1/analytics/vendor/sales", params={"granularity": "month"}, headers=vendor_auth))
+
+    # Notifications
+    ok(client.get("/api/v1/notifications", headers=vendor_auth))
+    ok(client.get("/api/v1/notifications", params={"is_read": False, "type": "SYSTEM"}, headers=vendor_auth))
+    ok(client.get("/api/v1/notifications/unread-count", headers=vendor_auth))
+    ok(client.get("/api/v1/admin/notifications/history", headers=ADMIN))
+    ok(client.get("/api/v1/admin/notifications/history", params={"is_read": True}, headers=ADMIN))
+    ok(client.get("/api/v1/admin/notifications/received", headers=ADMIN))
+    ok(client.get("/api/v1/admin/notifications/received", params={"is_read": False}, headers=ADMIN))
+    ok(client.get("/api/v1/admin/notifications/received/unread-count", headers=ADMIN))
+
+
+def test_hot_queries_use_indexes(session_factory):
+    vendor_id, category_id, product_ids = seed(session_factory)
+    engine = session_factory.kw["bind"]
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    ttl = catalog_cache.ttl_seconds
+    catalog_cache.ttl_seconds = 0  # Exercise the SQL catalog path
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        exercise_hot_paths(vendor_id, category_id, product_ids)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        catalog_cache.ttl_seconds = ttl
+
+    async def explain_all():
+        plans = []
+        async with engine.connect() as conn:
+            for statement, parameters in captured:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append((statement, [row[-1] for row in result.all()]))
+        return plans
+
+    failures = []
+    for statement, plan in asyncio.run(explain_all()):
+        if any(agg in statement for agg in WHOLE_TABLE_AGGREGATES):
+            continue
+        # Subqueries SQLite runs as co-routines (e.g. a one-row SELECT of constants) are not tables
+        subqueries = {step.split(" ", 1)[1] for step in plan if step.startswith("CO-ROUTINE ")}
+        scans = [step for step in plan if FULL_SCAN.match(step) and FULL_SCAN.match(step).group(1) not in subqueries]
+        if scans:
+            failures.append(f"{scans} <- {' '.join(statement.split())}")
+
+    statements = [" ".join(statement.split()) for statement, _ in captured]
+    missing = [query for query in HOT_QUERIES if not any(query in statement for statement in statements)]
+    assert not missing, f"Hot queries never ran: {missing}"
+    assert not failures, "Full table scans:\n" + "\n".join(failures)
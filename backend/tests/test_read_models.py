@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.customer_stats import CustomerStats
+from app.models.daily_sales_rollup import DailySalesRollup
+from app.models.product import Product
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.read_models import backfill_read_models
+from sqlalchemy import delete
+import asyncio
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+
+def seed(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Backfill Farm", contact_email="backfill@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            product = Product(vendor_id=vendor.id, name="Okra", slug="okra", price=20, stock_quantity=1000)
+            db.add(product)
+            await db.commit()
+            return vendor.id, str(product.id)
+
+    return asyncio.run(_seed())
+
+
+def place_order(product_id, email, quantity=1):
+    response = client.post("/api/v1/public/orders", json={
+        "user_id": str(uuid.uuid4()), "customer_name": "Backfill Customer", "customer_email": email,
+        "shipping_address": {}, "items": [{"product_id": product_id, "quantity": quantity, "price": 0}],
+    })
+    assert response.status_code == 200, response.text
+
+
+def forget(session_factory, *models):
+    """Empty read model tables, as on a database from before they existed."""
+    async def _forget():
+        async with session_factory() as db:
+            for model in models:
+                await db.execute(delete(model))
+            await db.commit()
+
+    asyncio.run(_forget())
+
+
+def test_startup_backfills_read_models_once(session_factory):
+    _, product_id = seed(session_factory)
+    place_order(product_id, "first@example.com", quantity=2)
+    place_order(product_id, "second@example.com")
+    forget(session_factory, DailySalesRollup, CustomerStats)
+
+    assert "daily_sales_rollup" in asyncio.run(backfill_read_models(session_factory))
+    assert client.get("/api/v1/analytics/dashboard").json()["revenue"] == 60
+    customers = client.get("/api/v1/customers/", headers=ADMIN).json()
+    assert {c["email"] for c in customers} == {"first@example.com", "second@example.com"}
+
+    # Built once; from here on the order paths keep them current
+    assert asyncio.run(backfill_read_models(session_factory)) == []
+    place_order(product_id, "third@example.com")
+    assert client.get("/api/v1/analytics/dashboard").json()["revenue"] == 80
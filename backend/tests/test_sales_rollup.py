@@ -0,0 +1,143 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.daily_sales_rollup import DailySalesRollup
+from app.models.order import Order, OrderStatus
+from app.models.product import Product
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.sales_rollup import rebuild_daily_sales
+from sqlalchemy import event
+from sqlalchemy.future import select
+from datetime import datetime, timedelta
+import asyncio
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+
+def seed_product(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendor = Vendor(
+                business_name="Rollup Farm", contact_email="rollup@farm.com", phone_number="1",
+                address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+            )
+            db.add(vendor)
+            await db.flush()
+            product = Product(vendor_id=vendor.id, name="Kale", slug="kale", price=25, stock_quantity=100)
+            db.add(product)
+            await db.commit()
+            return str(product.id)
+
+    return asyncio.run(_seed())
+
+
+def seed_history(session_factory):
+    """Orders from earlier days, written directly as if they predate the rollup."""
+    async def _seed():
+        async with session_factory() as db:
+            now = datetime.utcnow()
+            for days_ago, total, status in [(40, 100, OrderStatus.DELIVERED), (40, 50, OrderStatus.CANCELLED), (400, 70, OrderStatus.DELIVERED)]:
+                db.add(Order(
+                    user_id=uuid.uuid4(), customer_name="Old", customer_email="old@example.com",
+                    shipping_address={}, total_amount=total, status=status,
+                    created_at=now - timedelta(days=days_ago)
+                ))
+            await db.commit()
+
+    asyncio.run(_seed())
+
+
+def rollup_rows(session_factory):
+    async def _rows():
+        async with session_factory() as db:
+            result = await db.execute(select(DailySalesRollup).order_by(DailySalesRollup.date))
+            return [(r.date, r.order_count, r.revenue, r.cancelled) for r in result.scalars().all()]
+
+    return asyncio.run(_rows())
+
+
+def rebuild(session_factory):
+    async def _rebuild():
+        async with session_factory() as db:
+            return await rebuild_daily_sales(db)
+
+    return asyncio.run(_rebuild())
+
+
+def place_order(product_id, quantity):
+    response = client.post("/api/v1/public/orders", json={
+        "user_id": str(uuid.uuid4()), "customer_name": "Rollup Customer", "customer_email": "r@example.com",
+        "shipping_address": {}, "items": [{"product_id": product_id, "quantity": quantity, "price": 0}],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_rollup_tracks_orders_and_status_changes(session_factory):
+    product_id = seed_product(session_factory)
+    first = place_order(product_id, 2)   # 50
+    place_order(product_id, 4)           # 100
+
+    today = datetime.utcnow().date()
+    assert rollup_rows(session_factory) == [(today, 2, 150.0, 0)]
+
+    # Cancelling moves the total out of revenue; restoring puts it back
+    response = client.put(f"/api/v1/orders/{first}/status", json={"status": "CANCELLED"}, headers=ADMIN)
+    assert response.status_code == 200, response.text
+    assert rollup_rows(session_factory) == [(today, 2, 100.0, 1)]
+
+    client.put(f"/api/v1/orders/{first}/status", json={"status": "SHIPPED"}, headers=ADMIN)
+    client.put(f"/api/v1/orders/{first}/status", json={"status": "DELIVERED"}, headers=ADMIN)
+    assert rollup_rows(session_factory) == [(today, 2, 150.0, 0)]
+
+    client.put(f"/api/v1/orders/{first}/status", json={"status": "CANCELLED"}, headers=ADMIN)
+    stats = client.get("/api/v1/analytics/dashboard").json()
+    assert stats["revenue"] == 100.0
+    assert stats["total_orders"] == 2
+    assert stats["sales_trend"][-1] == {"month": today.strftime("%b"), "amount": 100}
+    assert len(stats["sales_trend"]) == 6
+
+    missing = client.put(f"/api/v1/orders/{uuid.uuid4()}/status", json={"status": "SHIPPED"}, headers=ADMIN)
+    assert missing.status_code == 404
+
+
+def test_rebuild_backfills_and_matches_incremental(session_factory):
+    product_id = seed_product(session_factory)
+    place_order(product_id, 1)
+    incremental = rollup_rows(session_factory)
+
+    # Orders written behind the rollup's back are picked up by a rebuild
+    seed_history(session_factory)
+    assert rebuild(session_factory) == 3
+    rows = rollup_rows(session_factory)
+
+    assert rows[-1] == incremental[-1]
+    assert [r[1:] for r in rows[:2]] == [(1, 70.0, 0), (2, 100.0, 1)]
+
+    # The dashboard reads the rebuilt rows: the 400-day-old order counts in the totals only
+    stats = client.get("/api/v1/analytics/dashboard").json()
+    assert stats["total_orders"] == 4
+    assert stats["revenue"] == 195.0
+    assert sum(point["amount"] for point in stats["sales_trend"]) == 125
+
+
+def test_dashboard_round_trips(session_factory):
+    seed_history(session_factory)
+    rebuild(session_factory)
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        stats = client.get("/api/v1/analytics/dashboard").json()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    # Scalar metrics in one statement, the sales trend in another
+    assert len(statements) == 2
+    assert (stats["total_orders"], stats["revenue"], stats["active_vendors"], stats["total_customers"]) == (3, 170.0, 0, 0)
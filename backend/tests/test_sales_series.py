@@ -0,0 +1,102 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import create_access_token
+from app.core.time_buckets import Granularity, time_bucket
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.services.sales_rollup import rebuild_daily_sales
+from datetime import datetime
+import asyncio
+import pytest
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+VENDOR = {"Authorization": f"Bearer {create_access_token({'sub': 'series@farm.com'})}"}
+
+# (created_at, vendor share, other vendor share, status)
+ORDERS = [
+    (datetime(2025, 3, 10, 9, 30, 0, 123456), 10, 0, OrderStatus.DELIVERED),  # Same month, previous year
+    (datetime(2026, 3, 1, 23, 59), 20, 5, OrderStatus.DELIVERED),            # Sunday
+    (datetime(2026, 3, 2, 0, 1), 30, 0, OrderStatus.PENDING),                # Monday
+    (datetime(2026, 3, 2, 18, 0), 40, 0, OrderStatus.CANCELLED),
+    (datetime(2026, 3, 8, 12, 0), 0, 7, OrderStatus.SHIPPED),                # Sunday, other vendor only
+    (datetime(2026, 4, 15, 8, 0), 50, 0, OrderStatus.DELIVERED),
+]
+
+
+def seed(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendors = [
+                Vendor(
+                    business_name=name, contact_email=email, phone_number=email,
+                    address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                    seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+                )
+                for name, email in [("Series Farm", "series@farm.com"), ("Other Farm", "other@farm.com")]
+            ]
+            db.add_all(vendors)
+            await db.flush()
+            for created_at, mine, other, status in ORDERS:
+                order = Order(
+                    user_id=uuid.uuid4(), customer_name="Series", customer_email="s@example.com",
+                    shipping_address={}, total_amount=mine + other, status=status, created_at=created_at
+                )
+                db.add(order)
+                await db.flush()
+                db.add_all([
+                    OrderItem(order_id=order.id, vendor_id=vendor.id, quantity=1, price_at_purchase=amount)
+                    for vendor, amount in zip(vendors, (mine, other)) if amount
+                ])
+            await db.commit()
+            await rebuild_daily_sales(db)
+
+    asyncio.run(_seed())
+
+
+def series(path, headers, **params):
+    response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [(b["bucket"], b["orders"], b["revenue"]) for b in response.json()["buckets"]]
+
+
+def test_admin_sales_series_buckets_in_sql(session_factory):
+    seed(session_factory)
+    window = {"from": "2025-01-01", "to": "2026-12-31"}
+
+    assert series("/api/v1/analytics/sales", ADMIN, granularity="month", **window) == [
+        ("2025-03-01", 1, 10.0), ("2026-03-01", 3, 62.0), ("2026-04-01", 1, 50.0),
+    ]
+    # ISO weeks start on Monday: Sunday 1 March belongs to the week of 23 February
+    assert series("/api/v1/analytics/sales", ADMIN, granularity="week", **window) == [
+        ("2025-03-10", 1, 10.0), ("2026-02-23", 1, 25.0), ("2026-03-02", 2, 37.0), ("2026-04-13", 1, 50.0),
+    ]
+    assert series("/api/v1/analytics/sales", ADMIN, granularity="day", **{"from": "2026-03-01", "to": "2026-03-02"}) == [
+        ("2026-03-01", 1, 25.0), ("2026-03-02", 1, 30.0),
+    ]
+
+    assert client.get("/api/v1/analytics/sales", params=window).status_code == 401
+    assert client.get("/api/v1/analytics/sales", params={"from": "2026-02-01", "to": "2026-01-01"}, headers=ADMIN).status_code == 400
+    assert client.get("/api/v1/analytics/sales", params={"granularity": "year"}, headers=ADMIN).status_code == 422
+
+
+def test_vendor_sales_series_only_counts_own_items(session_factory):
+    seed(session_factory)
+    window = {"from": "2025-01-01", "to": "2026-12-31"}
+
+    assert series("/api/v1/analytics/vendor/sales", VENDOR, granularity="month", **window) == [
+        ("2025-03-01", 1, 10.0), ("2026-03-01", 2, 50.0), ("2026-04-01", 1, 50.0),
+    ]
+    assert series("/api/v1/analytics/vendor/sales", VENDOR, granularity="week", **window) == [
+        ("2025-03-10", 1, 10.0), ("2026-02-23", 1, 20.0), ("2026-03-02", 1, 30.0), ("2026-04-13", 1, 50.0),
+    ]
+    # `to` is inclusive, down to the last second of the day
+    assert series("/api/v1/analytics/vendor/sales", VENDOR, granularity="day", **{"from": "2026-03-01", "to": "2026-03-01"}) == [
+        ("2026-03-01", 1, 20.0),
+    ]
+
+
+def test_time_bucket_rejects_unsupported_dialect():
+    with pytest.raises(ValueError, match="supported dialects: postgresql, sqlite"):
+        time_bucket("mysql", Order.created_at, Granularity.DAY)
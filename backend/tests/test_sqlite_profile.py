@@ -0,0 +1,145 @@
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import SerializedWriteSession, use_sqlite_profile, write_queue
+from app.models.base import Base
+from app.models.category import Category
+import asyncio
+import pytest
+
+
+def make_engine(tmp_path, **kwargs):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}", **kwargs)
+    use_sqlite_profile(engine)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    return engine, sessionmaker(bind=engine, class_=SerializedWriteSession, expire_on_commit=False, autoflush=False)
+
+
+def category(n):
+    return {"name": f"Category {n}", "slug": f"category-{n}"}
+
+
+def test_connections_get_production_pragmas(tmp_path):
+    engine, _ = make_engine(tmp_path)
+
+    async def pragmas():
+        async with engine.connect() as conn:
+            return [
+                (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+            ]
+
+    assert asyncio.run(pragmas()) == ["wal", 1, 5000, -64 * 1024]
+    asyncio.run(engine.dispose())
+
+
+def test_writers_take_turns_and_readers_do_not_wait(tmp_path):
+    engine, Session = make_engine(tmp_path)
+    active, overlapped = set(), []
+
+    async def writer(n):
+        async with Session() as db:
+            await db.execute(select(Category.id))  # Reads run before taking a turn
+            await db.execute(insert(Category), [category(n)])
+            active.add(n)
+            overlapped.append(len(active) > 1)
+            await asyncio.sleep(0.01)
+            active.discard(n)
+            if n % 3:
+                await db.commit()
+            else:
+                await db.rollback()
+
+    async def scenario():
+        async with Session() as reader, Session() as holder:
+            await holder.execute(insert(Category), [category("held")])
+            # A write transaction is open; readers still get answers straight away
+            assert (await asyncio.wait_for(reader.execute(select(Category.id)), 1)).all() == []
+            await holder.rollback()
+
+        await asyncio.gather(*(writer(n) for n in range(12)))
+        async with Session() as db:
+            return (await db.execute(select(Category.id))).all()
+
+    rows = asyncio.run(scenario())
+    assert not any(overlapped)
+    assert len(rows) == 8  # Every third writer rolled back
+    assert write_queue.waiting == 0
+    asyncio.run(engine.dispose())
+
+
+def test_writers_queue_with_a_connection_in_hand(tmp_path):
+    # One pooled connection: a writer that queued before checking out a connection
+    # would hold the turn while waiting for the connection the reader-turned-writer holds
+    engine, Session = make_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=2)
+
+    async def scenario():
+        ready = asyncio.Event()
+
+        async def read_then_write():
+            async with Session() as db:
+                await db.execute(select(Category.id))
+                await ready.wait()
+                await db.execute(insert(Category), [category("a")])
+                await db.commit()
+
+        async def write_first():
+            async with Session() as db:
+                await db.execute(insert(Category), [category("b")])
+                await db.commit()
+
+        first = asyncio.create_task(read_then_write())
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(write_first())
+        await asyncio.sleep(0.05)
+        ready.set()
+        await asyncio.wait_for(asyncio.gather(first, second), 5)
+
+    asyncio.run(scenario())
+    asyncio.run(engine.dispose())
+
+
+def test_text_and_connection_writes_queue(tmp_path):
+    engine, Session = make_engine(tmp_path)
+
+    async def scenario():
+        async with Session() as db:
+            acquired = write_queue.acquired
+            await db.execute(text("SELECT count(*) FROM categories"))
+            await (await db.connection()).execute(select(Category.id))
+            assert write_queue.acquired == acquired  # Reads don't queue
+            await db.execute(text("INSERT INTO categories (name, slug) VALUES ('a', 'a')"))
+            await db.commit()
+
+            connection = await db.connection()
+            await connection.execute(insert(Category), [category("b")])
+            await connection.exec_driver_sql("UPDATE categories SET image_url = '/b.png'")
+            await db.commit()
+            assert write_queue.acquired == acquired + 2
+
+    asyncio.run(scenario())
+    asyncio.run(engine.dispose())
+
+
+def test_second_writer_session_in_the_same_task_fails_fast(tmp_path):
+    engine, Session = make_engine(tmp_path)
+
+    async def scenario():
+        async with Session() as first, Session() as second:
+            await first.execute(insert(Category), [category("first")])
+            # Would otherwise wait out busy_timeout on the first session's lock
+            with pytest.raises(RuntimeError):
+                await second.execute(insert(Category), [category("second")])
+            await first.commit()
+            await second.execute(insert(Category), [category("second")])
+            await second.commit()
+            return (await second.execute(select(Category.slug))).scalars().all()
+
+    assert sorted(asyncio.run(scenario())) == ["category-first", "category-second"]
+    assert write_queue.waiting == 0
+    asyncio.run(engine.dispose())
@@ -0,0 +1,140 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.token_verifier import KeySet, TokenVerifier
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from datetime import datetime, timedelta
+from jose import jwk, jwt, JWTError
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import pytest
+
+client = TestClient(app)
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_only_signed_unexpired_tokens_are_accepted(session_factory):
+    claims = {"sub": "someone@example.com", "exp": datetime.utcnow() + timedelta(minutes=5)}
+    forged = jwt.encode(claims, "not-our-secret", algorithm="HS256")
+    unsigned = jwt.encode(claims, "", algorithm="HS256").rsplit(".", 1)[0] + "."
+    expired = create_access_token({"sub": "someone@example.com"}, expires_delta=timedelta(seconds=-5))
+    never_expires = jwt.encode({"sub": "someone@example.com"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    for token in (forged, unsigned, expired, never_expires, "garbage"):
+        assert client.get("/api/v1/orders/my-orders", headers=bearer(token)).status_code == 401
+
+    # Signed with SECRET_KEY: gets past authentication (no vendor profile, hence 403)
+    valid = create_access_token({"sub": "someone@example.com"})
+    assert client.get("/api/v1/vendor/me/profile", headers=bearer(valid)).status_code == 403
+    assert client.get("/api/v1/vendor/me/profile", headers=bearer(never_expires)).status_code == 401
+
+
+def test_repeated_tokens_skip_verification():
+    verifier = TokenVerifier(settings.SECRET_KEY, settings.ALGORITHM, max_entries=2)
+    tokens = [create_access_token({"sub": f"user{i}@example.com"}) for i in range(3)]
+
+    async def scenario():
+        for token in tokens[:2] + tokens[:2]:
+            await verifier.verify(token)
+        assert verifier.stats() == {"entries": 2, "hits": 2, "misses": 2}
+
+        # Least recently used token is evicted
+        await verifier.verify(tokens[2])
+        await verifier.verify(tokens[0])
+        assert verifier.stats()["misses"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_cached_tokens_are_rechecked_once_expired(monkeypatch):
+    verifier = TokenVerifier(settings.SECRET_KEY, settings.ALGORITHM)
+    token = create_access_token({"sub": "brief@example.com"}, expires_delta=timedelta(seconds=60))
+    asyncio.run(verifier.verify(token))
+    asyncio.run(verifier.verify(token))
+    assert verifier.stats()["misses"] == 1
+
+    later = datetime.utcnow().timestamp() + 120
+    monkeypatch.setattr("app.core.token_verifier.time.time", lambda: later)
+    asyncio.run(verifier.verify(token))
+    assert verifier.stats()["misses"] == 2
+
+
+def test_cached_tokens_are_rechecked_after_max_age(monkeypatch):
+    verifier = TokenVerifier(settings.SECRET_KEY, settings.ALGORITHM, max_age_seconds=10)
+    token = create_access_token({"sub": "long@example.com"}, expires_delta=timedelta(days=30))
+    asyncio.run(verifier.verify(token))
+
+    later = datetime.utcnow().timestamp() + 60
+    monkeypatch.setattr("app.core.token_verifier.time.time", lambda: later)
+    asyncio.run(verifier.verify(token))
+    assert verifier.stats()["misses"] == 2
+
+
+def rsa_key(kid):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "alg": "RS256"}
+    return private_pem, public_pem, public_jwk
+
+
+def b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def hmac_signed_with(secret, header, claims):
+    """HS256 token built by hand; jose refuses to use a public key as an HMAC secret."""
+    signing_input = b64(json.dumps(header).encode()) + b"." + b64(json.dumps(claims).encode())
+    return (signing_input + b"." + b64(hmac.new(secret, signing_input, hashlib.sha256).digest())).decode()
+
+
+def sign(private_pem, kid, **claims):
+    claims.setdefault("exp", datetime.utcnow() + timedelta(minutes=5))
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def test_jwks_keys_are_loaded_rotated_and_refreshed(tmp_path):
+    jwks_file = tmp_path / "jwks.json"
+    first_private, first_public, first_jwk = rsa_key("first")
+    second_private, _, second_jwk = rsa_key("second")
+    jwks_file.write_text(json.dumps({"keys": [first_jwk]}))
+
+    keys = KeySet(jwks_file.as_uri(), refresh_seconds=0.05, min_refresh_seconds=0)
+    verifier = TokenVerifier(settings.SECRET_KEY, settings.ALGORITHM, keys=keys, audience="authenticated")
+
+    async def scenario():
+        await keys.start()
+        try:
+            token = sign(first_private, "first", email="farm@example.com", aud="authenticated")
+            assert (await verifier.verify(token))["email"] == "farm@example.com"
+
+            with pytest.raises(JWTError):  # Wrong audience
+                await verifier.verify(sign(first_private, "first", aud="someone-else"))
+            with pytest.raises(JWTError):  # The public key is not an HMAC secret
+                await verifier.verify(hmac_signed_with(first_public, {"alg": "HS256", "kid": "first"}, {"aud": "authenticated"}))
+
+            # A rotated-in key is fetched on first sight of its kid
+            jwks_file.write_text(json.dumps({"keys": [first_jwk, second_jwk]}))
+            rotated = sign(second_private, "second", aud="authenticated")
+            assert (await verifier.verify(rotated))["aud"] == "authenticated"
+
+            # Retired keys drop out on the background refresh
+            jwks_file.write_text(json.dumps({"keys": [second_jwk]}))
+            await asyncio.sleep(0.2)
+            assert set(keys.keys) == {"second"}
+        finally:
+            await keys.stop()
+
+    asyncio.run(scenario())
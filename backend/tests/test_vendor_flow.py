@@ -9,7 +9,7 @@ import asyncio
 # Setup TestClient with the app
 client = TestClient(app)
 
-def test_register_vendor_success():
+def test_register_vendor_success(session_factory):
     # Mock Files
     files = {
         "doc_company_reg": ("company_reg.pdf", b"fake content", "application/pdf"),
@@ -0,0 +1,145 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.security import create_access_token
+from app.models.vendor import Vendor, VendorStatus, SellerCategory
+from app.models.vendor_stats import VendorStats
+from app.services.vendor_stats import reconcile_vendor_stats
+from app.services.read_models import backfill_read_models
+from sqlalchemy import event, update
+from datetime import datetime
+import asyncio
+import uuid
+
+client = TestClient(app)
+ADMIN = {"Authorization": "Bearer DEV_ADMIN_TOKEN"}
+
+
+def seed_vendors(session_factory):
+    async def _seed():
+        async with session_factory() as db:
+            vendors = [
+                Vendor(
+                    business_name=f"Stats Farm {i}", contact_email=f"stats{i}@farm.com", phone_number=str(i),
+                    address_line="1 Farm Rd", city="Pune", state="MH", pincode="411001",
+                    seller_category=SellerCategory.NATURAL, status=VendorStatus.APPROVED
+                )
+                for i in range(2)
+            ]
+            db.add_all(vendors)
+            await db.commit()
+            return [v.id for v in vendors]
+
+    return asyncio.run(_seed())
+
+
+def auth(index):
+    return {"Authorization": f"Bearer {create_access_token({'sub': f'stats{index}@farm.com'})}"}
+
+
+def add_product(index, name, price):
+    response = client.post(
+        "/api/v1/products/", data={"name": name, "price": price, "stock_quantity": 100}, headers=auth(index)
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def place_order(lines):
+    response = client.post("/api/v1/public/orders", json={
+        "user_id": str(uuid.uuid4()), "customer_name": "Stats Customer", "customer_email": "s@example.com",
+        "shipping_address": {}, "items": [{"product_id": pid, "quantity": qty, "price": 0} for pid, qty in lines],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def dashboard(index):
+    response = client.get("/api/v1/analytics/vendor/dashboard", headers=auth(index))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def counters(stats):
+    return {k: stats[k] for k in ("earnings", "active_products", "pending_orders", "total_products")}
+
+
+def test_vendor_stats_follow_orders_products_and_status(session_factory):
+    seed_vendors(session_factory)
+    kale = add_product(0, "Kale", 20)
+    okra = add_product(0, "Okra", 10)
+    spare = add_product(0, "Spare", 5)
+    rice = add_product(1, "Rice", 50)
+    client.delete(f"/api/v1/products/{spare}", headers=auth(0))
+
+    first = place_order([(kale, 2), (rice, 1)])   # Vendor 0: 40
+    place_order([(okra, 3), (okra, 1)])           # Vendor 0: 40
+    place_order([(rice, 2)])                      # Vendor 1 only
+
+    assert counters(dashboard(0)) == {"earnings": 80.0, "active_products": 2, "pending_orders": 2, "total_products": 3}
+    assert counters(dashboard(1)) == {"earnings": 150.0, "active_products": 1, "pending_orders": 2, "total_products": 1}
+
+    client.put(f"/api/v1/orders/{first}/status", json={"status": "PROCESSING"}, headers=ADMIN)
+    assert dashboard(0)["pending_orders"] == 1
+    assert dashboard(1)["pending_orders"] == 1
+
+    client.put(f"/api/v1/orders/{first}/status", json={"status": "CANCELLED"}, headers=ADMIN)
+    stats = dashboard(0)
+    assert stats["earnings"] == 40.0
+    assert stats["revenue_graph"][-1] == {"name": datetime.utcnow().strftime("%b"), "total": 40}
+    assert len(stats["revenue_graph"]) == 6
+    assert dashboard(1)["earnings"] == 100.0
+
+
+def test_vendor_dashboard_is_one_primary_key_read(session_factory):
+    seed_vendors(session_factory)
+    place_order([(add_product(0, "Kale", 20), 1)])
+    dashboard(0)
+
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        dashboard(0)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    stats_reads = [s for s in statements if "vendor_stats" in s]
+    assert len(stats_reads) == 1
+    assert not [s for s in statements if "order_items" in s or "FROM products" in s]
+
+
+def test_reconcile_corrects_drift_and_backfills(session_factory):
+    vendor_ids = seed_vendors(session_factory)
+    kale = add_product(0, "Kale", 20)
+    place_order([(kale, 2)])
+    expected = dashboard(0)
+
+    async def corrupt():
+        async with session_factory() as db:
+            await db.execute(update(VendorStats).values(earnings=999, pending_orders=7, active_products=0))
+            await db.commit()
+
+    async def reconcile():
+        async with session_factory() as db:
+            return await reconcile_vendor_stats(db)
+
+    asyncio.run(corrupt())
+    assert dashboard(0) != expected
+    assert asyncio.run(reconcile()) == len(vendor_ids)
+    assert dashboard(0) == expected
+
+    # A database from before vendor_stats existed is backfilled at startup; the
+    # dashboard itself never writes
+    async def drop_stats():
+        async with session_factory() as db:
+            await db.execute(VendorStats.__table__.delete())
+            await db.commit()
+
+    asyncio.run(drop_stats())
+    assert dashboard(0)["earnings"] == 0
+    assert "vendor_stats" in asyncio.run(backfill_read_models(session_factory))
+    assert dashboard(0) == expected
@@ -1,28 +1,41 @@
 "use client";
 
 import { useState, useEffect } from "react";
-import { Search, Filter, MoreHorizontal, Users, Mail, Phone, ShoppingBag } from "lucide-react";
+import { Search, Filter, MoreHorizontal, Users, Mail, Phone, ShoppingBag, Loader2 } from "lucide-react";
 
 export default function AdminCustomersPage() {
   const [customers, setCustomers] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  const fetchCustomers = async () => {
+  // Without a cursor this loads the first page; with one it appends the next page
+  const fetchCustomers = async (cursor?: string) => {
+    const params = new URLSearchParams({ limit: "50" });
+    if (cursor) params.set("cursor", cursor);
     try {
-      const res = await fetch("http://localhost:8000/api/v1/customers", {
+      const res = await fetch(`http://localhost:8000/api/v1/customers/?${params}`, {
           headers: { "Authorization": "Bearer DEV_ADMIN_TOKEN" }
       });
       if (res.ok) {
         const data = await res.json();
-        setCustomers(data);
+        setCustomers(prev => cursor ? [...prev, ...data] : data);
+        setNextCursor(res.headers.get("X-Next-Cursor"));
       }
     } catch (error) {
       console.error("Failed to fetch customers", error);
     } finally {
         setLoading(false);
+        setLoadingMore(false);
     }
   };
 
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    fetchCustomers(nextCursor);
+  };
+
   useEffect(() => {
     fetchCustomers();
   }, []);
@@ -113,6 +126,19 @@ export default function AdminCustomersPage() {
             </tbody>
          </table>
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="flex items-center gap-2 px-6 py-3 bg-[#18181B] border border-white/5 rounded-xl text-sm font-medium text-[#A1A1AA] hover:text-white transition-colors disabled:opacity-50"
+          >
+            {loadingMore ? <Loader2 className="animate-spin" size={16} /> : null}
+            Load more customers
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from "react";
 import { Send, Users, User, MessageSquare, Star, History, Loader2, Check, ChevronDown } from "lucide-react";
+import { apiRequestPage } from "@/lib/api";
 
 interface Vendor {
   id: string;
@@ -24,6 +25,8 @@ interface SentNotification {
 export default function MessagingPage() {
   const [vendors, setVendors] = useState<Vendor[]>([]);
   const [history, setHistory] = useState<SentNotification[]>([]);
+  const [historyCursor, setHistoryCursor] = useState<string | null>(null);
+  const [loadingMoreHistory, setLoadingMoreHistory] = useState(false);
   const [loading, setLoading] = useState(true);
   const [sending, setSending] = useState(false);
   const [success, setSuccess] = useState(false);
@@ -62,24 +65,26 @@ export default function MessagingPage() {
     }
   };
 
-  const fetchHistory = async () => {
+  // Without a cursor this reloads the newest page; with one it appends the next page
+  const fetchHistory = async (cursor?: string) => {
     try {
-      const token = localStorage.getItem("admin_token");
-      if (!token) return;
-      
-      const res = await fetch("http://localhost:8000/api/v1/admin/notifications/history", {
-        headers: { "Authorization": `Bearer ${token}` }
-      });
-      
-      if (res.ok) {
-        const data = await res.json();
-        setHistory(data);
-      }
+      if (!localStorage.getItem("admin_token")) return;
+      const page = await apiRequestPage<SentNotification>("/admin/notifications/history", { cursor });
+      setHistory(prev => cursor ? [...prev, ...page.items] : page.items);
+      setHistoryCursor(page.nextCursor);
     } catch (error) {
       console.error("Failed to fetch history", error);
+    } finally {
+      setLoadingMoreHistory(false);
     }
   };
 
+  const loadMoreHistory = () => {
+    if (!historyCursor || loadingMoreHistory) return;
+    setLoadingMoreHistory(true);
+    fetchHistory(historyCursor);
+  };
+
   const handleSend = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!title.trim() || !message.trim()) {
@@ -384,7 +389,7 @@ export default function MessagingPage() {
                 </div>
                 <div className="flex justify-between">
                   <span className="text-[#71717A]">Messages Sent</span>
-                  <span className="text-white font-medium">{history.length}</span>
+                  <span className="text-white font-medium">{history.length}{historyCursor ? "+" : ""}</span>
                 </div>
               </div>
             </div>
@@ -428,6 +433,18 @@ export default function MessagingPage() {
               ))}
             </div>
           )}
+          {historyCursor && (
+            <div className="p-4 flex justify-center border-t border-[#27272A]">
+              <button
+                onClick={loadMoreHistory}
+                disabled={loadingMoreHistory}
+                className="flex items-center gap-2 px-4 py-2 bg-[#27272A] hover:bg-[#3f3f46] text-white rounded-lg text-sm transition-colors disabled:opacity-50"
+              >
+                {loadingMoreHistory && <Loader2 className="animate-spin" size={16} />}
+                Load more
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Bell, Check, CheckCheck, Filter, Loader2, User, ShoppingCart, Package } from "lucide-react";
 import { adminApi } from "@/lib/api";
 
@@ -18,25 +18,51 @@ export default function AdminNotificationsPage() {
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState<string>("all");
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [unreadCount, setUnreadCount] = useState(0);
+  const request = useRef(0); // Ignores pages that arrive after the filter changed
 
   useEffect(() => {
     fetchNotifications();
-  }, []);
+    adminApi.getUnreadCount()
+      .then(({ unread_count }) => setUnreadCount(unread_count))
+      .catch(error => console.error("Failed to fetch unread count", error));
+  }, [filter]);
 
-  const fetchNotifications = async () => {
+  // Without a cursor this loads the first page for the filter; with one it appends the next page
+  const fetchNotifications = async (cursor?: string) => {
+    const current = ++request.current;
     try {
-      const data = await adminApi.getNotifications();
-      setNotifications(data as unknown as Notification[]);
+      const page = await adminApi.getNotificationsPage({
+        cursor,
+        type: filter === "all" || filter === "unread" ? undefined : filter,
+        is_read: filter === "unread" ? "false" : undefined,
+      });
+      if (current !== request.current) return;
+      const items = page.items as unknown as Notification[];
+      setNotifications(prev => cursor ? [...prev, ...items] : items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error("Failed to fetch notifications", error);
     } finally {
-      setLoading(false);
+      if (current === request.current) {
+        setLoading(false);
+        setLoadingMore(false);
+      }
     }
   };
 
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    fetchNotifications(nextCursor);
+  };
+
   const markAsRead = async (id: string) => {
     try {
       await adminApi.markRead(id);
+      if (notifications.some(n => n.id === id && !n.is_read)) setUnreadCount(count => Math.max(0, count - 1));
       setNotifications(prev => prev.map(n => n.id === id ? { ...n, is_read: true } : n));
     } catch (error) {
       console.error("Failed to mark as read", error);
@@ -46,6 +72,7 @@ export default function AdminNotificationsPage() {
   const markAllRead = async () => {
     try {
       await adminApi.markAllRead();
+      setUnreadCount(0);
       setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
     } catch (error) {
       console.error("Failed to mark all as read", error);
@@ -74,13 +101,8 @@ export default function AdminNotificationsPage() {
     }
   };
 
-  const filteredNotifications = notifications.filter(n => {
-    if (filter === "all") return true;
-    if (filter === "unread") return !n.is_read;
-    return n.type === filter;
-  });
-
-  const unreadCount = notifications.filter(n => !n.is_read).length;
+  // The server applies the filter; this only hides items marked read since the page loaded
+  const filteredNotifications = notifications.filter(n => filter !== "unread" || !n.is_read);
 
   if (loading) {
     return (
@@ -199,6 +221,19 @@ export default function AdminNotificationsPage() {
           </div>
         )}
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="flex items-center gap-2 px-4 py-2 bg-[#27272A] hover:bg-[#3f3f46] text-white rounded-lg text-sm transition-colors disabled:opacity-50"
+          >
+            {loadingMore && <Loader2 className="animate-spin" size={16} />}
+            Load more
+          </button>
+        </div>
+      )}
     </div>
   );
 }
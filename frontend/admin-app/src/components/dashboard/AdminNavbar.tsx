@@ -5,7 +5,7 @@ import { Search, Bell, Calendar, User, LogOut, Settings, ChevronDown, Check, Sho
 import Link from "next/link";
 import { useRouter } from "next/navigation";
 
-import { adminApi } from "@/lib/api";
+import { adminApi, subscribeToNotifications } from "@/lib/api";
 
 type Notification = {
   id: string;
@@ -61,8 +61,12 @@ export function AdminNavbar() {
 
   useEffect(() => {
       fetchNotifications();
+      const unsubscribe = subscribeToNotifications(fetchNotifications); // Refresh on each push
       const interval = setInterval(fetchNotifications, 30000); // Poll every 30s
-      return () => clearInterval(interval);
+      return () => {
+          unsubscribe();
+          clearInterval(interval);
+      };
   }, []);
 
   const handleLogout = () => {
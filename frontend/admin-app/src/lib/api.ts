@@ -35,6 +35,28 @@ export async function apiRequest<T>(endpoint: string, method: string = "GET", bo
   }
 }
 
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null; // Pass back as `cursor` for the following page; null on the last one
+}
+
+// One page of a cursor-paginated list; the X-Next-Cursor response header becomes nextCursor
+export async function apiRequestPage<T>(endpoint: string, params: Record<string, string | undefined> = {}): Promise<Page<T>> {
+  const authToken = getToken();
+  const headers: HeadersInit = authToken ? { "Authorization": `Bearer ${authToken}` } : {};
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined) query.set(key, value);
+  });
+  const queryString = query.toString();
+  const res = await fetch(`${API_URL}${endpoint}${queryString ? `?${queryString}` : ""}`, { headers });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData.detail || "API Request Failed");
+  }
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
 export const authApi = {
   login: async (username: string, password: string): Promise<{ access_token: string }> => {
     const formData = new URLSearchParams();
@@ -106,7 +128,11 @@ export const adminApi = {
 
   // Notifications
   getNotifications: async () => {
-    return apiRequest("/admin/notifications/received");
+    return apiRequest("/admin/notifications/received"); // Most recent page, for the navbar
+  },
+
+  getNotificationsPage: async (params: { cursor?: string; type?: string; is_read?: string } = {}) => {
+    return apiRequestPage("/admin/notifications/received", params);
   },
 
   getUnreadCount: async () => {
@@ -139,3 +165,39 @@ export const adminApi = {
   }
 };
 
+// Live notifications (Server-Sent Events). EventSource can't send the Authorization
+// header, so each connection is opened with a short-lived token, and a fresh one is
+// fetched whenever the stream drops (token expired, account suspended, server restart).
+// Returns a function that stops listening.
+export function subscribeToNotifications(onNotification: (notification: unknown) => void): () => void {
+  let source: EventSource | null = null;
+  let retry: ReturnType<typeof setTimeout> | null = null;
+  let stopped = false;
+
+  const reconnectLater = () => {
+    if (!stopped) retry = setTimeout(connect, 5000);
+  };
+
+  const connect = async () => {
+    try {
+      const { token } = await apiRequest<{ token: string }>("/admin/notifications/received/stream-token", "POST");
+      if (stopped) return;
+      source = new EventSource(`${API_URL}/admin/notifications/received/stream?token=${encodeURIComponent(token)}`);
+      source.addEventListener("notification", (event) => onNotification(JSON.parse((event as MessageEvent).data)));
+      source.onerror = () => {
+        // EventSource would retry with the same, soon expired, token
+        source?.close();
+        reconnectLater();
+      };
+    } catch {
+      reconnectLater();
+    }
+  };
+
+  connect();
+  return () => {
+    stopped = true;
+    source?.close();
+    if (retry) clearTimeout(retry);
+  };
+}
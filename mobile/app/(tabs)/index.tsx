@@ -7,6 +7,7 @@ import { useState, useEffect, useCallback } from 'react';
 import { CATEGORIES, PRODUCTS as MOCK_PRODUCTS, VENDORS as MOCK_VENDORS, Product, Vendor } from '@/constants/mocks';
 import { ProductCard } from '@/components/ProductCard';
 import { api } from '@/services/api';
+import { useProductPages, isNearEnd } from '@/hooks/useProductPages';
 
 const { width: SCREEN_WIDTH } = Dimensions.get('window');
 
@@ -23,16 +24,14 @@ const QUICK_CATEGORIES = [
 export default function HomeScreen() {
   const router = useRouter(); 
   const [activeMode, setActiveMode] = useState<'Hub' | 'Farms'>('Hub');
-  const [products, setProducts] = useState(MOCK_PRODUCTS);
+  const catalog = useProductPages();  // Pages load as the Hub list is scrolled
+  const products = catalog.products.length > 0 ? catalog.products : MOCK_PRODUCTS;
   const [vendors, setVendors] = useState(MOCK_VENDORS);
   const [banners, setBanners] = useState<any[]>([]); 
   const [refreshing, setRefreshing] = useState(false);
 
   const loadData = useCallback(async () => {
     try {
-      const fetchedProducts = await api.fetchProducts();
-      if (fetchedProducts && fetchedProducts.length > 0) setProducts(fetchedProducts);
-      
       const fetchedVendors = await api.fetchVendors();
       if (fetchedVendors && fetchedVendors.length > 0) setVendors(fetchedVendors);
 
@@ -59,9 +58,9 @@ export default function HomeScreen() {
 
   const onRefresh = useCallback(async () => {
     setRefreshing(true);
-    await loadData();
+    await Promise.all([loadData(), catalog.reload()]);
     setRefreshing(false);
-  }, [loadData]);
+  }, [loadData, catalog.reload]);
 
   // Filter products for Hub View
   const bestOffers = products.slice(0, 6);
@@ -146,6 +145,10 @@ export default function HomeScreen() {
       <ScrollView 
         contentContainerStyle={{ paddingBottom: 40 }} 
         showsVerticalScrollIndicator={false}
+        onScroll={(e) => {
+          if (activeMode === 'Hub' && isNearEnd(e)) catalog.loadMore();
+        }}
+        scrollEventThrottle={200}
         refreshControl={
           <RefreshControl refreshing={refreshing} onRefresh={onRefresh} colors={['#2D6A4F']} />
         }
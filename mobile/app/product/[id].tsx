@@ -26,9 +26,8 @@ export default function ProductDetailsScreen() {
   useEffect(() => {
     const loadRealData = async () => {
         try {
-            // 1. Fetch Products
-            const allProducts = await api.fetchProducts();
-            const foundProduct = allProducts.find((p: Product) => String(p.id) === String(productId));
+            // 1. Fetch Product
+            const foundProduct = await api.fetchProduct(String(productId));
             
             if (foundProduct) {
                 setProduct(foundProduct);
@@ -3,9 +3,9 @@ import { useLocalSearchParams, useRouter } from 'expo-router';
 import { ScreenWrapper } from '@/components/ScreenWrapper';
 import { ThemedText } from '@/components/ThemedText';
 import { Ionicons } from '@expo/vector-icons';
-import { PRODUCTS } from '@/constants/mocks';
 import { ProductCard } from '@/components/ProductCard';
-import { useState, useMemo } from 'react';
+import { useProductPages } from '@/hooks/useProductPages';
+import { useState, useEffect } from 'react';
 
 export default function SearchScreen() {
   const router = useRouter();
@@ -13,20 +13,17 @@ export default function SearchScreen() {
   
   const [searchQuery, setSearchQuery] = useState(initialQuery || '');
   
-  const filteredProducts = useMemo(() => {
-     let data = PRODUCTS;
-     
-     if (category) {
-        data = data.filter(p => p.category === category);
-     }
-     
-     if (searchQuery) {
-        const q = searchQuery.toLowerCase();
-        data = data.filter(p => p.name.toLowerCase().includes(q) || p.description.toLowerCase().includes(q));
-     }
-     
-     return data;
-  }, [category, searchQuery]);
+  const [query, setQuery] = useState(searchQuery.trim());
+
+  // Ask the server once typing pauses, not on every keystroke
+  useEffect(() => {
+     const timer = setTimeout(() => setQuery(searchQuery.trim()), 300);
+     return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  // Filtered and paged by the server; more pages load as the list is scrolled
+  const catalog = useProductPages({ category: category || undefined, query: query || undefined });
+  const filteredProducts = catalog.products;
 
   return (
     <ScreenWrapper bg="bg-[#FAFAFA]">
@@ -65,10 +62,12 @@ export default function SearchScreen() {
          renderItem={({ item }) => (
              <ProductCard product={item} />
          )}
+         onEndReached={catalog.loadMore}
+         onEndReachedThreshold={0.5}
          ListHeaderComponent={
             <View className="mb-4">
                 <ThemedText className="text-gray-500">
-                    {filteredProducts.length} results found {category ? `for ${category}` : ''}
+                    {filteredProducts.length}{catalog.hasMore ? '+' : ''} results found {category ? `for ${category}` : ''}
                 </ThemedText>
             </View>
          }
@@ -0,0 +1,62 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { NativeScrollEvent, NativeSyntheticEvent } from 'react-native';
+import { api, ProductFilters } from '@/services/api';
+
+// Catalog products, one server page at a time. Call `loadMore` when the list is
+// scrolled near its end; changing the filters starts again from the first page.
+export function useProductPages(filters: ProductFilters = {}) {
+  const [products, setProducts] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loaded, setLoaded] = useState(false);
+  const loading = useRef(false);
+  const generation = useRef(0);  // Bumped by reload, so late pages of old filters are dropped
+  const filtersRef = useRef(filters);
+  filtersRef.current = filters;
+  const key = JSON.stringify(filters);
+
+  const reload = useCallback(async () => {
+    const current = ++generation.current;
+    loading.current = true;
+    try {
+      const page = await api.fetchProductsPage(filtersRef.current);
+      if (current !== generation.current) return;
+      setProducts(page.products);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.warn("API Error fetching products:", error);
+    } finally {
+      if (current === generation.current) {
+        loading.current = false;
+        setLoaded(true);
+      }
+    }
+  }, [key]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loading.current) return;
+    const current = generation.current;
+    loading.current = true;
+    try {
+      const page = await api.fetchProductsPage(filtersRef.current, nextCursor);
+      if (current !== generation.current) return;
+      setProducts(prev => [...prev, ...page.products]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.warn("API Error fetching more products:", error);  // Cursor kept: the next scroll retries
+    } finally {
+      if (current === generation.current) loading.current = false;
+    }
+  }, [nextCursor]);
+
+  useEffect(() => {
+    reload();
+  }, [reload]);
+
+  return { products, hasMore: nextCursor !== null, loaded, loadMore, reload };
+}
+
+// True when a ScrollView is within `threshold` points of the end of its content
+export function isNearEnd({ nativeEvent }: NativeSyntheticEvent<NativeScrollEvent>, threshold = 400) {
+  const { layoutMeasurement, contentOffset, contentSize } = nativeEvent;
+  return layoutMeasurement.height + contentOffset.y >= contentSize.height - threshold;
+}
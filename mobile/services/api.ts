@@ -27,6 +27,28 @@ const fetchWithTimeout = async (resource: RequestInfo, options: RequestInit = {}
   }
 }
 
+// Catalog paging
+const PRODUCT_PAGE_SIZE = 20;
+
+export interface ProductFilters {
+  vendorId?: string;
+  category?: string;  // Category name
+  query?: string;     // Matches product name or description
+}
+
+export interface ProductPage {
+  products: any[];
+  nextCursor: string | null;
+}
+
+// CRITICAL MAPPING: Backend (snake_case) to Frontend (camelCase)
+const mapProduct = (p: any) => ({
+  ...p,
+  vendorId: p.vendor_id || p.vendorId,  // Handle both just in case
+  image: p.image_url || p.image,        // Handle both
+  price: Number(p.price)
+});
+
 // Token Management
 const TOKEN_KEY = 'auth_token';
 const setToken = async (token: string) => await AsyncStorage.setItem(TOKEN_KEY, token);
@@ -70,22 +92,29 @@ export const api = {
   },
 
   // Public Endpoints
-  fetchProducts: async () => {
+  // One page of the catalog, filtered by the server. Pass `nextCursor` back to get
+  // the following page; it is null on the last one. Throws on network/server errors.
+  fetchProductsPage: async (filters: ProductFilters = {}, cursor: string | null = null): Promise<ProductPage> => {
+    const params = new URLSearchParams({ limit: String(PRODUCT_PAGE_SIZE) });
+    if (filters.vendorId) params.append('vendor_id', filters.vendorId);
+    if (filters.category) params.append('category', filters.category);
+    if (filters.query) params.append('q', filters.query);
+    if (cursor) params.append('cursor', cursor);
+
+    const res = await fetchWithTimeout(`${API_URL}/public/products?${params.toString()}`);
+    if (!res.ok) throw new Error(`Status ${res.status}`);
+    const rawProducts: any[] = await res.json();
+    return { products: rawProducts.map(mapProduct), nextCursor: res.headers.get('X-Next-Cursor') };
+  },
+
+  fetchProduct: async (id: string) => {
     try {
-      const res = await fetchWithTimeout(`${API_URL}/public/products`);
+      const res = await fetchWithTimeout(`${API_URL}/public/products/${encodeURIComponent(id)}`);
       if (!res.ok) throw new Error(`Status ${res.status}`);
-      const rawProducts = await res.json();
-      
-      // CRITICAL MAPPING: Backend (snake_case) to Frontend (camelCase)
-      return rawProducts.map((p: any) => ({
-          ...p,
-          vendorId: p.vendor_id || p.vendorId,  // Handle both just in case
-          image: p.image_url || p.image,        // Handle both
-          price: Number(p.price) 
-      }));
+      return mapProduct(await res.json());
     } catch (error) {
-      console.warn("API Error fetching products:", error);
-      return []; 
+      console.warn("API Error fetching product:", error);
+      return null;
     }
   },
 